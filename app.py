@@ -3,13 +3,21 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-from budget_forecast import BudgetForecaster
+from budget_forecast import (IncrementalForecast, BUDGET_VERSIONS, PARAMETER_SHEETS,
+                             PARAMETER_TABLES, ParameterSet, StageProfiler, build_monthly_performance,
+                             frame_content_hash, read_parameter_file, write_detail_report, write_excel_sheets)
+from data_cache import ParsedDataCache
+from formatting import (format_currency, format_currency_column, format_number, format_number_column,
+                        format_percent, format_percent_column)
 import numpy as np
-import tempfile
 import os
+import threading
+import time
 import locale
-import json
+import uuid
 from io import BytesIO
+from contextlib import nullcontext
+from functools import partial
 
 # Türkçe locale
 try:
@@ -55,75 +63,55 @@ st.markdown("""
 
 st.markdown('<p class="main-header">📊 2026 Satış Bütçe Tahmini Sistemi</p>', unsafe_allow_html=True)
 
-# Format fonksiyonları
-def format_number(num, decimals=0):
-    if pd.isna(num) or num == 0:
-        return "-"
-    if decimals == 0:
-        return f"{num:,.0f}".replace(",", ".")
-    else:
-        formatted = f"{num:,.{decimals}f}"
-        formatted = formatted.replace(",", "TEMP").replace(".", ",").replace("TEMP", ".")
-        return formatted
-
-def format_currency(num):
-    if pd.isna(num) or num == 0:
-        return "-"
-    return f"₺{format_number(num, 0)}"
-
-def format_percent(num, decimals=1):
-    if pd.isna(num):
-        return "-"
-    return f"%{format_number(num, decimals)}"
+def report_years(full_data):
+    """Raporlanan yıllar: ilk veri yılından bütçe yılına (son gerçekleşen yıl + 1)"""
+    years = sorted(int(year) for year in full_data['Year'].unique())
+    return [year for year in years if year <= forecaster.last_actual_year + 1]
 
 # PARAMETRE KAYDETME FONKSİYONLARI
-def save_parameters_to_file():
-    """Parametreleri JSON dosyasına kaydet"""
+def current_parameter_set():
+    """Oturumdaki parametre tablolarından ParameterSet (okunamayan fiyatlar güncel enflasyonla dolar)"""
+    return ParameterSet.from_tables(
+        **{key: st.session_state.get(key) for key in PARAMETER_TABLES},
+        inflation_rate=st.session_state.get('inflation_future', 25.0) / 100
+    )
+
+def save_parameters_to_file(parameters=None):
+    """Parametreleri JSON dosyasına kaydet (parameters verilmezse oturum tablolarından okunur)"""
     try:
-        params = {
-            'monthly_targets': st.session_state.monthly_targets.to_dict('records'),
-            'maingroup_targets': st.session_state.maingroup_targets.to_dict('records'),
-            'lessons_learned': st.session_state.lessons_learned.to_dict('records'),
-            'price_changes': st.session_state.price_changes.to_dict('records'),
-            'margin_improvement': st.session_state.get('margin_improvement', 2.0),
-            'stock_change_pct': st.session_state.get('stock_change_pct', 0.0),
-            'inflation_past': st.session_state.get('inflation_past', 35.0),
-            'inflation_future': st.session_state.get('inflation_future', 25.0),
-            'budget_version': st.session_state.get('budget_version_slider', '🟡 Normal')
-        }
-        
-        with open('saved_parameters.json', 'w', encoding='utf-8') as f:
-            json.dump(params, f, ensure_ascii=False, indent=2)
-        
+        (parameters or current_parameter_set()).to_json(
+            'saved_parameters.json',
+            margin_improvement=st.session_state.get('margin_improvement', 2.0),
+            stock_change_pct=st.session_state.get('stock_change_pct', 0.0),
+            inflation_past=st.session_state.get('inflation_past', 35.0),
+            inflation_future=st.session_state.get('inflation_future', 25.0),
+            budget_version=st.session_state.get('budget_version_slider', '🟡 Normal')
+        )
         return True
     except Exception as e:
         st.error(f"Kayıt hatası: {e}")
         return False
 
+def set_parameter_tables(parameters):
+    """ParameterSet tablolarını düzenleme tablolarına yaz"""
+    for key, table in parameters.to_tables().items():
+        st.session_state[key] = table
+
 def load_parameters_from_file():
     """JSON dosyasından parametreleri yükle"""
     try:
         if os.path.exists('saved_parameters.json'):
-            with open('saved_parameters.json', 'r', encoding='utf-8') as f:
-                params = json.load(f)
+            params = read_parameter_file('saved_parameters.json')
             
             # Tabloları yükle
-            st.session_state.monthly_targets = pd.DataFrame(params['monthly_targets'])
-            st.session_state.maingroup_targets = pd.DataFrame(params['maingroup_targets'])
-            st.session_state.lessons_learned = pd.DataFrame(params['lessons_learned'])
-            st.session_state.price_changes = pd.DataFrame(params['price_changes'])
+            set_parameter_tables(params['parameters'])
             
             # Diğer parametreleri yükle
-            if 'margin_improvement' in params:
-                st.session_state.margin_improvement = params['margin_improvement']
-            if 'stock_change_pct' in params:
-                st.session_state.stock_change_pct = params['stock_change_pct']
-            if 'inflation_past' in params:
-                st.session_state.inflation_past = params['inflation_past']
-            if 'inflation_future' in params:
-                st.session_state.inflation_future = params['inflation_future']
-            if 'budget_version' in params:
-                st.session_state.budget_version_slider = params['budget_version']
+            st.session_state.margin_improvement = params['margin_improvement']
+            st.session_state.stock_change_pct = params['stock_change_pct']
+            st.session_state.inflation_past = params['inflation_past']
+            st.session_state.inflation_future = params['inflation_future']
+            st.session_state.budget_version_slider = params['budget_version']
             
             return True
         return False
@@ -133,62 +121,44 @@ def load_parameters_from_file():
 
 # EXCEL TEMPLATE FONKSİYONLARI
 def create_parameter_template():
-    """Parametre şablonu Excel oluştur"""
+    """Parametre şablonu Excel oluştur - güncel parametre tabloları (indirme tıklandığında)"""
     output = BytesIO()
     
     with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # Sheet 1: Ay Hedefleri
-        monthly_template = pd.DataFrame({
-            'Ay': list(range(1, 13)),
-            'Ay Adı': ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
-                       'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık'],
-            'Hedef (%)': [20.0] * 12
-        })
-        monthly_template.to_excel(writer, sheet_name='Ay Hedefleri', index=False)
+        # Ay / Ana Grup hedefleri, alınan dersler, fiyat değişimi - GERÇEK GRUPLARI KULLAN
+        current_parameter_set().to_excel(writer)
         
-        # Sheet 2: Ana Grup Hedefleri - GERÇEK GRUPLARI KULLAN
-        if 'maingroup_targets' in st.session_state:
-            maingroup_template = st.session_state.maingroup_targets.copy()
-        else:
-            # Fallback: örnek gruplar
-            maingroup_template = pd.DataFrame({
-                'Ana Grup': ['Örnek Grup 1', 'Örnek Grup 2'],
-                'Hedef (%)': ['20.0', '20.0']
-            })
-        maingroup_template.to_excel(writer, sheet_name='Ana Grup Hedefleri', index=False)
-        
-        # Sheet 3: Açıklama
+        # Açıklama
         instructions = pd.DataFrame({
             'Talimatlar': [
-                '1. "Ay Hedefleri" sekmesini doldurun',
-                '2. "Ana Grup Hedefleri" zaten dolu - sadece hedefleri değiştirin',
+                f'1. "{PARAMETER_SHEETS["monthly_targets"]}" sekmesini doldurun',
+                f'2. "{PARAMETER_SHEETS["maingroup_targets"]}", "{PARAMETER_SHEETS["lessons_learned"]}" ve '
+                f'"{PARAMETER_SHEETS["price_changes"]}" zaten dolu - sadece değerleri değiştirin',
                 '3. Hedefleri % olarak girin (örn: 20 = %20 büyüme)',
                 '4. Sıfırlamak için * yazın',
-                '5. Dosyayı kaydedin ve uygulamaya yükleyin',
+                '5. Dosyayı kaydedin ve uygulamaya yükleyin (silinen sekmeler mevcut değerleri korur)',
                 '6. ÖNEMLI: Dosyayı yükledikten sonra sayfayı yenilemeyin!'
             ]
         })
         instructions.to_excel(writer, sheet_name='Açıklama', index=False)
     
-    output.seek(0)
-    return output
+    return output.getvalue()
 
 def load_parameters_from_excel(uploaded_file):
     """Excel'den parametreleri yükle"""
     try:
-        # Ay hedefleri
-        monthly_df = pd.read_excel(uploaded_file, sheet_name='Ay Hedefleri')
-        monthly_df['Hedef (%)'] = monthly_df['Hedef (%)'].astype(str)
-        st.session_state.monthly_targets = monthly_df
-        
-        # Ana grup hedefleri
-        maingroup_df = pd.read_excel(uploaded_file, sheet_name='Ana Grup Hedefleri')
-        maingroup_df['Hedef (%)'] = maingroup_df['Hedef (%)'].astype(str)
-        st.session_state.maingroup_targets = maingroup_df
+        # Dosyada olmayan sekmeler mevcut tablolardan
+        parameters = ParameterSet.from_excel(
+            uploaded_file, base=current_parameter_set(),
+            inflation_rate=st.session_state.get('inflation_future', 25.0) / 100
+        )
+        set_parameter_tables(parameters)
         
         # Başarılı yükleme - parametreleri kaydet
-        save_parameters_to_file()
+        save_parameters_to_file(parameters)
         
+        if len(parameters.invalid):
+            return True, f"⚠️ Parametreler yüklendi - {len(parameters.invalid)} okunamayan hücre varsayılanla dolduruldu"
         return True, "✅ Parametreler başarıyla yüklendi!"
     except Exception as e:
         return False, f"❌ Hata: {e}"
@@ -213,26 +183,71 @@ uploaded_file = st.sidebar.file_uploader(
     help="2024-2025 verilerini içeren Excel dosyası"
 )
 
-# Veri yükleme
-@st.cache_data
-def load_data(file_path):
-    return BudgetForecaster(file_path)
+# Veri yükleme - dosya içeriğinin SHA-256 özeti ile önbellek (disk: Parquet)
+parsed_data_cache = ParsedDataCache()
+
+# Tüm oturumlar aynı salt-okunur forecaster'ı paylaşır (kopyalama / pickle yok)
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_data(file_hash, _file_bytes):
+    return parsed_data_cache.get_or_load(_file_bytes, key=file_hash).freeze()
+
+# Bu süre boyunca etkileşim olmayan oturumlar paylaşım sayımından düşer
+SESSION_TTL_SECONDS = 30 * 60
+
+@st.cache_resource
+def shared_sessions():
+    """Dosya hash'i → {oturum: son görülme zamanı} - tüm oturumlar arasında ortak (kilitli)"""
+    return {'lock': threading.Lock(), 'files': {}}
+
+def register_session(file_hash, session_uid):
+    """Oturumu dosyaya kaydet, süresi dolan oturumları at - dosyayı kullanan aktif oturum sayısı"""
+    registry = shared_sessions()
+    now = time.time()
+    with registry['lock']:
+        files = registry['files']
+        for key in list(files):
+            sessions = files[key]
+            for uid in [uid for uid, seen in sessions.items()
+                        if uid == session_uid or now - seen > SESSION_TTL_SECONDS]:
+                del sessions[uid]
+            if not sessions:
+                del files[key]
+        files.setdefault(file_hash, {})[session_uid] = now
+        return len(files[file_hash])
+
+# Export dosyaları - sadece indirme tıklandığında (ayrı thread'de) üretilir ve tahmin
+# sonucunun içerik hash'i ile önbelleklenir; diğer etkileşimlerde hiç hesaplanmaz
+@st.cache_data(show_spinner=False, max_entries=16)
+def export_artifact(kind, key, _data, _profiler=None):
+    """kind: 'csv' | 'detail_xlsx' | 'performance_xlsx' - key: _data'yı tek başına belirleyen hash (_data hash'lenmez)"""
+    if kind == 'csv':
+        return _data.to_csv(index=False, encoding='utf-8-sig')
+    
+    output = BytesIO()
+    with _profiler or nullcontext():
+        if kind == 'detail_xlsx':
+            write_detail_report(_data, output)
+        else:
+            write_excel_sheets({'Ay Bazında Performans': _data}, output)
+    return output.getvalue()
 
 forecaster = None
 if uploaded_file is not None:
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_path = tmp_file.name
+    file_bytes = uploaded_file.getvalue()
+    
+    file_hash = ParsedDataCache.content_hash(file_bytes)
     
     with st.spinner('Veri yükleniyor...'):
-        forecaster = load_data(tmp_path)
+        forecaster = load_data(file_hash, file_bytes)
     
-    os.unlink(tmp_path)
+    if 'session_uid' not in st.session_state:
+        st.session_state.session_uid = uuid.uuid4().hex
+    session_count = register_session(file_hash, st.session_state.session_uid)
     
     current_file_name = uploaded_file.name
     
     if 'last_uploaded_file' not in st.session_state or st.session_state.last_uploaded_file != current_file_name:
-        keys_to_clear = [k for k in st.session_state.keys() if k not in ['last_uploaded_file']]
+        keys_to_clear = [k for k in st.session_state.keys() if k not in ['last_uploaded_file', 'session_uid']]
         for key in keys_to_clear:
             del st.session_state[key]
         
@@ -310,9 +325,42 @@ if forecaster is None:
     
     st.stop()
 
+# Bütçe (tahmin) yılı - son gerçekleşen yılın ertesi; raporlar önceki iki yılla karşılaştırır
+forecast_year = forecaster.last_actual_year + 1
+display_years = [forecast_year - 2, forecast_year - 1, forecast_year]
+year_colors = dict(zip(map(str, display_years), ['#1f77b4', '#ff7f0e', '#2ca02c']))
+
+
+# BELLEK RAPORU - paylaşılan forecaster
+with st.sidebar.expander("🧠 Bellek Raporu"):
+    memory = forecaster.memory_report()
+    shared_mb = memory['total_bytes'] / 1024 / 1024
+    
+    st.caption(f"Paylaşılan veri: {shared_mb:.2f} MB ({format_number(memory['rows'])} satır, salt-okunur)")
+    st.caption(f"Bu dosyayı kullanan aktif oturum (son {SESSION_TTL_SECONDS // 60} dk): {session_count}")
+    st.caption(f"Oturum başı tasarruf: {shared_mb:.2f} MB · Toplam: {max(session_count - 1, 0) * shared_mb:.2f} MB")
+
+# PERFORMANS PANELİ - isteğe bağlı aşama süreleri / bellek tepe değerleri (rapor sayfa sonunda doldurulur)
+performance_panel = st.sidebar.expander("⚡ Performans")
+with performance_panel:
+    profile_enabled = st.checkbox("Aşama ölçümünü aç", key='profile_enabled')
+    profile_memory = st.checkbox("Bellek tepe değerleri (tracemalloc - yavaşlatır)", key='profile_memory',
+                                 disabled=not profile_enabled,
+                                 help="Tepe bellek süreç geneli ölçülür (aynı anda çalışan oturumlar dahil); "
+                                      "aynı anda yalnızca bir oturum bellek ölçer, diğerlerinde Tepe (MB) boş kalır")
+
+if profile_enabled:
+    if st.session_state.get('profiler') is None or st.session_state.profiler.memory != profile_memory:
+        st.session_state.profiler = StageProfiler(memory=profile_memory)
+else:
+    st.session_state.profiler = None
+
+def profiling():
+    """Ölçüm açıksa oturum profiler'ı, değilse boş context manager"""
+    return st.session_state.profiler or nullcontext()
 
 # Ana grupları al
-main_groups = sorted(forecaster.data['MainGroup'].unique().tolist())
+main_groups = forecaster.groups.tolist()
 
 # Sidebar parametreler
 st.sidebar.markdown("---")
@@ -344,7 +392,7 @@ col_inf1, col_inf2 = st.sidebar.columns(2)
 
 with col_inf1:
     inflation_past = st.number_input(
-        "2024→2025 (%)",
+        f"{forecast_year - 2}→{forecast_year - 1} (%)",
         min_value=0.0,
         max_value=100.0,
         value=st.session_state.get('inflation_past', 35.0),
@@ -354,7 +402,7 @@ with col_inf1:
 
 with col_inf2:
     inflation_future = st.number_input(
-        "2025→2026 (%)",
+        f"{forecast_year - 1}→{forecast_year} (%)",
         min_value=0.0,
         max_value=100.0,
         value=st.session_state.get('inflation_future', 25.0),
@@ -376,29 +424,22 @@ st.sidebar.subheader("🎯 Bütçe Versiyonu")
 
 budget_version = st.sidebar.select_slider(
     "Senaryo Seçin",
-    options=["🔴 Çekimser", "🟡 Normal", "🟢 İyimser"],
+    options=list(BUDGET_VERSIONS.keys()),
     value=st.session_state.get('budget_version_slider', '🟡 Normal'),
     key="budget_version_slider"
 )
 
 # Otomatik etki oranları
+organic_multiplier = BUDGET_VERSIONS[budget_version]['organic_multiplier']
+monthly_effect = BUDGET_VERSIONS[budget_version]['monthly_effect']
+maingroup_effect = BUDGET_VERSIONS[budget_version]['maingroup_effect']
+organic_growth_rate = BUDGET_VERSIONS[budget_version]['organic_growth_rate']
+
 if budget_version == "🔴 Çekimser":
-    organic_multiplier = 0.0
-    monthly_effect = 0.50  # %50 etki
-    maingroup_effect = 0.50  # %50 etki
-    organic_growth_rate = 0.10  # %10 organik
     st.sidebar.warning("**Çekimser** - Parametreler %50 etki")
 elif budget_version == "🟡 Normal":
-    organic_multiplier = 0.5
-    monthly_effect = 1.00  # %100 etki (tam)
-    maingroup_effect = 1.00  # %100 etki (tam)
-    organic_growth_rate = 0.15  # %15 organik
     st.sidebar.info("**Normal** - Parametreler %100 etki *(Önerilen)*")
 else:
-    organic_multiplier = 1.0
-    monthly_effect = 1.20  # %120 etki (artırımlı)
-    maingroup_effect = 1.20  # %120 etki (artırımlı)
-    organic_growth_rate = 0.20  # %20 organik
     st.sidebar.success("**İyimser** - Parametreler %120 etki")
 
 # GELİŞMİŞ AYARLAR (isteğe bağlı)
@@ -466,10 +507,9 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("📊 Excel İle Parametre Yönetimi")
 
 # Template indir
-template_excel = create_parameter_template()
 st.sidebar.download_button(
     label="📥 Şablon İndir",
-    data=template_excel,
+    data=create_parameter_template,
     file_name="parametre_sablonu.xlsx",
     mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     use_container_width=True
@@ -572,6 +612,60 @@ with main_tabs[0]:
             key='monthly_editor'
         )
         
+        # HEDEF ARAMA
+        with st.expander("🎯 Hedef Arama - Bütçe rakamından ay hedefini bul"):
+            if st.session_state.forecast_result is None or 'forecast_params' not in st.session_state.forecast_result:
+                st.info("ℹ️ Hedef arama son hesaplanan parametreleri kullanır - önce 'Hesapla' butonuna basın.")
+            else:
+                last_summary = st.session_state.forecast_result['summary'][forecast_year]
+                goal_metrics = {'Satış': 'Total_Sales', 'Brüt Kar': 'Total_GrossProfit'}
+                
+                col_g1, col_g2 = st.columns(2)
+                with col_g1:
+                    goal_metric = st.radio("Hedef Metrik", list(goal_metrics.keys()), horizontal=True, key='goal_metric')
+                with col_g2:
+                    goal_value = st.number_input(
+                        f"{forecast_year} Hedef (₺)",
+                        min_value=0.0,
+                        value=float(round(last_summary[goal_metrics[goal_metric]], -3)),
+                        step=1000000.0,
+                        format="%.0f",
+                        key='goal_value'
+                    )
+                
+                if st.button("🎯 Hedefi Bul", use_container_width=True):
+                    st.session_state.goal_seek_result = forecaster.solve_growth_target(
+                        goal_value,
+                        metric=goal_metrics[goal_metric],
+                        year=forecast_year,
+                        zero_mask=st.session_state.forecast_result['zero_mask'],
+                        **st.session_state.forecast_result['forecast_params']
+                    )
+                
+                goal_result = st.session_state.get('goal_seek_result')
+                if goal_result is not None:
+                    # Motor değeri etki oranı uygulanmış hedeftir - tabloya ham değer yazılır
+                    applied_effect = st.session_state.forecast_result.get('monthly_effect', monthly_effect)
+                    raw_target = goal_result['growth_target'] / applied_effect * 100 if applied_effect > 0 else 0
+                    
+                    if goal_result['converged']:
+                        st.success(f"✅ Tüm aylar için gerekli hedef: %{raw_target:.1f} "
+                                   f"({goal_result['iterations']} iterasyon, sonuç: {format_currency(goal_result['achieved'])})")
+                    else:
+                        st.warning(f"⚠️ Hedef arama aralığında tutturulamadı - en yakın: %{raw_target:.1f} "
+                                   f"({format_currency(goal_result['achieved'])})")
+                    
+                    if st.button("📥 Ay Hedeflerine Uygula", use_container_width=True):
+                        targets = st.session_state.monthly_targets.copy()
+                        not_reset = targets['Hedef (%)'].astype(str).str.strip() != '*'
+                        targets.loc[not_reset, 'Hedef (%)'] = f"{raw_target:.1f}"
+                        st.session_state.monthly_targets = targets
+                        if 'monthly_editor' in st.session_state:
+                            del st.session_state['monthly_editor']
+                        del st.session_state['goal_seek_result']
+                        save_parameters_to_file()
+                        st.rerun()
+        
            
     # --- ANA GRUP HEDEFLER ---
     with param_tabs[1]:
@@ -705,119 +799,89 @@ with main_tabs[0]:
     
     with col2:
         if st.button("📊 Hesapla ve Sonuçları Göster", type='primary', use_container_width=True):
-            with st.spinner('Tahmin hesaplanıyor...'):
+            if st.session_state.profiler is not None:
+                st.session_state.profiler.reset()
+            
+            with st.spinner('Tahmin hesaplanıyor...'), profiling():
                 # Session state güncelle
                 st.session_state.monthly_targets = edited_monthly
                 st.session_state.maingroup_targets = edited_maingroup
                 st.session_state.lessons_learned = edited_lessons
                 st.session_state.price_changes = edited_prices
                 
-                # Otomatik kaydet
-                save_parameters_to_file()
-                
-                # *** SIFIRLAMA: Sadece * kontrolü ***
-                zero_months = set()
-                zero_maingroups = set()
-                zero_lessons = set()
-                
-                # Ay hedefleri - ETKİ ORANI UYGULA
-                monthly_growth_targets = {}
-                for _, row in edited_monthly.iterrows():
-                    month = int(row['Ay'])
-                    value = str(row['Hedef (%)']).strip()
-                    
-                    if value == '*':
-                        zero_months.add(month)
-                        monthly_growth_targets[month] = -999
-                    else:
-                        try:
-                            # Etki oranı uygula
-                            monthly_growth_targets[month] = float(value) / 100 * monthly_effect
-                        except:
-                            monthly_growth_targets[month] = 0.20 * monthly_effect
-                
-                # Ana grup - ETKİ ORANI UYGULA
-                maingroup_growth_targets = {}
-                for _, row in edited_maingroup.iterrows():
-                    maingroup = row['Ana Grup']
-                    value = str(row['Hedef (%)']).strip()
-                    
-                    if value == '*':
-                        zero_maingroups.add(maingroup)
-                        maingroup_growth_targets[maingroup] = -999
-                    else:
-                        try:
-                            # Etki oranı uygula
-                            maingroup_growth_targets[maingroup] = float(value) / 100 * maingroup_effect
-                        except:
-                            maingroup_growth_targets[maingroup] = 0.20 * maingroup_effect
-                
-                # Alınan dersler
-                lessons_learned_dict = {}
-                for _, row in edited_lessons.iterrows():
-                    main_group = row['Ana Grup']
-                    for month in range(1, 13):
-                        value = str(row[str(month)]).strip()
-                        
-                        if value == '*':
-                            zero_lessons.add((main_group, month))
-                            lessons_learned_dict[(main_group, month)] = -999
-                        else:
-                            try:
-                                lessons_learned_dict[(main_group, month)] = float(value)
-                            except:
-                                lessons_learned_dict[(main_group, month)] = 0
-                
-                # Fiyat değişimi
-                price_change_dict = {}
-                for _, row in edited_prices.iterrows():
-                    main_group = row['Ana Grup']
-                    for month in range(1, 13):
-                        try:
-                            price_change_dict[(main_group, month)] = float(row[str(month)]) / 100
-                        except:
-                            price_change_dict[(main_group, month)] = inflation_future / 100
+                # Tablolar → hizalı diziler (tek seferde, * sıfırlamaları dahil)
+                parameters = ParameterSet.from_tables(
+                    edited_monthly, edited_maingroup, edited_lessons, edited_prices,
+                    inflation_rate=inflation_future / 100
+                )
+                if len(parameters.invalid):
+                    st.warning(f"⚠️ {len(parameters.invalid)} hücre okunamadı - varsayılan değer kullanıldı "
+                               "(hedef %20, ders 0, fiyat enflasyon)")
+                    st.dataframe(parameters.invalid.rename(columns={
+                        'table': 'Tablo', 'row': 'Satır', 'column': 'Kolon', 'value': 'Değer'
+                    }), hide_index=True)
                 
-                # Genel büyüme
-                general_growth = 0.10  # %10
+                # Otomatik kaydet
+                save_parameters_to_file(parameters)
                 
-                # Tahmin
-                full_data = forecaster.get_full_data_with_forecast(
-                    growth_param=general_growth,
+                # Her bütçe versiyonu için senaryo - seçili versiyon güncel (özel) etki oranlarını kullanır
+                scenario_sets = forecaster.budget_scenarios(
+                    parameters,
                     margin_improvement=margin_improvement,
                     stock_change_pct=stock_change_pct,
-                    monthly_growth_targets=monthly_growth_targets,
-                    maingroup_growth_targets=maingroup_growth_targets,
-                    lessons_learned=lessons_learned_dict,
                     inflation_adjustment=inflation_adjustment,
-                    organic_multiplier=organic_multiplier,
-                    price_change_matrix=price_change_dict,
                     inflation_rate=inflation_future / 100,
-                    organic_growth_rate=organic_growth_rate
+                    effects={budget_version: {
+                        'organic_multiplier': organic_multiplier,
+                        'monthly_effect': monthly_effect,
+                        'maingroup_effect': maingroup_effect,
+                        'organic_growth_rate': organic_growth_rate
+                    }}
                 )
                 
-                # *** SIFIRLAMA UYGULA ***
-                for month in zero_months:
-                    full_data.loc[(full_data['Year'] == 2026) & (full_data['Month'] == month),
-                                 ['Quantity', 'Sales', 'GrossProfit', 'Stock', 'COGS']] = 0
+                # * sıfırlama maskesi (Grup × Ay)
+                zero_mask = forecaster.zero_reset_mask(parameters)
                 
-                for maingroup in zero_maingroups:
-                    full_data.loc[(full_data['Year'] == 2026) & (full_data['MainGroup'] == maingroup),
-                                 ['Quantity', 'Sales', 'GrossProfit', 'Stock', 'COGS']] = 0
-                
-                for (maingroup, month) in zero_lessons:
-                    full_data.loc[(full_data['Year'] == 2026) & 
-                                 (full_data['MainGroup'] == maingroup) & 
-                                 (full_data['Month'] == month),
-                                 ['Quantity', 'Sales', 'GrossProfit', 'Stock', 'COGS']] = 0
+                # Tahmin - tüm versiyonlar tek ızgarada; önceki sonuç varsa sadece
+                # değişen Ana Gruplar yeniden hesaplanır
+                incremental = st.session_state.get('incremental_forecast')
+                if incremental is None or incremental.forecaster is not forecaster:
+                    incremental = IncrementalForecast(forecaster, scenario_sets, zero_mask=zero_mask)
+                    st.session_state.incremental_forecast = incremental
+                else:
+                    incremental.update(scenario_sets, zero_mask=zero_mask)
                 
-                summary = forecaster.get_summary_stats(full_data)
-                quality_metrics = forecaster.get_forecast_quality_metrics(full_data)
+                full_data = incremental.full_data(budget_version)
+                summary = incremental.summary(budget_version)
+                quality_metrics = incremental.quality_metrics(budget_version)
                 
                 st.session_state.forecast_result = {
                     'full_data': full_data,
                     'summary': summary,
-                    'quality_metrics': quality_metrics
+                    'quality_metrics': quality_metrics,
+                    'budget_version': budget_version,
+                    'forecast_params': {
+                        key: value for key, value in scenario_sets[list(BUDGET_VERSIONS).index(budget_version)].items()
+                        if key != 'name'
+                    },
+                    'zero_mask': zero_mask,
+                    'result_hash': frame_content_hash(full_data),
+                    'monthly_effect': monthly_effect,
+                    # Duyarlılık analizi parametreleri her enflasyon için yeniden derler
+                    'parameter_set': parameters,
+                    'maingroup_effect': maingroup_effect,
+                    # Hiyerarşinin her seviyesi için hazır toplamlar - detaya inmek yeniden hesaplama gerektirmez
+                    'rollups': {
+                        level: incremental.rollup(level, budget_version) if level != forecaster.levels[-1] else full_data
+                        for level in forecaster.levels
+                    },
+                    'scenarios': {
+                        version: {
+                            'summary': incremental.summary(version),
+                            'monthly_sales': incremental.monthly_sales(version, forecast_year)
+                        }
+                        for version in BUDGET_VERSIONS
+                    }
                 }
                 
                 st.success("✅ Tahmin başarıyla hesaplandı! Parametreler kaydedildi. 'Tahmin Sonuçları' sekmesine geçin.")
@@ -837,28 +901,28 @@ with main_tabs[1]:
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            sales_2026 = summary[2026]['Total_Sales']
-            sales_2025 = summary[2025]['Total_Sales']
-            sales_growth = ((sales_2026 - sales_2025) / sales_2025 * 100) if sales_2025 > 0 else 0
-            st.metric("2026 Toplam Satış", format_currency(sales_2026), f"%{sales_growth:.1f}")
+            sales_forecast = summary[forecast_year]['Total_Sales']
+            sales_previous = summary[forecast_year - 1]['Total_Sales']
+            sales_growth = ((sales_forecast - sales_previous) / sales_previous * 100) if sales_previous > 0 else 0
+            st.metric(f"{forecast_year} Toplam Satış", format_currency(sales_forecast), f"%{sales_growth:.1f}")
             
         with col2:
-            margin_2026 = summary[2026]['Avg_GrossMargin%']
-            margin_2025 = summary[2025]['Avg_GrossMargin%']
-            margin_diff = margin_2026 - margin_2025
-            st.metric("2026 Brüt Marj", f"%{margin_2026:.1f}", f"{margin_diff:+.1f} puan")
+            margin_forecast = summary[forecast_year]['Avg_GrossMargin%']
+            margin_previous = summary[forecast_year - 1]['Avg_GrossMargin%']
+            margin_diff = margin_forecast - margin_previous
+            st.metric(f"{forecast_year} Brüt Marj", f"%{margin_forecast:.1f}", f"{margin_diff:+.1f} puan")
         
         with col3:
-            gp_2026 = summary[2026]['Total_GrossProfit']
-            gp_2025 = summary[2025]['Total_GrossProfit']
-            gp_growth = ((gp_2026 - gp_2025) / gp_2025 * 100) if gp_2025 > 0 else 0
-            st.metric("2026 Brüt Kar", format_currency(gp_2026), f"%{gp_growth:.1f}")
+            gp_forecast = summary[forecast_year]['Total_GrossProfit']
+            gp_previous = summary[forecast_year - 1]['Total_GrossProfit']
+            gp_growth = ((gp_forecast - gp_previous) / gp_previous * 100) if gp_previous > 0 else 0
+            st.metric(f"{forecast_year} Brüt Kar", format_currency(gp_forecast), f"%{gp_growth:.1f}")
             
         with col4:
-            stock_2026 = summary[2026]['Avg_Stock_COGS_Weekly']
-            stock_2025 = summary[2025]['Avg_Stock_COGS_Weekly']
-            stock_diff = stock_2026 - stock_2025
-            st.metric("2026 Stok/SMM", f"{stock_2026:.1f} hafta", f"{stock_diff:+.1f} hft")
+            stock_forecast = summary[forecast_year]['Avg_Stock_COGS_Weekly']
+            stock_previous = summary[forecast_year - 1]['Avg_Stock_COGS_Weekly']
+            stock_diff = stock_forecast - stock_previous
+            st.metric(f"{forecast_year} Stok/SMM", f"{stock_forecast:.1f} hafta", f"{stock_diff:+.1f} hft")
         
         st.markdown("---")
         
@@ -866,7 +930,7 @@ with main_tabs[1]:
         st.markdown("### 📊 Yıllık Karşılaştırma")
         
         comparison_data = []
-        for year in [2024, 2025, 2026]:
+        for year in display_years:
             comparison_data.append({
                 'Yıl': year,
                 'Satış': format_currency(summary[year]['Total_Sales']),
@@ -882,7 +946,8 @@ with main_tabs[1]:
         st.markdown("---")
         
         # Alt sekmeler
-        result_tabs = st.tabs(["📊 Aylık Trend", "🎯 Ana Grup Performans", "📅 Yıllık Detay", "📈 Kalite Metrikleri"])
+        result_tabs = st.tabs(["📊 Aylık Trend", "🎯 Ana Grup Performans", "📅 Yıllık Detay", "📈 Kalite Metrikleri",
+                               "🔀 Bütçe Versiyonları", "🌡️ Duyarlılık Analizi"])
         
         # AYLIK TREND
         with result_tabs[0]:
@@ -892,21 +957,21 @@ with main_tabs[1]:
             
             fig = go.Figure()
             
-            colors = {'2024': '#1f77b4', '2025': '#ff7f0e', '2026': '#2ca02c'}
+            colors = year_colors
             
-            for year in [2024, 2025, 2026]:
+            for year in display_years:
                 year_data = monthly_sales[monthly_sales['Year'] == year]
                 fig.add_trace(go.Scatter(
                     x=year_data['Month'],
                     y=year_data['Sales'],
                     mode='lines+markers',
                     name=str(year),
-                    line=dict(width=3, dash='solid' if year < 2026 else 'dash', color=colors[str(year)]),
+                    line=dict(width=3, dash='solid' if year < forecast_year else 'dash', color=colors[str(year)]),
                     marker=dict(size=8)
                 ))
             
             fig.update_layout(
-                title="Aylık Satış Trendi (2024-2026)",
+                title=f"Aylık Satış Trendi ({display_years[0]}-{forecast_year})",
                 xaxis_title="Ay",
                 yaxis_title="Satış (₺)",
                 hovermode='x unified',
@@ -919,11 +984,11 @@ with main_tabs[1]:
             # Aylık detay tablo
             st.markdown("#### Aylık Detay")
             pivot_monthly = monthly_sales.pivot(index='Month', columns='Year', values='Sales')
-            pivot_monthly['2025 Büyüme %'] = ((pivot_monthly[2025] - pivot_monthly[2024]) / pivot_monthly[2024] * 100).round(1)
-            pivot_monthly['2026 Büyüme %'] = ((pivot_monthly[2026] - pivot_monthly[2025]) / pivot_monthly[2025] * 100).round(1)
+            pivot_monthly[f'{forecast_year - 1} Büyüme %'] = ((pivot_monthly[forecast_year - 1] - pivot_monthly[forecast_year - 2]) / pivot_monthly[forecast_year - 2] * 100).round(1)
+            pivot_monthly[f'{forecast_year} Büyüme %'] = ((pivot_monthly[forecast_year] - pivot_monthly[forecast_year - 1]) / pivot_monthly[forecast_year - 1] * 100).round(1)
             
-            for year in [2024, 2025, 2026]:
-                pivot_monthly[year] = pivot_monthly[year].apply(lambda x: format_currency(x))
+            for year in display_years:
+                pivot_monthly[year] = format_currency_column(pivot_monthly[year])
             
             st.dataframe(pivot_monthly, use_container_width=True)
         
@@ -931,11 +996,12 @@ with main_tabs[1]:
         with result_tabs[1]:
             st.subheader("🎯 Ana Grup Performans Karşılaştırması")
             
-            group_sales = full_data.groupby(['Year', 'MainGroup'])['Sales'].sum().reset_index()
+            rollups = st.session_state.forecast_result.get('rollups', {'MainGroup': full_data})
+            group_sales = rollups['MainGroup'].groupby(['Year', 'MainGroup'])['Sales'].sum().reset_index()
             
-            # En iyi 10 grubu al (2026 bazında)
-            top_groups_2026 = group_sales[group_sales['Year'] == 2026].nlargest(10, 'Sales')['MainGroup']
-            filtered_groups = group_sales[group_sales['MainGroup'].isin(top_groups_2026)]
+            # En iyi 10 grubu al (bütçe yılı bazında)
+            top_groups = group_sales[group_sales['Year'] == forecast_year].nlargest(10, 'Sales')['MainGroup']
+            filtered_groups = group_sales[group_sales['MainGroup'].isin(top_groups)]
             
             fig = px.bar(
                 filtered_groups,
@@ -944,7 +1010,7 @@ with main_tabs[1]:
                 color='Year',
                 barmode='group',
                 title=f"Top 10 Ana Grup - Yıllık Karşılaştırma",
-                color_discrete_map={'2024': '#1f77b4', '2025': '#ff7f0e', '2026': '#2ca02c'}
+                color_discrete_map=year_colors
             )
             
             fig.update_layout(height=500, xaxis_tickangle=-45)
@@ -954,14 +1020,39 @@ with main_tabs[1]:
             st.markdown("#### Ana Grup Büyüme Oranları")
             
             pivot_groups = group_sales.pivot(index='MainGroup', columns='Year', values='Sales')
-            pivot_groups['2025 Büyüme %'] = ((pivot_groups[2025] - pivot_groups[2024]) / pivot_groups[2024] * 100).round(1)
-            pivot_groups['2026 Büyüme %'] = ((pivot_groups[2026] - pivot_groups[2025]) / pivot_groups[2025] * 100).round(1)
-            pivot_groups = pivot_groups.sort_values('2026 Büyüme %', ascending=False)
+            pivot_groups[f'{forecast_year - 1} Büyüme %'] = ((pivot_groups[forecast_year - 1] - pivot_groups[forecast_year - 2]) / pivot_groups[forecast_year - 2] * 100).round(1)
+            pivot_groups[f'{forecast_year} Büyüme %'] = ((pivot_groups[forecast_year] - pivot_groups[forecast_year - 1]) / pivot_groups[forecast_year - 1] * 100).round(1)
+            pivot_groups = pivot_groups.sort_values(f'{forecast_year} Büyüme %', ascending=False)
             
-            for year in [2024, 2025, 2026]:
-                pivot_groups[year] = pivot_groups[year].apply(lambda x: format_currency(x))
+            for year in display_years:
+                pivot_groups[year] = format_currency_column(pivot_groups[year])
             
             st.dataframe(pivot_groups, use_container_width=True, height=600)
+            
+            # Alt kırılımlar (ör. Ana Grup → Alt Grup → SKU)
+            levels = list(rollups)
+            if len(levels) > 1:
+                st.markdown("#### 🔎 Kırılım")
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    level = st.selectbox("Seviye", levels[1:], key='drill_level')
+                parent_level = levels[levels.index(level) - 1]
+                level_data = rollups[level]
+                with col2:
+                    parent = st.selectbox(
+                        parent_level,
+                        sorted(level_data[parent_level].unique()),
+                        key='drill_parent'
+                    )
+                
+                drill = level_data[level_data[parent_level] == parent]
+                pivot_drill = drill.pivot_table(index=level, columns='Year', values='Sales', aggfunc='sum')
+                pivot_drill = pivot_drill.sort_values(pivot_drill.columns[-1], ascending=False)
+                for year in pivot_drill.columns:
+                    pivot_drill[year] = format_currency_column(pivot_drill[year])
+                
+                st.dataframe(pivot_drill, use_container_width=True)
         
         # YILLIK DETAY
         with result_tabs[2]:
@@ -990,7 +1081,7 @@ with main_tabs[1]:
             st.markdown("#### Detaylı Yıllık Metrikler")
             
             yearly_metrics = []
-            for year in [2024, 2025, 2026]:
+            for year in display_years:
                 yearly_metrics.append({
                     'Yıl': year,
                     'Toplam Satış': format_currency(summary[year]['Total_Sales']),
@@ -1025,9 +1116,10 @@ with main_tabs[1]:
                     st.metric("Trend Tutarlılığı", "N/A")
             
             with col3:
-                if quality_metrics['avg_growth_2024_2025'] is not None:
-                    st.metric("Ort. Büyüme 2024→2025", f"%{quality_metrics['avg_growth_2024_2025']:.1f}",
-                             help="2024'ten 2025'e ortalama büyüme oranı")
+                if quality_metrics['avg_growth'] is not None:
+                    prev_year, last_year = quality_metrics['years']
+                    st.metric(f"Ort. Büyüme {prev_year}→{last_year}", f"%{quality_metrics['avg_growth']:.1f}",
+                             help=f"{prev_year}'ten {last_year}'e ortalama büyüme oranı")
                 else:
                     st.metric("Ort. Büyüme", "N/A")
             
@@ -1050,6 +1142,217 @@ with main_tabs[1]:
             - **Trend Tutarlılığı:** Büyüme oranları ne kadar tutarlı (1'e yakın = çok tutarlı)
             - **Güven Seviyesi:** Genel tahmin güvenilirliği
             """)
+            
+            st.markdown("---")
+            st.markdown("#### 🎲 Belirsizlik Bantları (Monte Carlo)")
+            st.caption("Büyüme hedefi, fiyat değişimi, mevsimsellik ve organik büyüme rastgele bozularak "
+                       "binlerce tahmin yolu hesaplanır - P10 / P50 / P90 bantları")
+            
+            col_mc1, col_mc2 = st.columns([1, 1])
+            
+            with col_mc1:
+                n_draws = st.select_slider("Simülasyon Sayısı", options=[1000, 5000, 10000], value=5000)
+            
+            with col_mc2:
+                st.write("")
+                run_simulation = st.button("🎲 Simülasyonu Çalıştır", use_container_width=True)
+            
+            if run_simulation and 'forecast_params' in st.session_state.forecast_result:
+                with st.spinner(f'{n_draws:,} simülasyon hesaplanıyor...'.replace(",", ".")):
+                    st.session_state.forecast_result['simulation'] = forecaster.simulate_forecast(
+                        n_draws=n_draws,
+                        zero_mask=st.session_state.forecast_result['zero_mask'],
+                        **st.session_state.forecast_result['forecast_params']
+                    )
+            
+            simulation = st.session_state.forecast_result.get('simulation')
+            
+            if simulation is not None:
+                band_forecast = simulation['by_month'][simulation['by_month']['Year'] == forecast_year]
+                
+                fig = go.Figure()
+                fig.add_trace(go.Scatter(
+                    x=band_forecast['Month'], y=band_forecast['Sales_P90'],
+                    mode='lines', line=dict(width=0), name='P90', showlegend=False
+                ))
+                fig.add_trace(go.Scatter(
+                    x=band_forecast['Month'], y=band_forecast['Sales_P10'],
+                    mode='lines', line=dict(width=0), fill='tonexty',
+                    fillcolor='rgba(44, 160, 44, 0.2)', name='P10 - P90'
+                ))
+                fig.add_trace(go.Scatter(
+                    x=band_forecast['Month'], y=band_forecast['Sales_P50'],
+                    mode='lines+markers', line=dict(width=3, color='#2ca02c'), name='P50'
+                ))
+                
+                fig.update_layout(
+                    title=f"{forecast_year} Aylık Satış Belirsizlik Bandı ({simulation['n_draws']:,} simülasyon)".replace(",", "."),
+                    xaxis_title="Ay",
+                    yaxis_title="Satış (₺)",
+                    hovermode='x unified',
+                    height=450
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+                
+                year_band = simulation['by_year']
+                year_band = year_band[year_band['Year'] == forecast_year]
+                if len(year_band) > 0:
+                    band = year_band.iloc[0]
+                    col_p1, col_p2, col_p3 = st.columns(3)
+                    with col_p1:
+                        st.metric(f"{forecast_year} Satış P10", format_currency(band['Sales_P10']))
+                    with col_p2:
+                        st.metric(f"{forecast_year} Satış P50", format_currency(band['Sales_P50']))
+                    with col_p3:
+                        st.metric(f"{forecast_year} Satış P90", format_currency(band['Sales_P90']))
+        
+        # BÜTÇE VERSİYONLARI
+        with result_tabs[4]:
+            st.subheader("🔀 Bütçe Versiyonları Karşılaştırması")
+            st.caption("Aynı parametrelerle Çekimser / Normal / İyimser versiyonlar - tek hesaplamada")
+            
+            scenarios = st.session_state.forecast_result.get('scenarios', {})
+            
+            if not scenarios:
+                st.info("ℹ️ Versiyon karşılaştırması için tahmini yeniden hesaplayın.")
+            else:
+                version_rows = []
+                for version, result in scenarios.items():
+                    version_summary = result['summary']
+                    version_sales = version_summary[forecast_year]['Total_Sales']
+                    version_growth = ((version_sales - sales_previous) / sales_previous * 100) if sales_previous > 0 else 0
+                    version_rows.append({
+                        'Versiyon': version + (" ✅" if version == st.session_state.forecast_result['budget_version'] else ""),
+                        f'{forecast_year} Satış': format_currency(version_sales),
+                        'Büyüme %': f"%{version_growth:.1f}",
+                        f'{forecast_year} Brüt Kar': format_currency(version_summary[forecast_year]['Total_GrossProfit']),
+                        'Brüt Marj %': f"%{version_summary[forecast_year]['Avg_GrossMargin%']:.1f}",
+                        'Stok/SMM (hafta)': f"{version_summary[forecast_year]['Avg_Stock_COGS_Weekly']:.1f}"
+                    })
+                
+                st.dataframe(pd.DataFrame(version_rows), use_container_width=True, hide_index=True)
+                
+                version_colors = {"🔴 Çekimser": '#d62728', "🟡 Normal": '#ff7f0e', "🟢 İyimser": '#2ca02c'}
+                
+                fig = go.Figure()
+                for version, result in scenarios.items():
+                    fig.add_trace(go.Scatter(
+                        x=result['monthly_sales'].index,
+                        y=result['monthly_sales'].values,
+                        mode='lines+markers',
+                        name=version,
+                        line=dict(width=3, color=version_colors.get(version))
+                    ))
+                
+                fig.update_layout(
+                    title=f"{forecast_year} Aylık Satış - Versiyonlar",
+                    xaxis_title="Ay",
+                    yaxis_title="Satış (₺)",
+                    hovermode='x unified',
+                    height=450
+                )
+                
+                st.plotly_chart(fig, use_container_width=True)
+        
+        # DUYARLILIK ANALİZİ
+        with result_tabs[5]:
+            st.subheader("🌡️ Duyarlılık Analizi")
+            st.caption("Marj iyileşme × Stok değişimi × Enflasyon ızgarası - diğer parametreler son hesaplamadaki gibi")
+            
+            inflation_column = f'Enflasyon {forecast_year} (%)'
+            
+            col_s1, col_s2, col_s3 = st.columns(3)
+            
+            with col_s1:
+                sweep_margin = st.slider("Brüt Marj İyileşme (puan)", min_value=-5.0, max_value=10.0,
+                                         value=(1.0, 4.0), step=0.5, key='sweep_margin')
+            
+            with col_s2:
+                sweep_stock = st.slider("Stok Tutar Değişimi (%)", min_value=-50.0, max_value=100.0,
+                                        value=(-20.0, 20.0), step=5.0, key='sweep_stock')
+            
+            with col_s3:
+                sweep_inflation = st.multiselect(f"{forecast_year - 1}→{forecast_year} Enflasyon (%)", options=[15.0, 20.0, 25.0, 30.0, 35.0, 40.0],
+                                                 default=[25.0], key='sweep_inflation')
+            
+            if st.button("🌡️ Analizi Çalıştır", use_container_width=True) and 'parameter_set' in st.session_state.forecast_result:
+                sweep_grid = {
+                    'margin_improvement': np.arange(sweep_margin[0], sweep_margin[1] + 0.25, 0.5) / 100,
+                    'stock_change_pct': np.arange(sweep_stock[0], sweep_stock[1] + 2.5, 5.0) / 100,
+                    # Enflasyon hem organik büyüme düzeltmesini hem girilmeyen fiyat değişimlerini belirler
+                    ('inflation_adjustment', 'inflation_rate'): [
+                        (value / inflation_past if inflation_past > 0 else 1.0, value / 100)
+                        for value in (sweep_inflation or [inflation_future])
+                    ]
+                }
+                swept = {'margin_improvement', 'stock_change_pct', 'inflation_adjustment', 'inflation_rate'}
+                sweep_base = {
+                    key: value for key, value in st.session_state.forecast_result['forecast_params'].items()
+                    if key not in swept
+                }
+                # Derlenmiş parametreler yerine tablolar - her enflasyon için ayrı derlenir
+                sweep_base['parameters'] = st.session_state.forecast_result['parameter_set']
+                
+                with st.spinner('Izgara hesaplanıyor...'):
+                    sweep_result = forecaster.sweep_parameters(
+                        sweep_grid,
+                        zero_mask=st.session_state.forecast_result['zero_mask'],
+                        monthly_effect=st.session_state.forecast_result['monthly_effect'],
+                        maingroup_effect=st.session_state.forecast_result['maingroup_effect'],
+                        **sweep_base
+                    )
+                
+                sweep_result['Marj İyileşme (puan)'] = sweep_result['margin_improvement'] * 100
+                sweep_result['Stok Değişimi (%)'] = sweep_result['stock_change_pct'] * 100
+                sweep_result[inflation_column] = sweep_result['inflation_rate'] * 100
+                st.session_state.forecast_result['sweep'] = sweep_result
+            
+            sweep_result = st.session_state.forecast_result.get('sweep')
+            
+            if sweep_result is not None:
+                sweep_metrics = {
+                    'Satış': 'Total_Sales',
+                    'Brüt Kar': 'Total_GrossProfit',
+                    'Brüt Marj %': 'Avg_GrossMargin%',
+                    'Stok/SMM (hafta)': 'Avg_Stock_COGS_Weekly'
+                }
+                
+                col_h1, col_h2 = st.columns(2)
+                with col_h1:
+                    heatmap_metric = st.selectbox("Metrik", list(sweep_metrics.keys()), key='sweep_metric')
+                with col_h2:
+                    inflation_values = sorted(sweep_result[inflation_column].round(1).unique())
+                    heatmap_inflation = st.selectbox("Enflasyon (%)", inflation_values, key='sweep_inflation_slice')
+                
+                heatmap_data = sweep_result[sweep_result[inflation_column].round(1) == heatmap_inflation].pivot(
+                    index='Stok Değişimi (%)',
+                    columns='Marj İyileşme (puan)',
+                    values=sweep_metrics[heatmap_metric]
+                )
+                
+                fig = px.imshow(
+                    heatmap_data,
+                    aspect='auto',
+                    color_continuous_scale='RdYlGn' if heatmap_metric != 'Stok/SMM (hafta)' else 'RdYlGn_r',
+                    labels=dict(x="Marj İyileşme (puan)", y="Stok Değişimi (%)", color=heatmap_metric),
+                    title=f"{forecast_year} {heatmap_metric} - Enflasyon %{heatmap_inflation:.0f}"
+                )
+                fig.update_layout(height=500)
+                st.plotly_chart(fig, use_container_width=True)
+                
+                sweep_table = sweep_result[['Marj İyileşme (puan)', 'Stok Değişimi (%)', inflation_column,
+                                            'Total_Sales', 'Total_GrossProfit', 'Avg_GrossMargin%',
+                                            'Avg_Stock_COGS_Weekly']]
+                st.dataframe(sweep_table, use_container_width=True, hide_index=True, height=300)
+                
+                st.download_button(
+                    label="📥 Duyarlılık Tablosu (CSV)",
+                    data=sweep_table.to_csv(index=False, encoding='utf-8-sig'),
+                    file_name=f"duyarlilik_analizi_{forecast_year}.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
 
 # ==================== DETAY VERİLER ====================
 with main_tabs[2]:
@@ -1064,7 +1367,8 @@ with main_tabs[2]:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            selected_year = st.selectbox("Yıl Seçin", [2024, 2025, 2026], index=2)
+            years = report_years(full_data)
+            selected_year = st.selectbox("Yıl Seçin", years, index=len(years) - 1)
         
         with col2:
             selected_month = st.selectbox("Ay Seçin", list(range(1, 13)))
@@ -1115,14 +1419,11 @@ with main_tabs[2]:
             'Stock_COGS_Ratio'
         ]].copy()
         
-        display_data['Sales'] = display_data['Sales'].apply(lambda x: format_currency(x))
-        display_data['GrossProfit'] = display_data['GrossProfit'].apply(lambda x: format_currency(x))
-        display_data['COGS'] = display_data['COGS'].apply(lambda x: format_currency(x))
-        display_data['Stock'] = display_data['Stock'].apply(lambda x: format_currency(x))
-        display_data['Quantity'] = display_data['Quantity'].apply(lambda x: format_number(x, 0))
-        display_data['UnitPrice'] = display_data['UnitPrice'].apply(lambda x: format_currency(x))
-        display_data['GrossMargin%'] = display_data['GrossMargin%'].apply(lambda x: f"%{x*100:.1f}")
-        display_data['Stock_COGS_Ratio'] = display_data['Stock_COGS_Ratio'].apply(lambda x: f"{x:.3f}")
+        for col in ['Sales', 'GrossProfit', 'COGS', 'Stock', 'UnitPrice']:
+            display_data[col] = format_currency_column(display_data[col])
+        display_data['Quantity'] = format_number_column(display_data['Quantity'], 0)
+        display_data['GrossMargin%'] = format_percent_column(display_data['GrossMargin%'] * 100)
+        display_data['Stock_COGS_Ratio'] = format_number_column(display_data['Stock_COGS_Ratio'], 3)
         
         st.dataframe(display_data, use_container_width=True, height=600)
         
@@ -1132,12 +1433,14 @@ with main_tabs[2]:
         
         col_exp1, col_exp2, col_exp3 = st.columns(3)
         
-        # CSV Export (seçili veri)
+        result_hash = st.session_state.forecast_result['result_hash']
+        
+        # CSV Export (seçili veri) - anahtar sonuç hash'i + filtre seçimleri (her yeniden çalışmada hash yok)
         with col_exp1:
-            csv_filtered = filtered_data.to_csv(index=False, encoding='utf-8-sig')
+            filter_key = f'{result_hash}/{selected_year}/{selected_month}/{selected_maingroup}'
             st.download_button(
                 label="📥 Seçili Veriyi İndir (CSV)",
-                data=csv_filtered,
+                data=partial(export_artifact, 'csv', filter_key, filtered_data),
                 file_name=f"budget_{selected_year}_{selected_month:02d}.csv",
                 mime="text/csv",
                 use_container_width=True
@@ -1145,10 +1448,9 @@ with main_tabs[2]:
         
         # CSV Export (tüm veri)
         with col_exp2:
-            csv_all = full_data.to_csv(index=False, encoding='utf-8-sig')
             st.download_button(
                 label="📥 Tüm Veriyi İndir (CSV)",
-                data=csv_all,
+                data=partial(export_artifact, 'csv', result_hash, full_data),
                 file_name="budget_full_data.csv",
                 mime="text/csv",
                 use_container_width=True
@@ -1156,34 +1458,9 @@ with main_tabs[2]:
         
         # Excel Export
         with col_exp3:
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                # Her yıl için ayrı sheet
-                for year in [2024, 2025, 2026]:
-                    year_data = full_data[full_data['Year'] == year]
-                    year_data.to_excel(writer, sheet_name=str(year), index=False)
-                
-                # Özet sheet
-                summary_data = []
-                for year in [2024, 2025, 2026]:
-                    for month in range(1, 13):
-                        month_data = full_data[(full_data['Year'] == year) & (full_data['Month'] == month)]
-                        summary_data.append({
-                            'Yıl': year,
-                            'Ay': month,
-                            'Satış': month_data['Sales'].sum(),
-                            'Brüt Kar': month_data['GrossProfit'].sum(),
-                            'Adet': month_data['Quantity'].sum()
-                        })
-                
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Özet', index=False)
-            
-            output.seek(0)
-            
             st.download_button(
                 label="📥 Excel Rapor İndir",
-                data=output,
+                data=partial(export_artifact, 'detail_xlsx', result_hash, full_data, st.session_state.profiler),
                 file_name="budget_detay_rapor.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
@@ -1194,136 +1471,24 @@ with main_tabs[2]:
         st.markdown("## 📊 Ay Bazında Performans Raporu")
         st.caption("Her ayın yıl toplamına oranları ve yıllık büyüme oranları")
         
-        # Ay günleri / 7 = hafta
-        days_in_month = {
-            1: 31/7, 2: 28/7, 3: 31/7, 4: 30/7, 5: 31/7, 6: 30/7,
-            7: 31/7, 8: 31/7, 9: 30/7, 10: 31/7, 11: 30/7, 12: 31/7
-        }
-        
-        # Rapor hesaplama
-        monthly_performance = []
-        
-        for month in range(1, 13):
-            month_name = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
-                         'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık'][month-1]
-            
-            row_data = {
-                'Ay': month,
-                'Ay Adı': month_name
-            }
-            
-            # Her yıl için veri topla
-            year_data_dict = {}
-            
-            for year in [2024, 2025, 2026]:
-                year_data = full_data[full_data['Year'] == year]
-                month_data = year_data[year_data['Month'] == month]
-                
-                # Yıllık toplamlar
-                yearly_sales = year_data['Sales'].sum()
-                yearly_quantity = year_data['Quantity'].sum()
-                yearly_gp = year_data['GrossProfit'].sum()
-                
-                if len(month_data) > 0:
-                    # Aylık toplamlar
-                    monthly_sales = month_data['Sales'].sum()
-                    monthly_quantity = month_data['Quantity'].sum()
-                    monthly_gp = month_data['GrossProfit'].sum()
-                    monthly_cogs = month_data['COGS'].sum()
-                    monthly_stock = month_data['Stock'].sum()  # SUM! (mean değil)
-                    
-                    # Yüzdeler
-                    sales_pct = (monthly_sales / yearly_sales * 100) if yearly_sales > 0 else 0
-                    quantity_pct = (monthly_quantity / yearly_quantity * 100) if yearly_quantity > 0 else 0
-                    gp_pct = (monthly_gp / yearly_gp * 100) if yearly_gp > 0 else 0
-                    
-                    # Brüt Marj %
-                    bm_pct = (monthly_gp / monthly_sales * 100) if monthly_sales > 0 else 0
-                    
-                    # Stok Hafta
-                    weeks_in_month = days_in_month[month]
-                    stock_weeks = (monthly_stock / monthly_cogs * weeks_in_month) if monthly_cogs > 0 else 0
-                    
-                    year_data_dict[year] = {
-                        'ciro': monthly_sales,
-                        'ciro_pct': sales_pct,
-                        'adet': monthly_quantity,
-                        'adet_pct': quantity_pct,
-                        'kar': monthly_gp,
-                        'kar_pct': gp_pct,
-                        'bm': bm_pct,
-                        'stok_hft': stock_weeks
-                    }
-                else:
-                    year_data_dict[year] = {
-                        'ciro': 0, 'ciro_pct': 0, 'adet': 0, 'adet_pct': 0,
-                        'kar': 0, 'kar_pct': 0, 'bm': 0, 'stok_hft': 0
-                    }
-            
-            # YENİ DÜZEN: Cirolar yan yana, Ciro%'ler yan yana...
-            row_data['2024 Ciro'] = year_data_dict[2024]['ciro']
-            row_data['2025 Ciro'] = year_data_dict[2025]['ciro']
-            row_data['2026 Ciro'] = year_data_dict[2026]['ciro']
-            
-            row_data['2024 Ciro %'] = year_data_dict[2024]['ciro_pct']
-            row_data['2025 Ciro %'] = year_data_dict[2025]['ciro_pct']
-            row_data['2026 Ciro %'] = year_data_dict[2026]['ciro_pct']
-            
-            row_data['2024 Adet'] = year_data_dict[2024]['adet']
-            row_data['2025 Adet'] = year_data_dict[2025]['adet']
-            row_data['2026 Adet'] = year_data_dict[2026]['adet']
-            
-            row_data['2024 Adet %'] = year_data_dict[2024]['adet_pct']
-            row_data['2025 Adet %'] = year_data_dict[2025]['adet_pct']
-            row_data['2026 Adet %'] = year_data_dict[2026]['adet_pct']
-            
-            row_data['2024 Kar'] = year_data_dict[2024]['kar']
-            row_data['2025 Kar'] = year_data_dict[2025]['kar']
-            row_data['2026 Kar'] = year_data_dict[2026]['kar']
-            
-            row_data['2024 Kar %'] = year_data_dict[2024]['kar_pct']
-            row_data['2025 Kar %'] = year_data_dict[2025]['kar_pct']
-            row_data['2026 Kar %'] = year_data_dict[2026]['kar_pct']
-            
-            row_data['2024 BM %'] = year_data_dict[2024]['bm']
-            row_data['2025 BM %'] = year_data_dict[2025]['bm']
-            row_data['2026 BM %'] = year_data_dict[2026]['bm']
-            
-            row_data['2024 Stok Hft'] = year_data_dict[2024]['stok_hft']
-            row_data['2025 Stok Hft'] = year_data_dict[2025]['stok_hft']
-            row_data['2026 Stok Hft'] = year_data_dict[2026]['stok_hft']
-            
-            # BÜYÜME ORANLARI (2026/2025)
-            ciro_growth = ((year_data_dict[2026]['ciro'] - year_data_dict[2025]['ciro']) / year_data_dict[2025]['ciro'] * 100) if year_data_dict[2025]['ciro'] > 0 else 0
-            adet_growth = ((year_data_dict[2026]['adet'] - year_data_dict[2025]['adet']) / year_data_dict[2025]['adet'] * 100) if year_data_dict[2025]['adet'] > 0 else 0
-            kar_growth = ((year_data_dict[2026]['kar'] - year_data_dict[2025]['kar']) / year_data_dict[2025]['kar'] * 100) if year_data_dict[2025]['kar'] > 0 else 0
-            
-            row_data['26/25 Ciro Büyüme %'] = ciro_growth
-            row_data['26/25 Adet Büyüme %'] = adet_growth
-            row_data['26/25 Kar Büyüme %'] = kar_growth
-            
-            monthly_performance.append(row_data)
-        
-        performance_df = pd.DataFrame(monthly_performance)
+        # Rapor hesaplama - tek (Yıl, Ay) gruplaması
+        performance_years = report_years(full_data)
+        performance_df = build_monthly_performance(full_data, years=performance_years)
         
         # Formatlama
         display_report = performance_df.copy()
         
         # Cirolar
-        for year in [2024, 2025, 2026]:
-            display_report[f'{year} Ciro'] = display_report[f'{year} Ciro'].apply(lambda x: format_currency(x))
-            display_report[f'{year} Ciro %'] = display_report[f'{year} Ciro %'].apply(lambda x: f"%{x:.1f}")
-            display_report[f'{year} Adet'] = display_report[f'{year} Adet'].apply(lambda x: format_number(x, 0))
-            display_report[f'{year} Adet %'] = display_report[f'{year} Adet %'].apply(lambda x: f"%{x:.1f}")
-            display_report[f'{year} Kar'] = display_report[f'{year} Kar'].apply(lambda x: format_currency(x))
-            display_report[f'{year} Kar %'] = display_report[f'{year} Kar %'].apply(lambda x: f"%{x:.1f}")
-            display_report[f'{year} BM %'] = display_report[f'{year} BM %'].apply(lambda x: f"%{x:.1f}")
-            display_report[f'{year} Stok Hft'] = display_report[f'{year} Stok Hft'].apply(lambda x: f"{x:.1f}")
-        
-        # Büyüme oranları
-        display_report['26/25 Ciro Büyüme %'] = display_report['26/25 Ciro Büyüme %'].apply(lambda x: f"%{x:.1f}")
-        display_report['26/25 Adet Büyüme %'] = display_report['26/25 Adet Büyüme %'].apply(lambda x: f"%{x:.1f}")
-        display_report['26/25 Kar Büyüme %'] = display_report['26/25 Kar Büyüme %'].apply(lambda x: f"%{x:.1f}")
+        for year in performance_years:
+            display_report[f'{year} Ciro'] = format_currency_column(display_report[f'{year} Ciro'])
+            display_report[f'{year} Adet'] = format_number_column(display_report[f'{year} Adet'], 0)
+            display_report[f'{year} Kar'] = format_currency_column(display_report[f'{year} Kar'])
+            display_report[f'{year} Stok Hft'] = format_number_column(display_report[f'{year} Stok Hft'], 1)
+        
+        # Oranlar ve büyüme oranları
+        for col in display_report.columns:
+            if col.endswith('%'):
+                display_report[col] = format_percent_column(display_report[col])
         
         # Tabloyu göster
         st.dataframe(
@@ -1342,36 +1507,57 @@ with main_tabs[2]:
         
         with col_r1:
             # CSV
-            report_csv = performance_df.to_csv(index=False, encoding='utf-8-sig')
             st.download_button(
                 label="📥 Performans Raporu (CSV)",
-                data=report_csv,
-                file_name="ay_bazinda_performans_2024_2026.csv",
+                data=partial(export_artifact, 'csv', f'{result_hash}/performans', performance_df),
+                file_name=f"ay_bazinda_performans_{performance_years[0]}_{performance_years[-1]}.csv",
                 mime="text/csv",
                 use_container_width=True
             )
         
         with col_r2:
             # Excel
-            report_output = BytesIO()
-            with pd.ExcelWriter(report_output, engine='openpyxl') as writer:
-                performance_df.to_excel(writer, sheet_name='Ay Bazında Performans', index=False)
-            
-            report_output.seek(0)
-            
             st.download_button(
                 label="📥 Performans Raporu (Excel)",
-                data=report_output,
+                data=partial(export_artifact, 'performance_xlsx', result_hash, performance_df, st.session_state.profiler),
                 file_name="ay_bazinda_performans_raporu.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 use_container_width=True
             )
 
+# PERFORMANS RAPORU - bu çalıştırmada ölçülen aşamalar
+with performance_panel:
+    st.caption("Veri yükleme: " + ", ".join(
+        f"{stage} {seconds:.2f} sn" for stage, seconds in forecaster.load_timings.items()
+    ))
+    profiler = st.session_state.profiler
+    if profiler is None:
+        st.caption("Ölçüm kapalı")
+    elif not profiler.records:
+        st.caption("Henüz ölçüm yok - 'Hesapla' ile başlayın")
+    else:
+        report = profiler.report()
+        report['stage'] = report['stage'].str.split('/').str[-1].radd(
+            report['stage'].str.count('/').map(lambda depth: '· ' * depth)
+        )
+        st.dataframe(
+            report.rename(columns={'stage': 'Aşama', 'calls': 'Çağrı', 'total_seconds': 'Toplam (sn)',
+                                   'max_seconds': 'En uzun (sn)', 'peak_mb': 'Tepe (MB)'}),
+            hide_index=True, use_container_width=True
+        )
+        st.download_button(
+            label="📥 Ölçümleri İndir (JSON)",
+            data=profiler.to_json(),
+            file_name="performans_olcumleri.json",
+            mime="application/json",
+            use_container_width=True
+        )
+
 # Footer
 st.markdown("---")
-st.markdown("""
+st.markdown(f"""
 <div style='text-align: center; color: #666; padding: 20px;'>
-<p><b>2026 Satış Bütçe Tahmin Sistemi v3.1</b></p>
+<p><b>{forecast_year} Satış Bütçe Tahmin Sistemi v3.1</b></p>
 <p>Parametrik Etki Oranları | Gelişmiş Analiz | Otomatik Kayıt</p>
 </div>
 """, unsafe_allow_html=True)
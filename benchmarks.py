@@ -0,0 +1,256 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+from budget_forecast import (EXCEL_METRIC_COLUMNS, FIRST_DATA_YEAR, BudgetForecaster, build_monthly_performance,
+                             write_detail_report)
+
+# Bir Excel sayfasının satır sınırı - Sayfa1 (Ay × Seri satırı) bunu aşarsa dosya yazılamaz
+EXCEL_MAX_ROWS = 1048576
+
+BENCHMARK_SIZES = [20, 1000, 10000, 100000]
+BENCHMARK_STAGES = ['__init__', 'read_excel', 'process_data', 'forecast_future_months', 'combine_with_history',
+                    'get_summary_stats', 'get_forecast_quality_metrics', 'monthly_performance', 'excel_export']
+
+
+def synthetic_actuals(num_series, years=2, last_month=10, seasonality=0.3, growth=0.35, num_subgroups=1, seed=0):
+    """
+    Sentetik gerçekleşen veri - Excel'den okunmuş Sayfa1 tablosuyla aynı düzen
+    
+    Her ay için tüm seriler ve bir 'N Toplam' satırı; her yıl bloğunda EXCEL_METRIC_COLUMNS
+    (ikinci yıldan itibaren '.1', '.2' son ekiyle). Son yılın last_month sonrası boştur.
+    
+    Parameters:
+    -----------
+    num_series: Seri sayısı (num_subgroups > 1 ise Ana Grup × Alt Grup yaprakları)
+    years: Yıl bloğu sayısı (ilki FIRST_DATA_YEAR)
+    last_month: Son yılın son gerçekleşen ayı
+    seasonality: Mevsimsellik genliği (seri başına rastgele faz)
+    growth: Yıllık ortalama büyüme
+    num_subgroups: Ana Grup başına Alt Grup sayısı (1 = tek seviye)
+    seed: Rastgele sayı üreteci tohumu
+    """
+    rng = np.random.default_rng(seed)
+    months = np.arange(1, 13)
+    
+    # Seri düzeyi: büyüklük, faz, fiyat, marj, stok devir
+    base = rng.lognormal(13, 1, num_series)
+    phase = rng.integers(0, 12, num_series)
+    unit_price = rng.uniform(50, 500, num_series)
+    margin = np.clip(rng.normal(0.35, 0.08, num_series), 0.05, 0.8)
+    stock_cover = rng.uniform(0.5, 4, num_series)
+    
+    # (Yıl × Ay × Seri)
+    season = 1 + seasonality * np.sin(2 * np.pi * (months[:, None] + phase) / 12)
+    year_growth = (1 + growth * rng.uniform(0.7, 1.3, (years, 1, num_series))).cumprod(axis=0) / (1 + growth)
+    sales = base * season * year_growth * rng.uniform(0.9, 1.1, (years, 12, num_series))
+    gross_margin = np.clip(margin + rng.normal(0, 0.02, sales.shape), 0.01, 0.95)
+    metrics = {
+        'Quantity': np.round(sales / (unit_price * year_growth)),
+        'Sales': sales,
+        'GrossProfit': sales * gross_margin,
+        'GrossMargin%': gross_margin,
+        'Stock': sales * (1 - gross_margin) * stock_cover
+    }
+    actual = np.ones((years, 12, 1), dtype=bool)
+    actual[-1, last_month:] = False
+    
+    # Satırlar: her ay için seriler + toplam satırı
+    num_groups = -(-num_series // num_subgroups)
+    group_names = np.array([f'GRP {i:05d}' for i in range(num_groups)], dtype=object)
+    columns = {
+        'Month': np.concatenate([np.append(np.full(num_series, month, dtype=object), f'{month} Toplam')
+                                 for month in months]),
+        'MainGroupDesc': np.tile(np.append(group_names[np.arange(num_series) // num_subgroups], None), 12)
+    }
+    if num_subgroups > 1:
+        sub_names = np.array([f'ALT {i:02d}' for i in range(num_subgroups)], dtype=object)
+        columns['SubGroupDesc'] = np.tile(np.append(sub_names[np.arange(num_series) % num_subgroups], None), 12)
+    
+    for k in range(years):
+        suffix = f'.{k}' if k else ''
+        for excel_col, col in EXCEL_METRIC_COLUMNS.items():
+            values = np.where(actual[k], metrics[col][k], np.nan)
+            columns[f'{excel_col}{suffix}'] = np.column_stack([values, np.full(12, np.nan)]).ravel()
+    
+    return pd.DataFrame(columns)
+
+
+def write_actuals_workbook(frame, path):
+    """Sentetik tabloyu Sayfa1 Excel'i olarak yaz (başlık 2. satırda, 1. satır yıl etiketleri)"""
+    if len(frame) + 2 > EXCEL_MAX_ROWS:
+        raise ValueError(f"Sayfa1 {len(frame) + 2} satır - Excel sınırı {EXCEL_MAX_ROWS}")
+    
+    # 'TY Sales Unit.1' → 'TY Sales Unit' (ikinci yıl bloğu)
+    blocks = [col.rsplit('.', 1) if col.rsplit('.', 1)[-1].isdigit() else [col, '0'] for col in frame.columns]
+    header = [name for name, _ in blocks]
+    years = [FIRST_DATA_YEAR + int(block) for _, block in blocks]
+    first_metric = list(EXCEL_METRIC_COLUMNS)[0]
+    
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Sayfa1')
+    sheet.append([str(year) if name == first_metric else None for name, year in zip(header, years)])
+    sheet.append(header)
+    values = frame.astype(object).where(frame.notna(), None).to_numpy()
+    for row in values.tolist():
+        sheet.append(row)
+    workbook.save(path)
+
+
+def _best_time(function, repeat):
+    """En iyi süre (sn) ve son çağrının sonucu"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def benchmark_size(num_series, workdir, years=2, repeat=3, seed=0, num_subgroups=1):
+    """
+    Bir ölçek için tüm aşamaları ölç
+    
+    Sayfa1 Excel satır sınırına sığıyorsa forecaster Excel'den (__init__), sığmıyorsa ham
+    tablodan (from_frame - read_excel ve __init__ atlanır) yüklenir. Yükleme bir kez,
+    sonraki aşamalar repeat kez ölçülüp en iyi süre alınır.
+    
+    Returns:
+    --------
+    List[Dict]: Aşama başına 'series', 'rows', 'stage', 'seconds' (atlandıysa None) ve 'note'
+    """
+    frame = synthetic_actuals(num_series, years=years, seed=seed, num_subgroups=num_subgroups)
+    records = []
+    
+    def record(stage, seconds, note=''):
+        records.append({'series': num_series, 'rows': len(frame), 'stage': stage, 'seconds': seconds, 'note': note})
+    
+    if len(frame) + 2 <= EXCEL_MAX_ROWS:
+        path = os.path.join(workdir, f'actuals_{num_series}_{years}y_{num_subgroups}s_{seed}.xlsx')
+        if not os.path.exists(path):
+            write_actuals_workbook(frame, path)
+        start = time.perf_counter()
+        forecaster = BudgetForecaster(path)
+        record('__init__', time.perf_counter() - start)
+        record('read_excel', forecaster.load_timings['read_excel'])
+    else:
+        note = 'Sayfa1 Excel satır sınırını aşıyor - from_frame'
+        forecaster = BudgetForecaster.from_frame(frame)
+        record('__init__', None, note)
+        record('read_excel', None, note)
+    record('process_data', forecaster.load_timings['process_data'])
+    
+    seconds, forecast = _best_time(forecaster.forecast_future_months, repeat)
+    record('forecast_future_months', seconds)
+    seconds, full_data = _best_time(lambda: forecaster.combine_with_history(forecast), repeat)
+    record('combine_with_history', seconds)
+    record('get_summary_stats', _best_time(lambda: forecaster.get_summary_stats(full_data), repeat)[0])
+    record('get_forecast_quality_metrics',
+           _best_time(lambda: forecaster.get_forecast_quality_metrics(full_data), repeat)[0])
+    record('monthly_performance', _best_time(lambda: build_monthly_performance(full_data), repeat)[0])
+    
+    if full_data['Year'].value_counts().max() + 1 <= EXCEL_MAX_ROWS:
+        record('excel_export', _best_time(lambda: write_detail_report(full_data, BytesIO()), 1)[0])
+    else:
+        record('excel_export', None, 'Yıl sheet\'i Excel satır sınırını aşıyor')
+    
+    return records
+
+
+def benchmark_metadata():
+    """Sonuç dosyası için ortam bilgisi (commit, sürümler, makine)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    
+    return {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run_benchmarks(sizes=BENCHMARK_SIZES, workdir='.benchmarks', years=2, repeat=3, seed=0, num_subgroups=1):
+    """
+    Tüm ölçekleri ölç
+    
+    Returns:
+    --------
+    Dict: 'meta' (benchmark_metadata) ve 'results' (benchmark_size kayıtları) - JSON'a yazılabilir
+    """
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+    for num_series in sizes:
+        start = time.perf_counter()
+        results += benchmark_size(num_series, workdir, years=years, repeat=repeat, seed=seed,
+                                  num_subgroups=num_subgroups)
+        print(f"⏱️ {num_series} seri: {time.perf_counter() - start:.1f} sn")
+    
+    meta = benchmark_metadata()
+    meta.update({'years': years, 'repeat': repeat, 'seed': seed, 'num_subgroups': num_subgroups})
+    return {'meta': meta, 'results': results}
+
+
+def compare_results(baseline, current, threshold=1.2):
+    """
+    İki sonuç dosyasını (seri × aşama) karşılaştır
+    
+    Returns:
+    --------
+    DataFrame: baseline / current süreleri, oran (current / baseline) ve threshold'u aşan
+               aşamalar için 'regression' işareti
+    """
+    def table(results):
+        return pd.DataFrame(results['results']).set_index(['series', 'stage'])['seconds']
+    
+    comparison = pd.concat({'baseline': table(baseline), 'current': table(current)}, axis=1).dropna()
+    comparison['ratio'] = comparison['current'] / comparison['baseline']
+    comparison['regression'] = comparison['ratio'] > threshold
+    return comparison
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="BudgetForecaster ölçek benchmark'ı (sentetik Sayfa1 verisi)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_SIZES, help="Seri sayıları")
+    parser.add_argument('--years', type=int, default=2, help="Yıl bloğu sayısı")
+    parser.add_argument('--subgroups', type=int, default=1, help="Ana Grup başına Alt Grup sayısı")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', default='.benchmarks', help="Üretilen Excel dosyaları")
+    parser.add_argument('-o', '--output', default='benchmark_results.json')
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Regresyon sayılan süre oranı")
+    args = parser.parse_args()
+    
+    results = run_benchmarks(args.sizes, workdir=args.workdir, years=args.years, repeat=args.repeat,
+                             seed=args.seed, num_subgroups=args.subgroups)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    
+    table = pd.DataFrame(results['results']).pivot(index='stage', columns='series', values='seconds')
+    print(table.reindex(BENCHMARK_STAGES).to_string(float_format=lambda x: f'{x:.3f}'))
+    print(f"💾 {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            comparison = compare_results(json.load(f), results, threshold=args.threshold)
+        print(comparison.to_string(float_format=lambda x: f'{x:.3f}'))
+        if comparison['regression'].any():
+            print(f"⚠️ {int(comparison['regression'].sum())} aşamada regresyon (> ×{args.threshold})")
+            sys.exit(1)
@@ -0,0 +1,172 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+from budget_forecast import (BUDGET_VERSIONS, BudgetForecaster, IncrementalForecast, build_monthly_performance,
+                             read_parameter_file, write_detail_report)
+from data_cache import ParsedDataCache
+
+# Çıktı formatları → (uzantı, yazıcı)
+OUTPUT_FORMATS = {
+    'csv': ('csv', lambda data, path: data.to_csv(path, index=False, encoding='utf-8-sig')),
+    'xlsx': ('xlsx', write_detail_report),
+    'parquet': ('parquet', lambda data, path: data.to_parquet(path, index=False))
+}
+
+
+def parameter_files(path):
+    """Tek parametre dosyası veya bir klasördeki tüm *.json dosyaları (sıralı)"""
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(path, '*.json')))
+    return [path]
+
+
+def version_label(version):
+    """Dosya adı için versiyon etiketi: '🟡 Normal' → 'Normal'"""
+    return version.split(' ', 1)[-1]
+
+
+def run_parameter_file(forecaster, path, output_dir, formats=('csv',), all_versions=False, num_months=15,
+                       executor=None, performance=False):
+    """
+    Bir parametre dosyası için tüm bütçe versiyonlarını tek ızgarada hesapla ve çıktıları yaz
+    
+    performance=True ise her versiyon için ay bazında performans raporu da yazılır
+    ('<ad>_performans.csv')
+    
+    Returns:
+    --------
+    Tuple[DataFrame, Dict]: Yazılan versiyonların yıllık özeti ve adım süreleri (sn)
+    """
+    timings = {}
+    name = os.path.splitext(os.path.basename(path))[0]
+    
+    start = time.perf_counter()
+    params = read_parameter_file(path)
+    parameters = params['parameters']
+    if len(parameters.invalid):
+        cells = ', '.join(f"{cell.table}[{cell.row}, {cell.column}]={cell.value!r}"
+                          for cell in parameters.invalid.head(10).itertuples())
+        print(f"⚠️ {name}: {len(parameters.invalid)} okunamayan hücre varsayılanla dolduruldu: {cells}",
+              file=sys.stderr)
+    inflation_rate = params['inflation_future'] / 100
+    scenario_sets = forecaster.budget_scenarios(
+        parameters,
+        margin_improvement=params['margin_improvement'] / 100,
+        stock_change_pct=params['stock_change_pct'] / 100,
+        inflation_adjustment=(params['inflation_future'] / params['inflation_past']
+                              if params['inflation_past'] > 0 else 1.0),
+        inflation_rate=inflation_rate
+    )
+    zero_mask = forecaster.zero_reset_mask(parameters)
+    timings['parametreler'] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    incremental = IncrementalForecast(forecaster, scenario_sets, num_months=num_months, zero_mask=zero_mask,
+                                      executor=executor)
+    timings['tahmin'] = time.perf_counter() - start
+    
+    versions = list(BUDGET_VERSIONS) if all_versions else [params['budget_version']]
+    summaries = []
+    for version in versions:
+        start = time.perf_counter()
+        full_data = incremental.full_data(version)
+        summary = pd.DataFrame.from_dict(incremental.summary(version), orient='index')
+        summaries.append(summary.rename_axis('Year').reset_index().assign(Parameters=name, Version=version))
+        timings['özet'] = timings.get('özet', 0) + time.perf_counter() - start
+        
+        stem = name if not all_versions else f'{name}_{version_label(version)}'
+        for fmt in formats:
+            extension, write = OUTPUT_FORMATS[fmt]
+            start = time.perf_counter()
+            write(full_data, os.path.join(output_dir, f'{stem}.{extension}'))
+            timings[fmt] = timings.get(fmt, 0) + time.perf_counter() - start
+        
+        if performance:
+            start = time.perf_counter()
+            build_monthly_performance(full_data).to_csv(
+                os.path.join(output_dir, f'{stem}_performans.csv'), index=False, encoding='utf-8-sig'
+            )
+            timings['performans'] = timings.get('performans', 0) + time.perf_counter() - start
+    
+    summary = pd.concat(summaries, ignore_index=True)
+    columns = ['Parameters', 'Version'] + [col for col in summary.columns if col not in ('Parameters', 'Version')]
+    return summary[columns], timings
+
+
+def format_timings(timings):
+    return ', '.join(f'{stage} {seconds:.2f} sn' for stage, seconds in timings.items())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Streamlit olmadan toplu bütçe tahmini: gerçekleşen Excel + saved_parameters.json dosyaları"
+    )
+    parser.add_argument('excel_path', help="Gerçekleşen veri Excel dosyası (Sayfa1)")
+    parser.add_argument('parameters', help="saved_parameters.json formatında dosya veya *.json klasörü")
+    parser.add_argument('-o', '--output-dir', default='budget_output', help="Çıktı klasörü")
+    parser.add_argument('-f', '--formats', nargs='+', default=['csv'], choices=list(OUTPUT_FORMATS))
+    parser.add_argument('--all-versions', action='store_true',
+                        help="Dosyadaki seçili versiyon yerine tüm bütçe versiyonlarını yaz")
+    parser.add_argument('--months', type=int, default=15, help="Tahmin ufku (ay)")
+    parser.add_argument('--performance', action='store_true',
+                        help="Ay bazında performans raporunu da yaz (<ad>_performans.csv)")
+    parser.add_argument('--cache-dir', help="İşlenmiş veri önbelleği (ParsedDataCache) klasörü")
+    parser.add_argument('--backend', default='serial', choices=['serial', 'thread', 'process'])
+    parser.add_argument('--workers', type=int, help="Paralel backend havuz boyutu")
+    args = parser.parse_args(argv)
+    
+    files = parameter_files(args.parameters)
+    if not files:
+        parser.error(f"Parametre dosyası bulunamadı: {args.parameters}")
+    os.makedirs(args.output_dir, exist_ok=True)
+    
+    total_start = time.perf_counter()
+    start = time.perf_counter()
+    if args.cache_dir:
+        with open(args.excel_path, 'rb') as f:
+            forecaster = ParsedDataCache(cache_dir=args.cache_dir).get_or_load(f.read())
+    else:
+        forecaster = BudgetForecaster(args.excel_path)
+    print(f"⏱️ Veri: {format_timings(forecaster.load_timings)} (toplam {time.perf_counter() - start:.2f} sn, "
+          f"{len(forecaster.groups)} Ana Grup, son gerçekleşen {forecaster.last_actual_year}/{forecaster.last_actual_month})")
+    
+    executor = None
+    if args.backend != 'serial':
+        from parallel_forecast import ForecastExecutor
+        executor = ForecastExecutor(args.backend, workers=args.workers)
+    
+    summaries = []
+    failed = []
+    try:
+        for path in files:
+            try:
+                summary, timings = run_parameter_file(
+                    forecaster, path, args.output_dir, formats=args.formats, all_versions=args.all_versions,
+                    num_months=args.months, executor=executor, performance=args.performance
+                )
+            except Exception as e:
+                failed.append(path)
+                print(f"❌ {path}: {e}", file=sys.stderr)
+                continue
+            summaries.append(summary)
+            print(f"✅ {os.path.basename(path)}: {format_timings(timings)}")
+    finally:
+        if executor is not None:
+            executor.close()
+    
+    if summaries:
+        pd.concat(summaries, ignore_index=True).to_csv(
+            os.path.join(args.output_dir, 'summary.csv'), index=False, encoding='utf-8-sig'
+        )
+    print(f"⏱️ Toplam: {time.perf_counter() - total_start:.2f} sn · {len(files) - len(failed)}/{len(files)} "
+          f"parametre dosyası → {args.output_dir}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
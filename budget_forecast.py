@@ -1,94 +1,1158 @@
 import pandas as pd
 import numpy as np
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
 from sklearn.linear_model import LinearRegression
+import contextvars
+import functools
+import hashlib
+import itertools
+import json
+import threading
+import time
+import tracemalloc
 import warnings
+from contextlib import nullcontext
 warnings.filterwarnings('ignore')
 
+# Tahmin çıktısının kolonları
+FORECAST_COLUMNS = ['Year', 'Month', 'MainGroup', 'Quantity', 'UnitPrice',
+                    'Sales', 'GrossProfit', 'GrossMargin%', 'Stock', 'COGS',
+                    'Stock_COGS_Ratio']
+
+# * sıfırlamasında 0 yapılan kolonlar (fiyat ve marj korunur)
+ZERO_RESET_COLUMNS = ['Quantity', 'Sales', 'GrossProfit', 'Stock', 'COGS', 'Stock_COGS_Ratio']
+
+# Yoğun (Yıl × Ay × Grup) dizilerde tutulan metrikler
+HISTORY_METRICS = ['Quantity', 'UnitPrice', 'Sales', 'GrossProfit', 'GrossMargin%',
+                   'Stock', 'COGS', 'Stock_COGS_Ratio']
+
+# Excel kolonları → iç kolon adları
+EXCEL_KEY_COLUMNS = {
+    'Month': 'Month',
+    'MainGroupDesc': 'MainGroup'
+}
+# Başlıkta varsa MainGroup altına sırasıyla eklenen hiyerarşi seviyeleri
+EXCEL_OPTIONAL_KEY_COLUMNS = {
+    'SubGroupDesc': 'SubGroup',
+    'SKU': 'SKU'
+}
+EXCEL_METRIC_COLUMNS = {
+    'TY Sales Unit': 'Quantity',                     # Adet
+    'TY Sales Value TRY2': 'Sales',                  # Gerçek satış
+    'TY Gross Profit TRY2': 'GrossProfit',           # Brüt kar
+    'TY Gross Marjin TRY%': 'GrossMargin%',          # Brüt marj %
+    'TY Avg Store Stock Cost TRY2': 'Stock'          # Stok
+}
+
+# İlk yıl bloğunun (son eksiz kolonlar) yılı - sonraki bloklar '.1', '.2', ... ile devam eder
+FIRST_DATA_YEAR = 2024
+
+# Duyarlılık analizinde taranabilen skaler parametreler
+SWEEP_PARAMETERS = ['growth_param', 'margin_improvement', 'stock_change_pct', 'inflation_adjustment',
+                    'organic_multiplier', 'inflation_rate', 'organic_growth_rate']
+
+# BÜTÇE VERSİYONLARI - otomatik etki oranları
+BUDGET_VERSIONS = {
+    "🔴 Çekimser": {
+        'organic_multiplier': 0.0,
+        'monthly_effect': 0.50,  # %50 etki
+        'maingroup_effect': 0.50,  # %50 etki
+        'organic_growth_rate': 0.10  # %10 organik
+    },
+    "🟡 Normal": {
+        'organic_multiplier': 0.5,
+        'monthly_effect': 1.00,  # %100 etki (tam)
+        'maingroup_effect': 1.00,  # %100 etki (tam)
+        'organic_growth_rate': 0.15  # %15 organik
+    },
+    "🟢 İyimser": {
+        'organic_multiplier': 1.0,
+        'monthly_effect': 1.20,  # %120 etki (artırımlı)
+        'maingroup_effect': 1.20,  # %120 etki (artırımlı)
+        'organic_growth_rate': 0.20  # %20 organik
+    }
+}
+
+# saved_parameters.json - parametre tabloları ve eksik skaler ayarların varsayılanları (%)
+PARAMETER_TABLES = ['monthly_targets', 'maingroup_targets', 'lessons_learned', 'price_changes']
+PARAMETER_DEFAULTS = {
+    'margin_improvement': 2.0,
+    'stock_change_pct': 0.0,
+    'inflation_past': 35.0,
+    'inflation_future': 25.0,
+    'budget_version': '🟡 Normal'
+}
+
+# Excel parametre şablonunun sayfaları
+PARAMETER_SHEETS = {
+    'monthly_targets': 'Ay Hedefleri',
+    'maingroup_targets': 'Ana Grup Hedefleri',
+    'lessons_learned': 'Alınan Dersler',
+    'price_changes': 'Fiyat Değişimi'
+}
+
+MONTH_NAMES = ['Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
+               'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık']
+
+# Akışlı Excel yazımında bir seferde nesneye çevrilen satır sayısı
+EXPORT_CHUNK_ROWS = 50000
+
+# Ay günleri / 7 = hafta (Stok Hafta)
+WEEKS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]) / 7
+
+
+class StageProfiler:
+    """
+    Opt-in aşama ölçümü: her aşamanın süresi ve (memory=True ise) tracemalloc tepe belleği
+    
+    Profiler with bloğu içinde aktiftir; forecaster / IncrementalForecast metotları aktif
+    profiler'a (context-local - oturumlar / thread'ler birbirini görmez) aşama kaydı ekler.
+    Aktif profiler yokken aşamalar tek bir ContextVar okumasına iner. İç içe aşamalar
+    'dış/iç' yoluyla kaydedilir; tepe bellek aşama başındaki kullanıma göre artıştır.
+    
+    tracemalloc süreç genelidir: tepe bellek aynı anda çalışan diğer thread'lerin /
+    oturumların ayırmalarını da içerir ve aşamalar tepe değeri sıfırlar. Bu yüzden bellek
+    ölçümünü aynı anda tek profiler yapar (_MEMORY_LOCK); kilit başka bir oturumdaysa
+    profiler yalnızca süre ölçer (peak_mb None).
+    
+    Kullanım:
+        profiler = StageProfiler()
+        with profiler:
+            forecaster.get_full_data_with_forecast(...)
+        profiler.report()            # aşama bazında özet tablo
+        profiler.to_json('perf.json')
+    """
+    
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.records = []
+        self._stack = []
+        self._tokens = []
+        self._tracing = False
+        self._started_tracing = False
+    
+    def __enter__(self):
+        # Bellek ölçümü ilk girişte, kilit boşsa (beklemeden) alınır
+        if self.memory and not self._tokens and _MEMORY_LOCK.acquire(blocking=False):
+            self._tracing = True
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        self._tokens.append(_ACTIVE_PROFILER.set(self))
+        return self
+    
+    def __exit__(self, *exc_info):
+        _ACTIVE_PROFILER.reset(self._tokens.pop())
+        if self._tracing and not self._tokens:
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+            self._tracing = False
+            _MEMORY_LOCK.release()
+    
+    def stage(self, name):
+        return _ProfiledStage(self, name)
+    
+    def reset(self):
+        self.records = []
+    
+    def report(self):
+        """Aşama bazında özet: çağrı sayısı, toplam / en uzun süre (sn), en yüksek tepe bellek (MB)"""
+        columns = ['stage', 'calls', 'total_seconds', 'max_seconds', 'peak_mb']
+        if not self.records:
+            return pd.DataFrame(columns=columns)
+        
+        records = pd.DataFrame(self.records)
+        report = records.groupby('stage', sort=False).agg(
+            calls=('seconds', 'size'),
+            total_seconds=('seconds', 'sum'),
+            max_seconds=('seconds', 'max'),
+            peak_mb=('peak_mb', 'max')
+        )
+        return report.reset_index()[columns]
+    
+    def to_dict(self):
+        return {'memory': self.memory, 'records': self.records, 'report': self.report().to_dict('records')}
+    
+    def to_json(self, path=None):
+        """Kayıtlar + özet JSON olarak (path verilirse dosyaya yazılır)"""
+        text = json.dumps(self.to_dict(), ensure_ascii=False, indent=2, default=float)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+
+
+class _ProfiledStage:
+    """StageProfiler aşaması - süre ve iç içe aşamalarla uyumlu tracemalloc tepe belleği"""
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+    
+    def __enter__(self):
+        profiler = self.profiler
+        parent = profiler._stack[-1] if profiler._stack else None
+        self.path = f'{parent.path}/{self.name}' if parent is not None else self.name
+        self.tracing = profiler._tracing
+        if self.tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # Tepe değeri sıfırlanmadan önce dış aşamaya aktar
+            if parent is not None:
+                parent.max_peak = max(parent.max_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+            self.max_peak = current
+        profiler._stack.append(self)
+        # Kayıt girişte eklenir - rapor sırası çağrı ağacı sırasıdır (dış aşama önce)
+        self.record = {'stage': self.path, 'seconds': None, 'peak_mb': None}
+        profiler.records.append(self.record)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        profiler = self.profiler
+        profiler._stack.pop()
+        peak_mb = None
+        if self.tracing:
+            peak = max(self.max_peak, tracemalloc.get_traced_memory()[1])
+            peak_mb = (peak - self.start_memory) / 1024 / 1024
+            if profiler._stack:
+                parent = profiler._stack[-1]
+                parent.max_peak = max(parent.max_peak, peak)
+        self.record.update(seconds=seconds, peak_mb=peak_mb)
+
+
+# Aktif profiler (context-local: Streamlit oturumları / thread'ler ayrı)
+_ACTIVE_PROFILER = contextvars.ContextVar('budget_forecast_profiler', default=None)
+
+# tracemalloc süreç genelinde tek - bellek ölçen profiler bu kilidi tutar
+_MEMORY_LOCK = threading.Lock()
+
+
+def profile_stage(name):
+    """Aktif profiler varsa aşama ölçümü, yoksa boş context manager"""
+    profiler = _ACTIVE_PROFILER.get()
+    return nullcontext() if profiler is None else profiler.stage(name)
+
+
+def _profiled(name):
+    """Metodu aktif profiler'da bir aşama olarak ölç (profiler yoksa doğrudan çağrı)"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE_PROFILER.get()
+            if profiler is None:
+                return function(*args, **kwargs)
+            with profiler.stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _safe_div(numerator, denominator):
+    """Payda > 0 ise böl, değilse 0 döndür"""
+    numerator, denominator = np.broadcast_arrays(np.asarray(numerator, dtype=float),
+                                                 np.asarray(denominator, dtype=float))
+    result = np.zeros(numerator.shape)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+
+def _dedupe_headers(header):
+    """Başlıkları pandas gibi adlandır: tekrar edenler '.1', '.2', boşlar 'Unnamed: i'"""
+    names = []
+    seen = {}
+    for i, name in enumerate(header):
+        name = f'Unnamed: {i}' if name is None else str(name)
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f'{base}.{seen[base]}'
+        seen.setdefault(name, 0)
+        names.append(name)
+    return names
+
+
+def year_block_suffixes(header, metric_columns):
+    """
+    Başlıktaki yıl bloklarını bul: '' (ilk yıl), '.1', '.2', ...
+    
+    Bir blok, tüm metrik kolonları o son ekle bulunuyorsa vardır; ilk eksik blokta durulur.
+    """
+    header = set(header)
+    missing = [col for col in metric_columns if col not in header]
+    if missing:
+        raise KeyError(f"Excel'de bulunamayan kolonlar: {', '.join(missing)}")
+    
+    suffixes = ['']
+    while all(f'{col}.{len(suffixes)}' in header for col in metric_columns):
+        suffixes.append(f'.{len(suffixes)}')
+    return suffixes
+
+
+def read_excel_columns(excel_path, sheet_name, header_row, columns):
+    """
+    Excel sayfasını openpyxl read-only (streaming) modunda tek geçişte oku
+    ve sadece istenen kolonları al
+    
+    Parameters:
+    -----------
+    excel_path: Dosya yolu veya file-like obje
+    sheet_name: Sayfa adı
+    header_row: Başlık satırının indeksi (0 tabanlı, pd.read_excel header= ile aynı)
+    columns: Alınacak kolonlar (tekrar eden başlıklar '.1', '.2' son ekiyle) veya
+             başlık listesinden kolonları seçen fonksiyon
+    """
+    
+    workbook = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        
+        for _ in range(header_row):
+            next(rows, None)
+        header = _dedupe_headers(next(rows, ()))
+        if callable(columns):
+            columns = columns(header)
+        
+        missing = [col for col in columns if col not in header]
+        if missing:
+            raise KeyError(f"Excel'de bulunamayan kolonlar: {', '.join(missing)}")
+        
+        positions = [header.index(col) for col in columns]
+        width = max(positions) + 1
+        
+        # Kısa satırları None ile tamamla, sadece istenen kolonları al
+        records = [
+            tuple(row[p] for p in positions) if len(row) >= width
+            else tuple(row[p] if p < len(row) else None for p in positions)
+            for row in rows
+        ]
+    finally:
+        workbook.close()
+    
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def _pair_dict_to_matrix(values, groups, default):
+    """{(maingroup, month): değer} sözlüğünü (Grup × 12) matrise çevir"""
+    matrix = np.full((len(groups), 12), default, dtype=float)
+    if values:
+        keys = list(values.keys())
+        group_idx = pd.Index(groups).get_indexer([key[0] for key in keys])
+        month_idx = np.array([key[1] for key in keys], dtype=int) - 1
+        data = np.array(list(values.values()), dtype=float)
+        valid = (group_idx >= 0) & (month_idx >= 0) & (month_idx < 12)
+        matrix[group_idx[valid], month_idx[valid]] = data[valid]
+    return matrix
+
+
+def _period_summary(totals, keys, weeks):
+    """
+    (Yıl, Ay, ...) toplam / sayı tablosundan dönem özeti (get_summary_stats metrikleri)
+    
+    totals: (kolon, 'sum' | 'count') kolonlu, Month seviyesi içeren indeksli tablo
+    keys: Dönem anahtarları (ör. ['Year'], ['Year', 'Quarter'])
+    weeks: Dönemdeki hafta sayısı - Stok/SMM haftalık oranı için (yıl 52, çeyrek 13)
+    """
+    sums = totals.xs('sum', axis=1, level=1)
+    counts = totals.xs('count', axis=1, level=1)
+    
+    # Dönem içindeki ay toplamları üzerinden: (Dönem × Ay) stok toplamı → ortalama aylık stok
+    monthly_stock = sums['Stock'].groupby(level=keys + ['Month']).sum()
+    period_sums = sums.groupby(level=keys).sum()
+    period_counts = counts.groupby(level=keys).sum()
+    
+    sales = period_sums['Sales']
+    gross_profit = period_sums['GrossProfit']
+    cogs = period_sums['COGS']
+    avg_monthly_stock = monthly_stock.groupby(level=keys).mean()
+    
+    return pd.DataFrame({
+        'Total_Sales': sales,
+        'Total_GrossProfit': gross_profit,
+        'Avg_GrossMargin%': (gross_profit / sales.where(sales > 0) * 100).fillna(0),
+        'Avg_Stock': period_sums['Stock'] / period_counts['Stock'],
+        'Avg_Stock_COGS_Ratio': period_sums['Stock_COGS_Ratio'] / period_counts['Stock_COGS_Ratio'],
+        'Avg_Stock_COGS_Weekly': (avg_monthly_stock / (cogs.where(cogs > 0) / weeks)).fillna(0)
+    })
+
+
+def _summary_from_totals(years, totals):
+    """
+    (Yıl × Ay) toplamlarından get_summary_stats formatında yıllık özet
+    
+    totals: Dict[kolon → (Y × 12)] - 'Sales', 'GrossProfit', 'Stock', 'COGS',
+            'Stock_COGS_Ratio' toplamları ve 'Rows' (satır sayısı)
+    """
+    summary = {}
+    for y, year in enumerate(years):
+        rows = totals['Rows'][y]
+        if rows.sum() == 0:
+            continue
+        
+        sales = totals['Sales'][y].sum()
+        gross_profit = totals['GrossProfit'][y].sum()
+        
+        # Haftalık oran: Ort. Aylık Stok / (Toplam Yıllık SMM / 52)
+        avg_monthly_stock = totals['Stock'][y][rows > 0].mean()
+        total_yearly_cogs = totals['COGS'][y].sum()
+        stock_cogs_weekly = (avg_monthly_stock / (total_yearly_cogs / 52)) if total_yearly_cogs > 0 else 0
+        
+        summary[int(year)] = {
+            'Total_Sales': sales,
+            'Total_GrossProfit': gross_profit,
+            'Avg_GrossMargin%': (gross_profit / sales * 100) if sales > 0 else 0,
+            'Avg_Stock': totals['Stock'][y].sum() / rows.sum(),
+            'Avg_Stock_COGS_Ratio': totals['Stock_COGS_Ratio'][y].sum() / rows.sum(),
+            'Avg_Stock_COGS_Weekly': stock_cogs_weekly
+        }
+    
+    return summary
+
+
+class ForecastParameters:
+    """
+    Derlenmiş tahmin parametreleri - forecaster'ın Ana Grup indeksine hizalı diziler
+    
+    Satır bazında sözlük okumaları yerine tahmin motoru bu dizilerden
+    (Ay / Grup indeksleriyle) doğrudan toplar.
+    
+    Attributes:
+    -----------
+    groups: (G,) Ana grup isimleri (forecaster.groups ile aynı sıra)
+    monthly_targets: (12,) Ay bazında büyüme hedefi
+    group_targets: (G,) Ana grup büyüme hedefi
+    lessons: (G, 12) Alınan ders puanları (-10 ile +10 arası)
+    price_changes: (G, 12) Fiyat değişimi (girilmeyen hücreler inflation_rate ile dolu)
+    """
+    
+    def __init__(self, groups, monthly_targets, group_targets, lessons, price_changes,
+                 growth_param=0.1, inflation_rate=0.25):
+        self.groups = np.asarray(groups, dtype=object)
+        self.monthly_targets = np.asarray(monthly_targets, dtype=float)
+        self.group_targets = np.asarray(group_targets, dtype=float)
+        self.lessons = np.asarray(lessons, dtype=float)
+        self.price_changes = np.asarray(price_changes, dtype=float)
+        self.growth_param = growth_param
+        self.inflation_rate = inflation_rate
+    
+    @classmethod
+    def from_dicts(cls, groups, growth_param=0.1, monthly_growth_targets=None,
+                   maingroup_growth_targets=None, lessons_learned=None,
+                   price_change_matrix=None, inflation_rate=0.25):
+        """forecast_future_months'un sözlük parametrelerinden derle (varsayılanlar doldurulur)"""
+        
+        if monthly_growth_targets is not None:
+            monthly_targets = [monthly_growth_targets.get(m, growth_param) for m in range(1, 13)]
+        else:
+            monthly_targets = np.full(12, growth_param, dtype=float)
+        
+        if maingroup_growth_targets is not None:
+            group_targets = pd.Series(groups, dtype=object).map(maingroup_growth_targets).fillna(growth_param)
+        else:
+            group_targets = np.full(len(groups), growth_param, dtype=float)
+        
+        return cls(
+            groups,
+            monthly_targets,
+            group_targets,
+            _pair_dict_to_matrix(lessons_learned, groups, 0.0),
+            _pair_dict_to_matrix(price_change_matrix, groups, inflation_rate),
+            growth_param=growth_param,
+            inflation_rate=inflation_rate
+        )
+    
+    def align(self, groups):
+        """Başka bir grup sırasına hizala - eksik gruplar varsayılanlarla dolar"""
+        groups = np.asarray(groups, dtype=object)
+        if len(groups) == len(self.groups) and (groups == self.groups).all():
+            return self
+        
+        positions = pd.Index(self.groups).get_indexer(groups)
+        found = positions >= 0
+        positions = np.maximum(positions, 0)
+        
+        return ForecastParameters(
+            groups,
+            self.monthly_targets,
+            np.where(found, self.group_targets[positions] if len(self.groups) else 0, self.growth_param),
+            np.where(found[:, None], self.lessons[positions] if len(self.groups) else 0, 0.0),
+            np.where(found[:, None], self.price_changes[positions] if len(self.groups) else 0, self.inflation_rate),
+            growth_param=self.growth_param,
+            inflation_rate=self.inflation_rate
+        )
+
+
+def _parse_cells(values):
+    """
+    Tablo hücreleri (metin / sayı) → (sayılar, * sıfırlama, okunamayan) - tek seferde
+    
+    Sonlu olmayan değerler ('nan', 'inf', boş hücre) de okunamayan sayılır.
+    """
+    text = np.char.strip(np.asarray(values).astype(str))
+    reset = text == '*'
+    parsed = pd.to_numeric(pd.Series(text.ravel(), dtype=object), errors='coerce').to_numpy(dtype=float)
+    valid = np.isfinite(parsed).reshape(text.shape)
+    # Değerler float() ile aynı (pd.to_numeric son basamakta yuvarlayabilir - sadece geçerlilik için)
+    numbers = np.full(text.shape, np.nan)
+    numbers[valid] = text[valid].astype(float)
+    return numbers, reset, ~valid & ~reset
+
+
+def _invalid_cells(table, labels, columns, values, invalid):
+    """Okunamayan hücreler → 'table', 'row', 'column', 'value' satırları (satır × kolon)"""
+    invalid = np.asarray(invalid).reshape(len(labels), len(columns))
+    rows, cols = np.nonzero(invalid)
+    return pd.DataFrame({
+        'table': table,
+        'row': np.asarray(labels, dtype=object)[rows],
+        'column': np.asarray(columns, dtype=object)[cols],
+        'value': np.asarray(values, dtype=object).reshape(invalid.shape)[rows, cols]
+    })
+
+
+def _has_columns(table, *columns):
+    return table is not None and all(col in table.columns for col in columns)
+
+
+class ParameterSet:
+    """
+    Parametre tabloları (Ay / Ana Grup hedefleri, alınan dersler, fiyat değişimi) -
+    tek seferde okunmuş, ortak grup indeksine hizalı diziler
+    
+    Değerler tablodaki birimdedir (% / puan). NaN: hücre tabloda yok (veya * ile
+    sıfırlanmış); okunamayan hücreler okunurken varsayılanla doldurulur ve invalid
+    tablosunda toplu raporlanır.
+    
+    Attributes:
+    -----------
+    groups: (G,) Tablolardaki ana gruplar (Ana Grup tablosu sırasıyla, sonra diğerleri)
+    monthly_targets / monthly_reset: (12,) Ay hedefi (%) ve * sıfırlaması
+    group_targets / group_reset: (G,) Ana grup hedefi (%) ve * sıfırlaması
+    lessons / lessons_reset: (G, 12) Alınan ders puanı ve * sıfırlaması
+    price_changes: (G, 12) Fiyat değişimi (%)
+    invalid: Okunamayan hücreler ('table', 'row', 'column', 'value')
+    """
+    
+    def __init__(self, groups, monthly_targets, monthly_reset, group_targets, group_reset,
+                 lessons, lessons_reset, price_changes, invalid=None):
+        self.groups = np.asarray(groups, dtype=object)
+        self.monthly_targets = np.asarray(monthly_targets, dtype=float)
+        self.monthly_reset = np.asarray(monthly_reset, dtype=bool)
+        self.group_targets = np.asarray(group_targets, dtype=float)
+        self.group_reset = np.asarray(group_reset, dtype=bool)
+        self.lessons = np.asarray(lessons, dtype=float).reshape(len(self.groups), 12)
+        self.lessons_reset = np.asarray(lessons_reset, dtype=bool).reshape(len(self.groups), 12)
+        self.price_changes = np.asarray(price_changes, dtype=float).reshape(len(self.groups), 12)
+        self.invalid = invalid if invalid is not None else pd.DataFrame(columns=['table', 'row', 'column', 'value'])
+    
+    @classmethod
+    def from_tables(cls, monthly_targets=None, maingroup_targets=None, lessons_learned=None, price_changes=None,
+                    inflation_rate=0.25, invalid_target=20.0):
+        """
+        Düzenleme tablolarını (% / puan metinleri, * = sıfırla) oku
+        
+        Parameters:
+        -----------
+        monthly_targets: 'Ay', 'Hedef (%)' kolonlu tablo
+        maingroup_targets: 'Ana Grup', 'Hedef (%)' kolonlu tablo
+        lessons_learned: 'Ana Grup', '1'..'12' kolonlu tablo (-10 ile +10 arası puan)
+        price_changes: 'Ana Grup', '1'..'12' kolonlu tablo (fiyat değişimi %)
+        inflation_rate: Okunamayan fiyat hücrelerinin değeri (oran)
+        invalid_target: Okunamayan Ay / Ana Grup hedeflerinin değeri (%) - okunamayan ders puanı 0
+        """
+        month_columns = [str(month) for month in range(1, 13)]
+        tables = {
+            'maingroup_targets': maingroup_targets if _has_columns(maingroup_targets, 'Ana Grup') else None,
+            'lessons_learned': lessons_learned if _has_columns(lessons_learned, 'Ana Grup') else None,
+            'price_changes': price_changes if _has_columns(price_changes, 'Ana Grup') else None
+        }
+        groups = pd.Index(pd.unique(np.concatenate(
+            [table['Ana Grup'].to_numpy(dtype=object) for table in tables.values() if table is not None]
+            + [np.empty(0, dtype=object)]
+        )))
+        invalid = []
+        
+        # Ay hedefleri
+        monthly = np.full(12, np.nan)
+        monthly_reset = np.zeros(12, dtype=bool)
+        if _has_columns(monthly_targets, 'Ay', 'Hedef (%)'):
+            months = pd.to_numeric(monthly_targets['Ay'], errors='coerce').to_numpy(dtype=float)
+            bad_month = ~np.isin(months, np.arange(1, 13))
+            numbers, reset, bad = _parse_cells(monthly_targets['Hedef (%)'].to_numpy())
+            invalid.append(_invalid_cells('monthly_targets', monthly_targets['Ay'], ['Ay'],
+                                          monthly_targets['Ay'], bad_month))
+            invalid.append(_invalid_cells('monthly_targets', monthly_targets['Ay'], ['Hedef (%)'],
+                                          monthly_targets['Hedef (%)'], bad & ~bad_month))
+            rows = months[~bad_month].astype(int) - 1
+            monthly[rows] = np.where(bad, invalid_target, numbers)[~bad_month]
+            monthly_reset[rows] = reset[~bad_month]
+        
+        # Ana grup hedefleri
+        group_targets = np.full(len(groups), np.nan)
+        group_reset = np.zeros(len(groups), dtype=bool)
+        table = tables['maingroup_targets']
+        if table is not None:
+            rows = groups.get_indexer(table['Ana Grup'])
+            values = table['Hedef (%)'] if 'Hedef (%)' in table else pd.Series(np.nan, index=table.index)
+            numbers, reset, bad = _parse_cells(values.to_numpy())
+            invalid.append(_invalid_cells('maingroup_targets', table['Ana Grup'], ['Hedef (%)'], values, bad))
+            group_targets[rows] = np.where(bad, invalid_target, numbers)
+            group_reset[rows] = reset
+        
+        # Alınan dersler ve fiyat değişimi (Grup × 12)
+        lessons = np.full((len(groups), 12), np.nan)
+        lessons_reset = np.zeros((len(groups), 12), dtype=bool)
+        prices = np.full((len(groups), 12), np.nan)
+        for key, fill in (('lessons_learned', 0.0), ('price_changes', inflation_rate * 100)):
+            table = tables[key]
+            if table is None:
+                continue
+            rows = groups.get_indexer(table['Ana Grup'])
+            values = table.rename(columns=str).reindex(columns=month_columns).to_numpy(dtype=object)
+            numbers, reset, bad = _parse_cells(values)
+            if key == 'price_changes':
+                # Fiyat tablosunda * sıfırlama yok
+                bad |= reset
+                prices[rows] = np.where(bad, fill, numbers)
+            else:
+                lessons[rows] = np.where(bad, fill, numbers)
+                lessons_reset[rows] = reset
+            invalid.append(_invalid_cells(key, table['Ana Grup'], month_columns, values, bad))
+        
+        invalid = [frame for frame in invalid if len(frame)]
+        return cls(
+            groups.to_numpy(dtype=object), monthly, monthly_reset, group_targets, group_reset,
+            lessons, lessons_reset, prices,
+            invalid=pd.concat(invalid, ignore_index=True) if invalid else None
+        )
+    
+    @classmethod
+    def from_records(cls, params, inflation_rate=None):
+        """saved_parameters.json içeriğinden (tablolar kayıt listesi) oku"""
+        if inflation_rate is None:
+            inflation_rate = params.get('inflation_future', PARAMETER_DEFAULTS['inflation_future']) / 100
+        return cls.from_tables(**{key: pd.DataFrame(params.get(key, [])) for key in PARAMETER_TABLES},
+                               inflation_rate=inflation_rate)
+    
+    @classmethod
+    def from_json(cls, path, inflation_rate=None):
+        """saved_parameters.json formatındaki dosyadan oku (skaler ayarlar için read_parameter_file)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_records(json.load(f), inflation_rate=inflation_rate)
+    
+    @classmethod
+    def from_excel(cls, source, base=None, inflation_rate=0.25):
+        """
+        Excel şablonundan (PARAMETER_SHEETS sayfaları) oku
+        
+        Dosyada olmayan sayfaların tabloları base'den (verilirse) alınır.
+        """
+        # dtype=str: hücreler from_tables'ta okunur (read_excel'in sayı tahmini son basamağı yuvarlayabilir)
+        sheets = pd.read_excel(source, sheet_name=None, dtype=str)
+        base_tables = base.to_tables() if base is not None else {}
+        tables = {
+            key: sheets[sheet] if sheet in sheets else base_tables.get(key)
+            for key, sheet in PARAMETER_SHEETS.items()
+        }
+        return cls.from_tables(**tables, inflation_rate=inflation_rate)
+    
+    def to_tables(self):
+        """Düzenleme tabloları (app'teki data_editor formatı - metin hücreler, * = sıfırla)"""
+        month_columns = [str(month) for month in range(1, 13)]
+        
+        def cell_text(values, reset):
+            return np.where(reset, '*', np.asarray(values, dtype=float).astype(str)).astype(object)
+        
+        months = np.flatnonzero(~np.isnan(self.monthly_targets) | self.monthly_reset)
+        groups = ~np.isnan(self.group_targets) | self.group_reset
+        lessons = (~np.isnan(self.lessons) | self.lessons_reset).any(axis=1)
+        prices = (~np.isnan(self.price_changes)).any(axis=1)
+        
+        lessons_table = pd.DataFrame(cell_text(self.lessons[lessons], self.lessons_reset[lessons]),
+                                     columns=month_columns)
+        price_table = pd.DataFrame(cell_text(self.price_changes[prices], False), columns=month_columns)
+        return {
+            'monthly_targets': pd.DataFrame({
+                'Ay': months + 1,
+                'Ay Adı': np.array(MONTH_NAMES, dtype=object)[months],
+                'Hedef (%)': cell_text(self.monthly_targets[months], self.monthly_reset[months])
+            }),
+            'maingroup_targets': pd.DataFrame({
+                'Ana Grup': self.groups[groups],
+                'Hedef (%)': cell_text(self.group_targets[groups], self.group_reset[groups])
+            }),
+            'lessons_learned': pd.concat([pd.DataFrame({'Ana Grup': self.groups[lessons]}), lessons_table], axis=1),
+            'price_changes': pd.concat([pd.DataFrame({'Ana Grup': self.groups[prices]}), price_table], axis=1)
+        }
+    
+    def to_json(self, path=None, **settings):
+        """saved_parameters.json formatı: tablolar (kayıt listesi) + skaler ayarlar (path verilirse dosyaya)"""
+        params = {key: table.to_dict('records') for key, table in self.to_tables().items()}
+        text = json.dumps({**params, **settings}, ensure_ascii=False, indent=2)
+        if path is not None:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        return text
+    
+    def to_excel(self, output):
+        """Tabloları PARAMETER_SHEETS sayfalarına yaz (output: dosya / BytesIO veya açık ExcelWriter)"""
+        if not isinstance(output, pd.ExcelWriter):
+            with pd.ExcelWriter(output, engine='openpyxl') as writer:
+                return self.to_excel(writer)
+        
+        for key, table in self.to_tables().items():
+            table.to_excel(output, sheet_name=PARAMETER_SHEETS[key], index=False)
+    
+    def content_hash(self):
+        """Parametrelerin içerik özeti (SHA-256) - süreçler / oturumlar arası aynı"""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([str(group) for group in self.groups], ensure_ascii=False).encode())
+        for values in (self.monthly_targets, self.monthly_reset, self.group_targets, self.group_reset,
+                       self.lessons, self.lessons_reset, self.price_changes):
+            digest.update(np.ascontiguousarray(values).tobytes())
+        return digest.hexdigest()
+    
+    def compile(self, groups, growth_param=0.1, monthly_effect=1.0, maingroup_effect=1.0, inflation_rate=0.25):
+        """
+        Verilen grup sırasına hizalı ForecastParameters - hedeflere etki oranı uygulanır
+        
+        Girilmeyen / * ile sıfırlanan hedefler growth_param, dersler 0, fiyatlar
+        inflation_rate olur (sıfırlama zero_mask ile uygulanır).
+        """
+        return ForecastParameters(
+            self.groups,
+            np.where(np.isnan(self.monthly_targets), growth_param, self.monthly_targets / 100 * monthly_effect),
+            np.where(np.isnan(self.group_targets), growth_param, self.group_targets / 100 * maingroup_effect),
+            np.nan_to_num(self.lessons, nan=0.0),
+            np.where(np.isnan(self.price_changes), inflation_rate, self.price_changes / 100),
+            growth_param=growth_param,
+            inflation_rate=inflation_rate
+        ).align(groups)
+    
+    def zero_mask(self, groups):
+        """* sıfırlamalarından verilen grup sırasına hizalı (Grup × 12) bool maske"""
+        rows = pd.Index(self.groups).get_indexer(np.asarray(groups, dtype=object))
+        found = rows >= 0
+        mask = np.tile(self.monthly_reset, (len(rows), 1))
+        mask[found] |= self.group_reset[rows[found], None] | self.lessons_reset[rows[found]]
+        return mask
+
+
+def read_parameter_file(path):
+    """
+    saved_parameters.json formatındaki parametre dosyasını oku
+    
+    Returns:
+    --------
+    Dict: 'parameters' (ParameterSet - okunamayan fiyatlar dosyadaki inflation_future ile
+          dolar) ve skaler ayarlar (dosyada yoksa PARAMETER_DEFAULTS)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        params = json.load(f)
+    
+    result = {**PARAMETER_DEFAULTS, **{key: value for key, value in params.items() if key not in PARAMETER_TABLES}}
+    result['parameters'] = ParameterSet.from_records(params, inflation_rate=result['inflation_future'] / 100)
+    return result
+
+
+def _long_frame(years, months, keys, present, metrics):
+    """
+    (Dönem × Seri) dizilerinden uzun formatlı tablo - sadece satırı olan hücreler
+    
+    years / months: (P,) dönem yıl ve ayları
+    keys: (K × seviye) DataFrame - seri anahtarları (örn: MainGroup, SubGroup)
+    present: (P × K) bool
+    metrics: Dict[kolon → (P × K)] - HISTORY_METRICS
+    """
+    p_idx, k_idx = np.nonzero(present)
+    frame = pd.DataFrame({'Year': years[p_idx], 'Month': months[p_idx]})
+    for level in keys.columns:
+        frame[level] = keys[level].to_numpy()[k_idx]
+    for col in HISTORY_METRICS:
+        frame[col] = metrics[col][p_idx, k_idx]
+    return frame
+
+
+def _rollup_metrics(metrics, present, starts):
+    """
+    Son eksende ardışık serileri (starts başlangıçlı bloklar) üst seviyeye topla
+    
+    Toplanabilir metrikler np.add.reduceat ile toplanır; birim fiyat, brüt marj ve
+    stok/SMM oranı toplamlardan yeniden hesaplanır.
+    """
+    rolled = {col: np.add.reduceat(metrics[col], starts, axis=-1) for col in HistoryCube.ADDITIVE_METRICS}
+    rolled['UnitPrice'] = _safe_div(rolled['Sales'], rolled['Quantity'])
+    rolled['GrossMargin%'] = _safe_div(rolled['GrossProfit'], rolled['Sales'])
+    rolled['Stock_COGS_Ratio'] = _safe_div(rolled['Stock'], rolled['COGS'])
+    return rolled, np.logical_or.reduceat(present, starts, axis=-1)
+
+
+class HistoryCube:
+    """
+    Gerçekleşen verinin yoğun (Yıl × Ay × Seri × Metrik) NumPy küpü
+    
+    Seri, hiyerarşinin en alt seviyesidir (yaprak): tek seviyede Ana Grup, alt
+    seviyeler varsa (MainGroup, SubGroup, SKU, ...) kombinasyonu. Yapraklar
+    hiyerarşi sırasıyla sıralıdır, böylece her üst seviye ardışık bir bloktur.
+    Yıl, ay ve seri tam sayı kodlarıyla indekslenir; bir ayı, seriyi veya metriği
+    almak tablo taraması değil dizi görünümüdür (view). Uzun formatlı DataFrame
+    sadece API sınırında (to_frame) üretilir.
+    
+    Attributes:
+    -----------
+    years: (Y,) Ardışık yıllar (verisi olmayan ara yıllar dahil)
+    levels: Hiyerarşi seviyeleri, ilki 'MainGroup'
+    leaves: (L × seviye) DataFrame - yaprak seri anahtarları
+    groups: (G,) Sıralı Ana Grup isimleri
+    leaf_group: (L,) Her yaprağın Ana Grup kodu
+    present: (Y, 12, L) bool - Excel'de satırı olan hücreler
+    values: (Y, 12, L, M) float - HISTORY_METRICS sırasıyla metrikler (satırı olmayan hücreler 0)
+    """
+    
+    # Tekrarlanan satırlarda / üst seviyelerde toplanan metrikler (diğerleri yeniden hesaplanır)
+    ADDITIVE_METRICS = ['Quantity', 'Sales', 'GrossProfit', 'Stock', 'COGS']
+    
+    def __init__(self, years, leaves, present, values):
+        self.years = np.asarray(years, dtype=int)
+        self.leaves = leaves.reset_index(drop=True)
+        self.levels = list(leaves.columns)
+        self.present = present
+        self.values = values
+        
+        group_codes, groups = pd.factorize(self.leaves['MainGroup'])
+        self.groups = np.asarray(groups, dtype=object)
+        self.leaf_group = group_codes
+    
+    @classmethod
+    def from_frame(cls, frame, levels=None):
+        """
+        Uzun formatlı tablodan küp oluştur - sadece 1-12 arası aylar
+        
+        levels: Hiyerarşi seviyeleri (varsayılan: 'MainGroup' + tablodaki diğer anahtar kolonlar)
+        """
+        if levels is None:
+            levels = ['MainGroup'] + [col for col in frame.columns
+                                      if col not in FORECAST_COLUMNS and col != 'MainGroup']
+        
+        leaves = frame[levels].drop_duplicates().sort_values(levels).reset_index(drop=True)
+        frame = frame[(frame['Month'] >= 1) & (frame['Month'] <= 12)]
+        
+        row_years = frame['Year'].to_numpy(dtype=int)
+        first_year = row_years.min() if len(row_years) else 0
+        years = np.arange(first_year, row_years.max() + 1 if len(row_years) else first_year)
+        
+        if len(levels) == 1:
+            leaf_codes = pd.Index(leaves[levels[0]]).get_indexer(frame[levels[0]])
+        else:
+            leaf_codes = pd.MultiIndex.from_frame(leaves).get_indexer(pd.MultiIndex.from_frame(frame[levels]))
+        
+        num_leaves = len(leaves)
+        cell = ((row_years - first_year) * 12 + frame['Month'].to_numpy(dtype=int) - 1) * num_leaves + leaf_codes
+        
+        size = len(years) * 12 * num_leaves
+        present = np.zeros(size, dtype=bool)
+        present[cell] = True
+        values = np.zeros((size, len(HISTORY_METRICS)))
+        
+        if len(np.unique(cell)) == len(cell):
+            values[cell] = frame[HISTORY_METRICS].to_numpy(dtype=float)
+        else:
+            # Aynı (Yıl, Ay, Seri) için birden fazla satır - topla, oranları yeniden hesapla
+            for col in cls.ADDITIVE_METRICS:
+                values[:, HISTORY_METRICS.index(col)] = np.bincount(
+                    cell, weights=frame[col].to_numpy(dtype=float), minlength=size)
+            metric = {col: values[:, k] for k, col in enumerate(HISTORY_METRICS)}
+            metric['UnitPrice'][:] = _safe_div(metric['Sales'], metric['Quantity'])
+            metric['GrossMargin%'][:] = _safe_div(metric['GrossProfit'], metric['Sales'])
+            metric['Stock_COGS_Ratio'][:] = _safe_div(metric['Stock'], metric['COGS'])
+        
+        shape = (len(years), 12, num_leaves)
+        return cls(years, leaves, present.reshape(shape), values.reshape(shape + (len(HISTORY_METRICS),)))
+    
+    def __getitem__(self, metric):
+        """Bir metriğin (Y × 12 × L) görünümü"""
+        return self.values[..., HISTORY_METRICS.index(metric)]
+    
+    def level_blocks(self, level):
+        """
+        Bir hiyerarşi seviyesinin yaprak blokları
+        
+        Returns:
+        --------
+        (keys, starts): keys - (P × seviyeye kadar) üst seviye anahtarları,
+                        starts - (P,) her bloğun ilk yaprağı (np.add.reduceat için)
+        """
+        prefix = self.leaves[self.levels[:self.levels.index(level) + 1]]
+        changed = (prefix != prefix.shift()).any(axis=1).to_numpy()
+        starts = np.flatnonzero(changed)
+        return prefix.iloc[starts].reset_index(drop=True), starts
+    
+    def year_position(self, year):
+        """Yılın küp indeksi (-1 = yok)"""
+        position = int(year) - int(self.years[0]) if len(self.years) else -1
+        return position if 0 <= position < len(self.years) else -1
+    
+    def actual_months(self, last_year, last_month):
+        """(Y × 12) bool - son gerçekleşen aya (dahil) kadar olan dönemler"""
+        period = (self.years[:, None] - last_year) * 12 + np.arange(1, 13)[None, :]
+        return period <= last_month
+    
+    def to_frame(self, until=None, level=None):
+        """
+        Uzun formatlı tablo (Yıl, Ay, seviyeler, metrikler) - sıralı: Yıl, Ay, seri
+        
+        until: (yıl, ay) verilirse sadece bu döneme (dahil) kadar olan satırlar
+        level: Verilirse bu hiyerarşi seviyesine toplanmış tablo (varsayılan: yaprak)
+        """
+        present = self.present
+        if until is not None:
+            present = present & self.actual_months(*until)[..., None]
+        
+        num_periods = len(self.years) * 12
+        metrics = {col: self[col].reshape(num_periods, -1) for col in HISTORY_METRICS}
+        present = present.reshape(num_periods, -1)
+        keys = self.leaves
+        
+        if level is not None and level != self.levels[-1]:
+            keys, starts = self.level_blocks(level)
+            metrics = {col: values * present for col, values in metrics.items()}
+            metrics, present = _rollup_metrics(metrics, present, starts)
+        
+        return _long_frame(np.repeat(self.years, 12), np.tile(np.arange(1, 13), len(self.years)),
+                           keys, present, metrics)
+    
+    @property
+    def nbytes(self):
+        return int(self.present.nbytes + self.values.nbytes + self.years.nbytes)
+    
+    def freeze(self):
+        """Küp dizilerini salt-okunur yap"""
+        for array in (self.years, self.groups, self.leaf_group, self.present, self.values):
+            array.flags.writeable = False
+        return self
+
+
 class BudgetForecaster:
-    def __init__(self, excel_path):
-        """Excel'den veriyi yükle ve temizle"""
-        # Raw olarak oku, header belirtme
-        df_raw = pd.read_excel(excel_path, sheet_name='Sayfa1', header=None)
+    def __init__(self, excel_path, key_columns=None, metric_columns=None, first_year=FIRST_DATA_YEAR):
+        """
+        Excel'den veriyi yükle ve temizle
+        
+        Parameters:
+        -----------
+        excel_path: Dosya yolu veya file-like obje
+        key_columns: Dict {Excel kolonu: iç kolon} - Ay ve hiyerarşi seviyeleri (varsayılan
+                     EXCEL_KEY_COLUMNS + başlıkta bulunan EXCEL_OPTIONAL_KEY_COLUMNS). Ay dışındaki
+                     kolonlar sırasıyla hiyerarşidir ve ilki 'MainGroup' olmalıdır, örn:
+                     {'Month': 'Month', 'MainGroupDesc': 'MainGroup', 'SubGroupDesc': 'SubGroup'}
+        metric_columns: Dict {Excel kolonu: iç kolon} - her yıl bloğunda tekrar eden metrikler
+                        (varsayılan EXCEL_METRIC_COLUMNS)
+        first_year: İlk (son eksiz) yıl bloğunun yılı
+        """
+        self._configure(key_columns, metric_columns, first_year)
+        
+        # Tek geçişte oku - sadece process_data'nın kullandığı kolonlar (tüm yıl blokları)
+        start = time.perf_counter()
+        with profile_stage('read_excel'):
+            self.df = read_excel_columns(excel_path, 'Sayfa1', header_row=1, columns=self._required_columns)
+        self.load_timings['read_excel'] = time.perf_counter() - start
         
-        # Header 1. satır (index 1)
-        self.df = pd.read_excel(excel_path, sheet_name='Sayfa1', header=1)
+        self._load_raw()
         
+        print(f"⏱️ Yükleme: Excel okuma {self.load_timings['read_excel']:.2f} sn, "
+              f"işleme {self.load_timings['process_data']:.2f} sn ({len(self.df)} satır)")
+    
+    @classmethod
+    def from_frame(cls, frame, key_columns=None, metric_columns=None, first_year=FIRST_DATA_YEAR):
+        """
+        Excel'den okunmuş ham Sayfa1 tablosundan (başlıklar pd.read_excel ile aynı: tekrar eden
+        yıl blokları '.1', '.2') forecaster oluştur - Excel okuma atlanır
+        """
+        forecaster = cls.__new__(cls)
+        forecaster._configure(key_columns, metric_columns, first_year)
+        forecaster.df = frame[forecaster._required_columns(frame.columns)]
+        forecaster._load_raw()
+        return forecaster
+    
+    def _configure(self, key_columns, metric_columns, first_year):
+        self.load_timings = {}
+        self.frozen = False
+        self.key_columns = dict(key_columns or EXCEL_KEY_COLUMNS)
+        self.optional_key_columns = {} if key_columns else dict(EXCEL_OPTIONAL_KEY_COLUMNS)
+        self.metric_columns = dict(metric_columns or EXCEL_METRIC_COLUMNS)
+        self.first_year = first_year
+    
+    def _load_raw(self):
+        """Ham tabloyu (self.df) işle ve veriye bağlı tahmin girdilerini hazırla"""
+        start = time.perf_counter()
         self.process_data()
+        self.load_timings['process_data'] = time.perf_counter() - start
         
+        # Veriye bağlı tahmin girdileri - bir kez
+        start = time.perf_counter()
+        self._load_invariants()
+        self.load_timings['invariants'] = time.perf_counter() - start
+    
+    @classmethod
+    def from_data(cls, data, last_actual_year, last_actual_month):
+        """İşlenmiş veriden (örn: önbellek) forecaster oluştur - Excel okuma ve işleme atlanır"""
+        forecaster = cls.__new__(cls)
+        forecaster.load_timings = {}
+        forecaster.frozen = False
+        forecaster.df = None
+        forecaster.data = data
+        forecaster.last_actual_year = int(last_actual_year)
+        forecaster.last_actual_month = int(last_actual_month)
+        forecaster._load_invariants()
+        return forecaster
+    
+    @property
+    def data(self):
+        """Gerçekleşen veri - uzun formatlı tablo (API sınırı: her erişimde küpten üretilir)"""
+        return self.cube.to_frame()
+    
+    @data.setter
+    def data(self, value):
+        self._set_cube(HistoryCube.from_frame(value))
+    
+    def _set_cube(self, cube):
+        # Veri değişti - önbellekteki tahmin girdileri geçersiz
+        self.cube = cube
+        self.groups = cube.groups
+        self._invariants = None
+    
+    def freeze(self):
+        """
+        Forecaster'ı oturumlar arası paylaşım için salt-okunur yap
+        
+        Veri küpü ve önbellekteki tahmin girdileri yazılamaz dizilere çevrilir (yerinde
+        atama ValueError verir), ham Excel tablosu (self.df) bırakılır ve veriyi
+        değiştiren metotlar kapatılır. Tahmin metotları veriyi hiçbir zaman değiştirmez.
+        """
+        self.cube.freeze()
+        invariants = self._load_invariants()
+        for values in invariants.values():
+            for array in (values.values() if isinstance(values, dict) else [values]):
+                if isinstance(array, np.ndarray):
+                    array.flags.writeable = False
+        self.df = None
+        self.frozen = True
+        return self
+    
+    def _check_mutable(self):
+        if self.frozen:
+            raise RuntimeError("Paylaşılan (salt-okunur) forecaster verisi değiştirilemez")
+    
+    def memory_report(self):
+        """Forecaster'ın bellek kullanımı (byte)"""
+        data_bytes = self.cube.nbytes
+        raw_bytes = int(self.df.memory_usage(deep=True).sum()) if self.df is not None else 0
+        
+        return {
+            'data_bytes': data_bytes,
+            'raw_bytes': raw_bytes,
+            'total_bytes': data_bytes + raw_bytes,
+            'rows': int(self.cube.present.sum()),
+            'frozen': self.frozen
+        }
+    
+    @property
+    def levels(self):
+        """Hiyerarşi seviyeleri (ilki 'MainGroup', sonuncusu tahminin yapıldığı yaprak seviye)"""
+        if getattr(self, 'cube', None) is not None:
+            return self.cube.levels
+        return [col for col in self.key_columns.values() if col != 'Month']
+    
+    def _required_columns(self, header):
+        """Başlıktan okunacak kolonlar: anahtarlar + bulunan tüm yıl bloklarının metrikleri"""
+        suffixes = year_block_suffixes(header, self.metric_columns)
+        # Başlıkta bulunan opsiyonel alt seviyeler hiyerarşiye eklenir
+        self.key_columns.update({
+            excel_col: col for excel_col, col in self.optional_key_columns.items() if excel_col in set(header)
+        })
+        return list(self.key_columns) + [f'{col}{suffix}' for suffix in suffixes for col in self.metric_columns]
+    
+    @_profiled('process_data')
     def process_data(self):
-        """Veriyi yıl bazında ayrıştır ve temizle"""
-        
-        # 2024 verileri - GÜNCEL KOLONLAR
-        df_2024 = self.df[['Month', 'MainGroupDesc', 
-                           'TY Sales Unit',                # Kolon 4 - Adet
-                           'TY Sales Value TRY2',          # Kolon 11 - Gerçek satış
-                           'TY Gross Profit TRY2',         # Kolon 9 - Brüt kar  
-                           'TY Gross Marjin TRY%',         # Kolon 12 - Brüt marj %
-                           'TY Avg Store Stock Cost TRY2']].copy()  # Kolon 10 - Stok
-        df_2024.columns = ['Month', 'MainGroup', 'Quantity', 'Sales', 'GrossProfit', 'GrossMargin%', 'Stock']
-        df_2024['Year'] = 2024
-        
-        # 2025 verileri - GÜNCEL KOLONLAR
-        df_2025 = self.df[['Month', 'MainGroupDesc',
-                           'TY Sales Unit.1',               # Kolon 13 - Adet
-                           'TY Sales Value TRY2.1',         # Kolon 20 - Gerçek satış
-                           'TY Gross Profit TRY2.1',        # Kolon 18 - Brüt kar
-                           'TY Gross Marjin TRY%.1',        # Kolon 21 - Brüt marj %
-                           'TY Avg Store Stock Cost TRY2.1']].copy()  # Kolon 19 - Stok
-        df_2025.columns = ['Month', 'MainGroup', 'Quantity', 'Sales', 'GrossProfit', 'GrossMargin%', 'Stock']
-        df_2025['Year'] = 2025
+        """Yıl bloklarını tek reshape ile uzun formata çevir ve temizle"""
+        self._check_mutable()
         
-        # Birleştir
-        self.data = pd.concat([df_2024, df_2025], ignore_index=True)
+        # Yıl blokları: '' → first_year, '.1' → first_year + 1, ...
+        suffixes = year_block_suffixes(self.df.columns, self.metric_columns)
+        num_years = len(suffixes)
+        num_rows = len(self.df)
+        num_metrics = len(self.metric_columns)
+        
+        # (Satır × Yıl × Metrik) → (Yıl × Satır) uzun format - yıl bloğu sırasıyla
+        metrics = self.df[[f'{col}{suffix}' for suffix in suffixes for col in self.metric_columns]]
+        values = metrics.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        values = values.reshape(num_rows, num_years, num_metrics).transpose(1, 0, 2).reshape(-1, num_metrics)
+        
+        columns = {col: np.tile(self.df[excel_col].to_numpy(), num_years) for excel_col, col in self.key_columns.items()}
+        columns.update(zip(self.metric_columns.values(), values.T))
+        data = pd.DataFrame(columns)
+        data['Year'] = np.repeat(self.first_year + np.arange(num_years), num_rows)
         
         # Toplam satırlarını çıkar
-        self.data = self.data[~self.data['Month'].astype(str).str.contains('Toplam', na=False)]
+        data = data[~data['Month'].astype(str).str.contains('Toplam', na=False)]
         
         # Month'u integer'a çevir
-        self.data['Month'] = pd.to_numeric(self.data['Month'], errors='coerce')
+        data['Month'] = pd.to_numeric(data['Month'], errors='coerce')
         
         # MainGroup boş olanları çıkar
-        self.data = self.data.dropna(subset=['MainGroup'])
+        data = data.dropna(subset=['MainGroup'])
+        
+        # Alt hiyerarşi seviyeleri (varsa) - boş hücreler ayrı bir seri
+        sub_levels = self.levels[1:]
+        if sub_levels:
+            data[sub_levels] = data[sub_levels].fillna('').astype(str)
         
         # NaN değerleri 0 yap
-        self.data = self.data.fillna(0)
+        data = data.fillna(0)
         
         # SMM hesapla (COGS = Sales - GrossProfit)
-        self.data['COGS'] = self.data['Sales'] - self.data['GrossProfit']
+        data['COGS'] = data['Sales'] - data['GrossProfit']
         
         # Birim Fiyat hesapla
-        self.data['UnitPrice'] = np.where(
-            self.data['Quantity'] > 0,
-            self.data['Sales'] / self.data['Quantity'],
+        data['UnitPrice'] = np.where(
+            data['Quantity'] > 0,
+            data['Sales'] / data['Quantity'],
             0
         )
         
         # Stok/COGS oranı hesapla (hız)
-        self.data['Stock_COGS_Ratio'] = np.where(
-            self.data['COGS'] > 0,
-            self.data['Stock'] / self.data['COGS'],
+        data['Stock_COGS_Ratio'] = np.where(
+            data['COGS'] > 0,
+            data['Stock'] / data['COGS'],
             0
         )
         
+        # (Yıl × Ay × Seri × Metrik) küpüne çevir - Ana Grup indeksi
+        # (parametre dizileri bu sıraya hizalanır) küpün grup sırasıdır
+        self._set_cube(HistoryCube.from_frame(data, levels=self.levels))
+        
         # Son gerçekleşen yıl-ay'ı bul
         self._find_last_actual_period()
         
-        # *** 2025 Kasım-Aralık için özel tahmin YAPMA ***
+        # *** Son gerçekleşen aydan sonrası için özel tahmin YAPMA ***
         # forecast_future_months bu işi yapacak
-        # Sadece 2024'teki eksik ayları doldur
+        # Sadece geçmişteki eksik ayları doldur
         self._fill_missing_months()
     
     def _find_last_actual_period(self):
         """Son gerçekleşen veriyi bul (Sales > 0 olan son ay)"""
         # Her yıl-ay için toplam satışı kontrol et
-        period_sales = self.data.groupby(['Year', 'Month'])['Sales'].sum().reset_index()
-        period_sales = period_sales[period_sales['Sales'] > 100000]  # Anlamlı veri kontrolü
+        period_sales = self.cube['Sales'].sum(axis=2).ravel()
+        actual = np.flatnonzero(period_sales > 100000)  # Anlamlı veri kontrolü
         
-        if len(period_sales) > 0:
+        if len(actual) > 0:
             # Son gerçekleşen ay
-            last_period = period_sales.sort_values(['Year', 'Month'], ascending=True).iloc[-1]
-            self.last_actual_year = int(last_period['Year'])
-            self.last_actual_month = int(last_period['Month'])
+            self.last_actual_year = int(self.cube.years[actual[-1] // 12])
+            self.last_actual_month = int(actual[-1] % 12 + 1)
             
             print(f"✅ Son gerçekleşen veri: {self.last_actual_year}/{self.last_actual_month}")
         else:
@@ -97,75 +1161,87 @@ class BudgetForecaster:
             self.last_actual_month = 10
             print(f"⚠️ Gerçekleşen veri bulunamadı, varsayılan: 2025/10")
     
+    @_profiled('fill_missing_months')
     def _fill_missing_months(self):
-        """SADECE 2024'teki eksik ayları tahmin et - 2025 için YAPMA"""
+        """
+        Son gerçekleşen aya kadar eksik / yetersiz (Sales < 100.000) ayları tahmin et
         
-        # SADECE 2024'ü kontrol et
-        for month in range(1, 13):
-            # Bu ay verisi var mı?
-            month_data = self.data[(self.data['Year'] == 2024) & (self.data['Month'] == month)]
+        Tüm yıl-ay dönemleri küp üzerinde tek seferde taranır. Ardışık boşluklar zincir
+        halinde doldurulur: boşluktan önceki son dolu ay × 0.98^k (k = o aya uzaklık).
+        Tahminler tek seferde yazılır. Son gerçekleşen aydan sonrası doldurulmaz
+        (forecast_future_months bu işi yapar).
+        """
+        self._check_mutable()
+        
+        # Dönem bazında (küp yılı × 12 + ay) satış toplamı ve satır sayısı
+        cube = self.cube
+        num_series = cube.present.shape[2]
+        present = cube.present.reshape(-1, num_series)
+        values = cube.values.reshape(-1, num_series, len(HISTORY_METRICS))
+        row_counts = present.sum(axis=1)
+        period_sales = cube['Sales'].sum(axis=2).ravel()
+        
+        with_rows = np.flatnonzero(row_counts)
+        if len(with_rows) == 0:
+            return
+        
+        first_period = with_rows[0] // 12 * 12
+        last_period = min((self.last_actual_year - cube.years[0]) * 12 + self.last_actual_month - 1,
+                          len(row_counts) - 1)
+        
+        # Boşlukları çöz: hedef dönem → (kaynak dönem, uzaklık)
+        estimates = {}
+        for period in range(first_period, last_period + 1):
+            if row_counts[period] > 0 and period_sales[period] >= 100000:
+                continue
             
-            if len(month_data) == 0 or month_data['Sales'].sum() < 100000:
-                # Eksik veya yetersiz veri - tahmin et
-                self._estimate_month(2024, month)
-    
-    def _estimate_month(self, year, month):
-        """Belirli bir ayı tahmin et - SADECE 2024 İÇİN"""
-        
-        # Önceki ayı al
-        prev_month = month - 1
-        prev_year = year
-        
-        if prev_month == 0:
-            prev_month = 12
-            prev_year = year - 1
-        
-        prev_data = self.data[(self.data['Year'] == prev_year) & (self.data['Month'] == prev_month)].copy()
-        
-        if len(prev_data) == 0:
-            return  # Önceki ay da yoksa tahmin yapma
-        
-        estimate = prev_data.copy()
-        estimate['Month'] = month
-        estimate['Year'] = year
-        
-        # Konservatif: × 0.98
-        estimate['Quantity'] = estimate['Quantity'] * 0.98 if 'Quantity' in estimate.columns else 0
-        estimate['Sales'] = estimate['Sales'] * 0.98
-        estimate['GrossProfit'] = estimate['GrossProfit'] * 0.98
-        estimate['COGS'] = estimate['COGS'] * 0.98
-        estimate['Stock'] = estimate['Stock'] * 1.0
-        
-        # Birim fiyat hesapla
-        estimate['UnitPrice'] = np.where(
-            estimate['Quantity'] > 0,
-            estimate['Sales'] / estimate['Quantity'],
-            0
-        ) if 'Quantity' in estimate.columns else 0
-        
-        # Stok oranını yeniden hesapla
-        estimate['Stock_COGS_Ratio'] = np.where(
-            estimate['COGS'] > 0,
-            estimate['Stock'] / estimate['COGS'],
-            0
-        )
-        
-        # Mevcut tahmini çıkar ve yenisini ekle
-        self.data = self.data[~((self.data['Year'] == year) & (self.data['Month'] == month))]
-        self.data = pd.concat([self.data, estimate], ignore_index=True)
-        self.data = self.data.sort_values(['Year', 'Month', 'MainGroup']).reset_index(drop=True)
-        
-        print(f"📅 {year}/{month} ayı tahmini eklendi (Önceki ay × 0.98)")
+            prev_period = period - 1
+            if prev_period in estimates:
+                source, distance = estimates[prev_period]
+                estimates[period] = (source, distance + 1)
+            elif prev_period >= 0 and row_counts[prev_period] > 0:
+                estimates[period] = (prev_period, 1)
+            # Önceki ay da yoksa tahmin yapma
+        
+        if not estimates:
+            return
+        
+        targets = np.array(list(estimates), dtype=int)
+        sources = np.array([source for source, _ in estimates.values()], dtype=int)
+        factors = 0.98 ** np.array([distance for _, distance in estimates.values()], dtype=float)
+        
+        # Kaynak ayları hedef aylara kopyala - mevcut (yetersiz) veri tamamen değişir
+        estimate = values[sources]
+        metric = {col: estimate[..., k] for k, col in enumerate(HISTORY_METRICS)}
+        
+        # Konservatif: × 0.98 (zincirde her ay için)
+        for col in ['Quantity', 'Sales', 'GrossProfit', 'COGS']:
+            metric[col] *= factors[:, None]
+        
+        # Birim fiyat ve stok oranını yeniden hesapla
+        metric['UnitPrice'][:] = _safe_div(metric['Sales'], metric['Quantity'])
+        metric['Stock_COGS_Ratio'][:] = _safe_div(metric['Stock'], metric['COGS'])
+        
+        values[targets] = estimate
+        present[targets] = present[sources]
+        self._invariants = None
+        
+        years = cube.years
+        for target, (source, distance) in estimates.items():
+            factor = "× 0.98" if distance == 1 else f"× 0.98^{distance}"
+            print(f"📅 {years[target // 12]}/{target % 12 + 1} ayı tahmini eklendi "
+                  f"({years[source // 12]}/{source % 12 + 1} {factor})")
     
     def calculate_seasonality(self):
         """Her ay için mevsimsellik indeksi hesapla"""
         
         # Grup ve ay bazında ortalama satış
-        monthly_avg = self.data.groupby(['MainGroup', 'Month'])['Sales'].mean().reset_index()
+        data = self.data
+        monthly_avg = data.groupby(['MainGroup', 'Month'])['Sales'].mean().reset_index()
         monthly_avg.columns = ['MainGroup', 'Month', 'AvgSales']
         
         # Her grup için yıllık ortalama
-        yearly_avg = self.data.groupby('MainGroup')['Sales'].mean().reset_index()
+        yearly_avg = data.groupby('MainGroup')['Sales'].mean().reset_index()
         yearly_avg.columns = ['MainGroup', 'YearlyAvg']
         
         # Merge
@@ -180,309 +1256,926 @@ class BudgetForecaster:
         
         return seasonality[['MainGroup', 'Month', 'SeasonalityIndex']]
     
-    def forecast_future_months(self, num_months=15, growth_param=0.1, margin_improvement=0.0, 
-                              stock_change_pct=0.0, monthly_growth_targets=None, 
-                              maingroup_growth_targets=None, lessons_learned=None,
-                              inflation_adjustment=1.0, organic_multiplier=0.5,
-                              price_change_matrix=None, inflation_rate=0.25, organic_growth_rate=0.15):
+    @_profiled('invariants')
+    def _load_invariants(self):
         """
-        Son gerçekleşen aydan itibaren belirtilen sayıda ay tahmin et
+        Sadece veriye bağlı tahmin girdileri - yoğun geçmiş, mevsimsellik, organik trend,
+        son gerçekleşen ayın base verisi ve stok sağlık faktörleri
         
-        Parameters:
-        -----------
-        num_months: Kaç ay ileriye tahmin yapılacak (varsayılan 15)
-        growth_param: Genel büyüme hedefi
-        margin_improvement: Brüt marj iyileşme hedefi
-        stock_change_pct: Stok tutar değişim yüzdesi
-        monthly_growth_targets: Dict {month: growth_rate} - Her ay için özel hedef
-        maingroup_growth_targets: Dict {maingroup: growth_rate} - Her ana grup için özel hedef
-        lessons_learned: Dict {(maingroup, month): score} - Alınan dersler (-10 ile +10 arası)
-        inflation_adjustment: Enflasyon düzeltme faktörü (örn: 25/35 = 0.71)
-        organic_multiplier: Organik büyüme çarpanı (0.0=Çekimser, 0.5=Normal, 1.0=İyimser)
-        price_change_matrix: Dict {(maingroup, month): price_change_pct} - Fiyat değişim matrisi
-        inflation_rate: Enflasyon oranı (default fiyat artışı için, örn: 0.25 = %25)
-        organic_growth_rate: Organik büyüme oranı (örn: 0.15 = %15) - Yeni parametre
+        Bir kez hesaplanır; veri küpü değiştiğinde veya son gerçekleşen dönem
+        değiştiğinde yeniden hesaplanır.
         """
+        period = (self.last_actual_year, self.last_actual_month)
+        if self._invariants is not None and self._invariants['period'] == period:
+            return self._invariants
         
-        # Mevsimsellik hesapla
-        seasonality = self.calculate_seasonality()
+        history = self._build_dense_history()
+        years = history['years']
         
         # Son gerçekleşen ayın verisini base al
-        base_data = self.data[
-            (self.data['Year'] == self.last_actual_year) & 
-            (self.data['Month'] == self.last_actual_month)
-        ].copy()
+        last_pos = self._year_position(years, np.array([self.last_actual_year]))[0]
+        if last_pos >= 0:
+            base_present = history['present'][last_pos, self.last_actual_month - 1]
+            base = {col: history[col][last_pos, self.last_actual_month - 1] for col in HISTORY_METRICS}
+        else:
+            num_series = history['present'].shape[2]
+            base_present = np.zeros(num_series, dtype=bool)
+            base = {col: np.zeros(num_series) for col in HISTORY_METRICS}
+        
+        # Organik trend (geçen yıl -> son gerçekleşen yıl) - SADECE AYNI AYLARI KARŞILAŞTIR
+        pos_prev, pos_last = self._year_position(years, np.array([self.last_actual_year - 1, self.last_actual_year]))
+        common_months_prev = history['Sales'][pos_prev, :self.last_actual_month].sum() if pos_prev >= 0 else 0
+        common_months_last = history['Sales'][pos_last, :self.last_actual_month].sum() if pos_last >= 0 else 0
+        
+        history.update({
+            'period': period,
+            'base': base,
+            'base_present': base_present,
+            'organic_growth_raw': (common_months_last - common_months_prev) / common_months_prev if common_months_prev > 0 else 0,
+            'stock_health': self._stock_health_vector(base['Stock_COGS_Ratio'], base_present)
+        })
+        self._invariants = history
+        return history
+    
+    @_profiled('seasonality')
+    def _build_dense_history(self):
+        """Veri küpünden (Yıl × Ay × Seri) metrik görünümleri ve seri bazında mevsimsellik"""
+        
+        cube = self.cube
+        history = {
+            'groups': cube.groups,
+            'leaves': cube.leaves,
+            'leaf_group': cube.leaf_group,
+            'group_starts': cube.level_blocks('MainGroup')[1],
+            'years': cube.years,
+            'present': cube.present
+        }
+        for col in HISTORY_METRICS:
+            history[col] = cube[col]
+        
+        # Mevsimsellik: (Seri × Ay) ortalama satış / seri ortalaması
+        sales = cube['Sales']
+        month_sum = sales.sum(axis=0).T
+        month_cnt = cube.present.sum(axis=0).T
+        group_avg = _safe_div(month_sum.sum(axis=1), month_cnt.sum(axis=1).astype(float))
+        month_avg = _safe_div(month_sum, month_cnt.astype(float))
+        history['seasonality'] = np.where(
+            (month_cnt > 0) & (group_avg[:, None] > 0),
+            _safe_div(month_avg, group_avg[:, None]),
+            1.0
+        )
+        
+        return history
+    
+    @staticmethod
+    def _year_position(years, target_years):
+        """Yıl değerlerini küp indeksine çevir (-1 = yok)"""
+        pos = np.searchsorted(years, target_years)
+        pos_clipped = np.minimum(pos, len(years) - 1)
+        found = (len(years) > 0) & (years[pos_clipped] == target_years)
+        return np.where(found, pos_clipped, -1)
+    
+    @staticmethod
+    def _stock_health_vector(ratio, present):
+        """Son gerçekleşen ayın Stok/COGS oranından grup bazında stok sağlık faktörü"""
+        
+        factors = np.ones(ratio.shape)
+        if not present.any():
+            return factors
+        
+        # Ortalama Stok/COGS oranı (benchmark)
+        avg_stock_ratio = ratio[present].mean()
+        if not avg_stock_ratio > 0:
+            return factors
+        
+        # Benchmark'a göre sapma - ÇOK KONSERVATIF AYARLAMA, Max %2.5
+        deviation = (ratio - avg_stock_ratio) / avg_stock_ratio
+        slow = np.maximum(-0.01 - np.minimum(deviation - 0.5, 0.5) * 0.03, -0.025)
+        fast = np.minimum(0.01 + np.minimum(np.abs(deviation) - 0.3, 0.5) * 0.03, 0.025)
+        adjustment = np.select([deviation > 0.5, deviation < -0.3], [slow, fast], 0.0)
+        
+        return np.where(present, 1 + adjustment, 1.0)
+    
+    def compile_parameters(self, growth_param=0.1, monthly_growth_targets=None,
+                           maingroup_growth_targets=None, lessons_learned=None,
+                           price_change_matrix=None, inflation_rate=0.25):
+        """Sözlük parametrelerini bu forecaster'ın grup indeksine hizalı ForecastParameters'a derle"""
+        return ForecastParameters.from_dicts(
+            self.groups,
+            growth_param=growth_param,
+            monthly_growth_targets=monthly_growth_targets,
+            maingroup_growth_targets=maingroup_growth_targets,
+            lessons_learned=lessons_learned,
+            price_change_matrix=price_change_matrix,
+            inflation_rate=inflation_rate
+        )
+    
+    def budget_scenarios(self, parameters, margin_improvement=0.02, stock_change_pct=0.0, inflation_adjustment=1.0,
+                         inflation_rate=0.25, effects=None, growth_param=0.10):
+        """
+        Her bütçe versiyonu (BUDGET_VERSIONS) için forecast_scenarios parametre seti
         
-        # Organik trend (2024->2025) - SADECE AYNI AYLARI KARŞILAŞTIR
-        # Son gerçekleşen aya kadar olan ayları al
-        common_months_2024 = self.data[
-            (self.data['Year'] == 2024) & 
-            (self.data['Month'] <= self.last_actual_month)
-        ]['Sales'].sum()
+        Parameters:
+        -----------
+        parameters: ParameterSet (parametre tabloları)
+        margin_improvement, stock_change_pct, inflation_adjustment, inflation_rate: Tüm versiyonlarda ortak
+        effects: Dict {versiyon: {'organic_multiplier', 'monthly_effect', 'maingroup_effect',
+                 'organic_growth_rate'}} - verilen versiyonlarda BUDGET_VERSIONS etki oranları yerine
+        growth_param: Genel büyüme (hedefi girilmeyen ay / grup)
+        """
         
-        common_months_2025 = self.data[
-            (self.data['Year'] == 2025) & 
-            (self.data['Month'] <= self.last_actual_month)
-        ]['Sales'].sum()
+        scenario_sets = []
+        for version, settings in BUDGET_VERSIONS.items():
+            settings = (effects or {}).get(version, settings)
+            
+            scenario_sets.append({
+                'name': version,
+                'margin_improvement': margin_improvement,
+                'stock_change_pct': stock_change_pct,
+                'inflation_adjustment': inflation_adjustment,
+                'organic_multiplier': settings['organic_multiplier'],
+                'organic_growth_rate': settings['organic_growth_rate'],
+                # Parametreler grup × ay dizilerine derlenmiş halde
+                'parameters': parameters.compile(
+                    self.groups,
+                    growth_param=growth_param,
+                    monthly_effect=settings['monthly_effect'],
+                    maingroup_effect=settings['maingroup_effect'],
+                    inflation_rate=inflation_rate
+                )
+            })
         
-        organic_growth_raw = (common_months_2025 - common_months_2024) / common_months_2024 if common_months_2024 > 0 else 0
+        return scenario_sets
+    
+    def zero_reset_mask(self, parameters):
+        """ParameterSet'in * sıfırlamalarından (Ana Grup × 12) bool maske"""
+        return parameters.zero_mask(self.groups)
+    
+    @_profiled('forecast_context')
+    def _forecast_context(self, num_months):
+        """
+        Parametreden bağımsız tahmin girdileri - tüm senaryolarda ortak kullanılır
         
-        # ENFLASYON DÜZELTMESİ UYGULA
-        organic_growth = organic_growth_raw * inflation_adjustment
+        Ufuk (yıl/ay), son gerçekleşen ayın base verisi, mevsimsellik, organik trend,
+        stok sağlık faktörleri ve geçen yılın aynı ayına ait gerçek veriler. Veriye bağlı
+        kısımlar _load_invariants önbelleğinden gelir; burada sadece ufka yayılır.
+        """
         
-        # BÜTÇE VERSİYONU ÇARPANI UYGULA
-        # 0.0 = Çekimser (organik yok), 0.5 = Normal (yarım), 1.0 = İyimser (tam)
-        organic_growth = organic_growth * organic_multiplier
+        history = self._load_invariants()
+        groups = history['groups']
+        years = history['years']
+        present = history['present']
         
-        # ========================================
-        # *** STOK SAĞLIK FAKTÖRLERİNİ HESAPLA ***
-        # ========================================
+        # Tahmin ufku: adım, yıl, ay
+        steps = np.arange(1, num_months + 1)
+        abs_month = self.last_actual_month - 1 + steps
+        target_years = self.last_actual_year + abs_month // 12
+        target_months = abs_month % 12 + 1
+        m_idx = target_months - 1
         
-        # Ortalama Stok/COGS oranı (benchmark)
-        avg_stock_ratio = base_data['Stock_COGS_Ratio'].mean()
+        # Geçen yılın aynı ayı (gerçek veri)
+        prev_pos = self._year_position(years, target_years - 1)
+        prev_found = prev_pos >= 0
+        prev_pos = np.maximum(prev_pos, 0)
+        prev_present = present[prev_pos, m_idx] & prev_found[:, None]
         
-        # Her ana grup için stok sağlık faktörü hesapla
-        stock_health_factors = {}
+        return {
+            'groups': groups,
+            'leaves': history['leaves'],
+            'leaf_group': history['leaf_group'],
+            'group_starts': history['group_starts'],
+            'steps': steps,
+            'years': target_years,
+            'months': target_months,
+            'm_idx': m_idx,
+            'base': history['base'],
+            'base_present': history['base_present'],
+            'organic_growth_raw': history['organic_growth_raw'],
+            # *** STOK SAĞLIK FAKTÖRLERİ ***
+            'stock_health': history['stock_health'],
+            'seasonality': history['seasonality'][:, m_idx].T,
+            # Zaman faktörü (uzak gelecek daha konservatif)
+            'time_discount': np.maximum(1.0 - steps * 0.01, 0.85)[:, None],
+            'prev': {col: history[col][prev_pos, m_idx] for col in HISTORY_METRICS},
+            'prev_present': prev_present,
+            'prev_len': prev_present.sum(axis=1),
+            'prev_sales': (history['Sales'][prev_pos, m_idx] * prev_present).sum(axis=1),
+            # Son gerçekleşen yıldan sonraki aylar (geçen yıl / 12 ay önceki tahmin kaynak seçimi)
+            'next_year': target_years > self.last_actual_year,
+            # *** İLK 1 AY İÇİN ÖZEL YAKLAŞIM (SADECE son gerçekleşen yılın Aralık ayı) ***
+            'special': (target_years == self.last_actual_year) & (target_months == 12)
+        }
+    
+    @_profiled('compile_scenarios')
+    def _compile_scenarios(self, context, param_sets, zero_mask=None):
+        """
+        Senaryo parametre setlerini (forecast_future_months argümanları) senaryo ekseninde
+        yığılmış dizilere çevir - zero_mask (Grup × 12) tüm senaryolarda ortak 'keep'
+        çarpanı (Ufuk × Seri) olur
+        """
         
-        for _, row in base_data.iterrows():
-            main_group = row['MainGroup']
-            group_ratio = row['Stock_COGS_Ratio']
+        defaults = {
+            'growth_param': 0.1, 'margin_improvement': 0.0, 'stock_change_pct': 0.0,
+            'monthly_growth_targets': None, 'maingroup_growth_targets': None,
+            'lessons_learned': None, 'inflation_adjustment': 1.0, 'organic_multiplier': 0.5,
+            'price_change_matrix': None, 'inflation_rate': 0.25, 'organic_growth_rate': 0.15,
+            'parameters': None
+        }
+        
+        compiled = []
+        for param_set in param_sets:
+            unknown = set(param_set) - set(defaults) - {'name'}
+            if unknown:
+                raise TypeError(f"Bilinmeyen senaryo parametresi: {', '.join(sorted(unknown))}")
             
-            # Benchmark'a göre sapma
-            if avg_stock_ratio > 0:
-                ratio_deviation = (group_ratio - avg_stock_ratio) / avg_stock_ratio
-                
-                # ÇOK KONSERVATIF AYARLAMA - Max %2.5
-                if ratio_deviation > 0.5:  # %50'den fazla yüksekse (yavaş hareket)
-                    # Hafif azalt: max %2.5 azalış
-                    adjustment = -0.01 - (min(ratio_deviation - 0.5, 0.5) * 0.03)
-                    adjustment = max(adjustment, -0.025)  # Max -%2.5
-                elif ratio_deviation < -0.3:  # %30'dan fazla düşükse (hızlı hareket)
-                    # Hafif artır: max %2.5 artış
-                    adjustment = 0.01 + (min(abs(ratio_deviation) - 0.3, 0.5) * 0.03)
-                    adjustment = min(adjustment, 0.025)  # Max +%2.5
-                else:
-                    # Normal aralıkta, ayarlama yok
-                    adjustment = 0
-                
-                stock_health_factors[main_group] = 1 + adjustment
+            p = {**defaults, **param_set}
+            if p['parameters'] is None:
+                p['parameters'] = ForecastParameters.from_dicts(
+                    context['groups'],
+                    growth_param=p['growth_param'],
+                    monthly_growth_targets=p['monthly_growth_targets'],
+                    maingroup_growth_targets=p['maingroup_growth_targets'],
+                    lessons_learned=p['lessons_learned'],
+                    price_change_matrix=p['price_change_matrix'],
+                    inflation_rate=p['inflation_rate']
+                )
             else:
-                stock_health_factors[main_group] = 1.0
+                p['parameters'] = p['parameters'].align(context['groups'])
+            compiled.append(p)
         
-        # ========================================
-        # *** STOK FAKTÖRÜ HESAPLANDI ***
-        # ========================================
+        def stack(key):
+            return np.array([p[key] for p in compiled], dtype=float)
         
-        # Tahmin aylarını oluştur
-        forecast_data = []
+        # Ana Grup parametreleri yaprak serilere yayılır
+        m_idx = context['m_idx']
+        leaf_group = context['leaf_group']
+        monthly_targets = np.stack([p['parameters'].monthly_targets for p in compiled])
+        group_targets = np.stack([p['parameters'].group_targets for p in compiled])
+        lessons = np.stack([p['parameters'].lessons for p in compiled])[:, leaf_group]
+        price_changes = np.stack([p['parameters'].price_changes for p in compiled])[:, leaf_group]
         
-        for i in range(1, num_months + 1):
-            # Hedef yıl-ay hesapla
-            target_month = self.last_actual_month + i
-            target_year = self.last_actual_year
-            
-            while target_month > 12:
-                target_month -= 12
-                target_year += 1
-            
-            # *** İLK 1 AY İÇİN ÖZEL YAKLAŞIM (SADECE 2025 Aralık) ***
-            # 2025 Kasım artık gerçek veri
-            if target_year == 2025 and target_month == 12:  # Sadece Aralık
-                # Geçen yılın aynı ayını baz al
-                same_month_last_year = self.data[
-                    (self.data['Year'] == 2024) & 
-                    (self.data['Month'] == target_month)
-                ].copy()
-                
-                if len(same_month_last_year) > 0:
-                    month_forecast = same_month_last_year.copy()
-                    month_forecast['Year'] = 2025
-                    month_forecast['Month'] = target_month
-                    
-                    # Fiyat artışını hesapla
-                    month_forecast['PriceChange'] = month_forecast.apply(
-                        lambda row: price_change_matrix.get((row['MainGroup'], target_month), inflation_rate) 
-                        if price_change_matrix else inflation_rate,
-                        axis=1
-                    )
-                    
-                    # Fiyat artış çarpanı (örn: %25 artış = 1.25)
-                    month_forecast['PriceMultiplier'] = 1 + month_forecast['PriceChange']
-                    
-                    # 2025 Birim Fiyat = 2024 Fiyat × Fiyat Çarpanı
-                    month_forecast['UnitPrice'] = month_forecast['UnitPrice'] * month_forecast['PriceMultiplier']
-                    
-                    # 2025 Adet = 2024 Adet × 1.15 (SABİT)
-                    month_forecast['Quantity'] = month_forecast['Quantity'] * 1.15
-                    
-                    # 2025 Ciro = Adet × Fiyat
-                    month_forecast['Sales'] = month_forecast['Quantity'] * month_forecast['UnitPrice']
-                    
-                    # *** ÖNEMLİ: Ciro artış oranını hesapla ***
-                    # Ciro = Adet × Fiyat = 1.15 × Fiyat Çarpanı
-                    month_forecast['SalesMultiplier'] = 1.15 * month_forecast['PriceMultiplier']
-                    
-                    # Brüt Kar ve SMM aynı oranda artar (marj korunsun)
-                    month_forecast['GrossProfit'] = month_forecast['GrossProfit'] * month_forecast['SalesMultiplier']
-                    month_forecast['COGS'] = month_forecast['COGS'] * month_forecast['SalesMultiplier']
-                    
-                    # Marjı yeniden hesapla
-                    month_forecast['GrossMargin%'] = np.where(
-                        month_forecast['Sales'] > 0,
-                        month_forecast['GrossProfit'] / month_forecast['Sales'],
-                        0
-                    )
-                    
-                    # Stok
-                    month_forecast['Stock'] = month_forecast['Stock'] * 1.10
-                    
-                    # Stok oranı
-                    month_forecast['Stock_COGS_Ratio'] = np.where(
-                        month_forecast['COGS'] > 0,
-                        month_forecast['Stock'] / month_forecast['COGS'],
-                        0
-                    )
-                    
-                    forecast_data.append(month_forecast)
-                    
-                    continue
-            
-            # *** DİĞER AYLAR İÇİN NORMAL TAHMİN ***
-            # 2026+ için: GEÇEN YILIN AYNI AYINI BASE AL
-            if target_year >= 2026:
-                # Önce self.data'dan bak (gerçek veri için)
-                same_month_prev_year = self.data[
-                    (self.data['Year'] == target_year - 1) & 
-                    (self.data['Month'] == target_month)
-                ]
-                
-                # Gerçek veri yoksa, önceki tahminlerden bak
-                if len(same_month_prev_year) == 0 or same_month_prev_year['Sales'].sum() < 100000:
-                    # forecast_data içinde ara (örn: 2025/11-12 tahmini)
-                    for prev_forecast in forecast_data:
-                        if len(prev_forecast) > 0:
-                            if prev_forecast.iloc[0]['Year'] == target_year - 1 and prev_forecast.iloc[0]['Month'] == target_month:
-                                same_month_prev_year = prev_forecast.copy()
-                                break
+        # ENFLASYON DÜZELTMESİ + BÜTÇE VERSİYONU ÇARPANI
+        organic_growth = (context['organic_growth_raw'] * stack('inflation_adjustment') *
+                          stack('organic_multiplier'))
+        
+        return {
+            'names': [p.get('name', i) for i, p in enumerate(compiled)],
+            'organic_factor': 1 + organic_growth * stack('organic_growth_rate'),
+            'margin_improvement': stack('margin_improvement'),
+            'stock_change_pct': stack('stock_change_pct'),
+            # Kombine büyüme hedefi - ORTALAMA: (Ay + Ana Grup) / 2 + Dersler
+            'combined_target': (
+                (monthly_targets[:, m_idx][:, :, None] + group_targets[:, None, leaf_group]) / 2 +
+                lessons[:, :, m_idx].transpose(0, 2, 1) * 0.005
+            ),
+            'price_multiplier': 1 + price_changes[:, :, m_idx].transpose(0, 2, 1),
+            'monthly_targets': monthly_targets,
+            'group_targets': group_targets,
+            'keep': self._zero_keep(context, zero_mask)
+        }
+    
+    @_profiled('forecast_grid')
+    def _forecast_grid(self, context, settings, executor=None):
+        """
+        Tahmin çekirdeği: (Senaryo × Ufuk × Seri) ızgarasını NumPy ile hesapla
+        
+        Bir ay yalnızca 12 ay önceki tahmine bağlı olabildiği için hesaplama
+        12 aylık bloklar halinde yapılır (15 ay için 2 blok). settings dizileri
+        senaryo ekseninde (B) yığılmıştır; 'seasonality' verilirse context'teki
+        mevsimselliğin yerine kullanılır, 'sources' verilirse (önceki bir ızgaranın
+        kaynak seçimleri) kaynak seçimi yeniden yapılmaz.
+        
+        executor verilirse (parallel_forecast.ForecastExecutor) her blok seri
+        bölümlerine ayrılıp havuzda hesaplanır; kaynak seçimi tüm serilerin toplamına
+        bağlı olduğu için bloklar arasında birleştirilmiş ızgara üzerinde yapılır.
+        """
+        
+        num_scenarios = len(settings['organic_factor'])
+        num_months = len(context['steps'])
+        shape = (num_scenarios, num_months, len(context['leaf_group']))
+        
+        if executor is None:
+            grid = None
+            out_present = np.zeros(shape, dtype=bool)
+            out = {col: np.zeros(shape) for col in HISTORY_METRICS}
+        else:
+            grid = executor.open_grid(context, settings, shape)
+            out, out_present = grid.out, grid.present
+        
+        sources = settings.get('sources')
+        out_sources = {key: np.zeros((num_scenarios, num_months), dtype=bool)
+                       for key in ('use_data', 'use_fc', 'special')}
+        
+        try:
+            for start in range(0, num_months, 12):
+                block = slice(start, min(start + 12, num_months))
                 
-                if len(same_month_prev_year) > 0 and same_month_prev_year['Sales'].sum() > 100000:
-                    # Geçen yılın aynı ayını BASE olarak kullan
-                    month_forecast = same_month_prev_year.copy()
-                    month_forecast['Year'] = target_year
-                    month_forecast['Month'] = target_month
-                    # NOT: Aşağıda parametreler uygulanacak (mevsimsellik, hedefler vs)
+                if sources is None:
+                    selected = self._select_sources(context, block, out_present, out['Sales'])
                 else:
-                    # Fallback: base_data
-                    month_forecast = base_data.copy()
-                    month_forecast['Year'] = target_year
-                    month_forecast['Month'] = target_month
-            else:
-                # 2025 içindeyiz, base_data kullan
-                month_forecast = base_data.copy()
-                month_forecast['Year'] = target_year
-                month_forecast['Month'] = target_month
+                    selected = tuple(sources[key][:, block] for key in ('use_data', 'use_fc', 'special'))
+                for key, values in zip(('use_data', 'use_fc', 'special'), selected):
+                    out_sources[key][:, block] = values
+                
+                with profile_stage('forecast_block'):
+                    if grid is None:
+                        self._forecast_block(context, settings, block, selected, out, out_present)
+                    else:
+                        grid.run_block(block, selected)
             
-            # Mevsimselliği ekle
-            month_forecast = month_forecast.merge(
-                seasonality[seasonality['Month'] == target_month],
-                on=['MainGroup', 'Month'],
-                how='left'
+            if grid is not None:
+                out, out_present = grid.collect()
+        finally:
+            if grid is not None:
+                grid.close()
+        
+        out['present'] = out_present
+        out['sources'] = out_sources
+        return out
+    
+    @staticmethod
+    def _forecast_block(context, settings, block, selected, out, out_present):
+        """
+        Bir 12 aylık bloğun tahmini - verilen kaynak seçimiyle, out dizilerine yerinde
+        
+        Seriler birbirinden bağımsızdır; context / settings / out seri ekseninde aynı
+        şekilde dilimlenerek (örn: paralel bölümler) çağrılabilir.
+        """
+        
+        base = context['base']
+        seasonality = settings.get('seasonality', context['seasonality'][None])
+        organic_factor = settings['organic_factor'][:, None, None]
+        margin_improvement = settings['margin_improvement'][:, None, None]
+        stock_factor = 1 + settings['stock_change_pct'][:, None, None]
+        stock_health = context['stock_health'][None, None, :]
+        
+        use_data, use_fc, block_special = selected
+        fc_idx = np.maximum(np.arange(block.start, block.stop) - 12, 0)
+        fc_present = out_present[:, fc_idx]
+        data_present = context['prev_present'][block]
+        use_data = use_data[..., None]
+        use_fc = use_fc[..., None]
+        
+        def source(col):
+            return np.where(use_data, context['prev'][col][block],
+                            np.where(use_fc, out[col][:, fc_idx], base[col]))
+        
+        src_present = np.where(use_data, data_present,
+                               np.where(use_fc, fc_present, context['base_present']))
+        src_stock = source('Stock')
+        pm = settings['price_multiplier'][:, block]
+        
+        # NORMAL TAHMİN - PARAMETRİK ORGANİK BÜYÜME
+        unit_price = source('UnitPrice') * pm
+        sales = (
+            source('Sales') *
+            organic_factor *
+            (1 + settings['combined_target'][:, block]) *
+            (0.8 + seasonality[:, block] * 0.2) *
+            stock_health *
+            context['time_discount'][block]
+        )
+        margin = np.clip(source('GrossMargin%') + margin_improvement, 0, 1)
+        gross_profit = sales * margin
+        stock = src_stock * stock_factor
+        
+        # ÖZEL AY: Adet × 1.15, fiyat × fiyat çarpanı, marj korunur
+        sales_multiplier = 1.15 * pm
+        special_quantity = source('Quantity') * 1.15
+        special_sales = special_quantity * unit_price
+        special_gp = source('GrossProfit') * sales_multiplier
+        special_cogs = source('COGS') * sales_multiplier
+        
+        is_special = block_special[..., None]
+        sales = np.where(is_special, special_sales, sales)
+        gross_profit = np.where(is_special, special_gp, gross_profit)
+        cogs = np.where(is_special, special_cogs, sales - gross_profit)
+        stock = np.where(is_special, src_stock * 1.10, stock)
+        
+        out['UnitPrice'][:, block] = unit_price
+        out['Sales'][:, block] = sales
+        out['Quantity'][:, block] = np.where(is_special, special_quantity, _safe_div(sales, unit_price))
+        out['GrossProfit'][:, block] = gross_profit
+        out['GrossMargin%'][:, block] = np.where(is_special, _safe_div(special_gp, special_sales), margin)
+        out['COGS'][:, block] = cogs
+        out['Stock'][:, block] = stock
+        out['Stock_COGS_Ratio'][:, block] = _safe_div(stock, cogs)
+        out_present[:, block] = src_present
+        
+        # * sıfırlaması: tek çarpım - sıfırlanan hücreler sonraki blokların kaynak
+        # seçimine ve 12 ay sonraki tahmine 0 olarak girer
+        keep = settings['keep'][block]
+        for col in ZERO_RESET_COLUMNS:
+            out[col][:, block] *= keep
+    
+    @staticmethod
+    def _select_sources(context, block, out_present, out_sales):
+        """
+        Bir 12 aylık blok için kaynak seçimi (Senaryo × Ay): geçen yılın gerçek verisi,
+        12 ay önceki tahmin ya da son gerçekleşen ay (base)
+        
+        Karar tüm grupların toplam satışına bağlıdır; parametrelerden yalnızca
+        12 ay önceki tahmin toplamı üzerinden etkilenir.
+        """
+        idx = np.arange(block.start, block.stop)
+        
+        # Geçen yılın aynı ayı - önce gerçekleşen veri
+        data_len = context['prev_len'][block]
+        data_sales = context['prev_sales'][block]
+        
+        # Gerçek veri yoksa 12 ay önceki tahmin
+        fc_idx = np.maximum(idx - 12, 0)
+        fc_present = out_present[:, fc_idx]
+        fc_len = fc_present.sum(axis=2)
+        fc_sales = (out_sales[:, fc_idx] * fc_present).sum(axis=2)
+        
+        is_next_year = context['next_year'][block]
+        use_fc = (is_next_year & ((data_len == 0) | (data_sales < 100000)) &
+                  (idx >= 12) & (fc_len > 0))
+        cand_len = np.where(use_fc, fc_len, data_len)
+        cand_sales = np.where(use_fc, fc_sales, data_sales)
+        use_cand = is_next_year & (cand_len > 0) & (cand_sales > 100000)
+        
+        block_special = np.broadcast_to(context['special'][block] & (data_len > 0), use_fc.shape)
+        use_data = block_special | (use_cand & ~use_fc)
+        use_fc = use_fc & use_cand & ~block_special
+        return use_data, use_fc, block_special
+    
+    @_profiled('forecast_scenarios')
+    def forecast_scenarios(self, param_sets, num_months=15, executor=None, zero_mask=None):
+        """
+        Birden fazla parametre setini (örn: Çekimser / Normal / İyimser) tek çağrıda tahmin et
+        
+        Base veri, mevsimsellik, organik trend ve stok sağlığı tüm senaryolarda ortaktır.
+        
+        Parameters:
+        -----------
+        param_sets: List[Dict] - Her biri forecast_future_months argümanları
+                    (num_months hariç); opsiyonel 'name' anahtarı senaryo adıdır
+        num_months: Kaç ay ileriye tahmin yapılacak
+        executor: parallel_forecast.ForecastExecutor - verilirse seri bölümleri havuzda
+                  hesaplanır (sonuç seri yürütme ile birebir aynıdır)
+        zero_mask: (Grup × 12) bool - * ile sıfırlanan hücreler; son gerçekleşen yıldan
+                   sonraki tüm tahmin yıllarında ZERO_RESET_COLUMNS 0 olur
+        
+        Returns:
+        --------
+        Dict: 'names' (S,), 'years' / 'months' (H,), 'groups' (G,), 'leaves' (L × seviye),
+              'present' (S × H × L) bool ve her metrik için (S × H × L) dizi (L: yaprak seri)
+        """
+        
+        context = self._forecast_context(num_months)
+        settings = self._compile_scenarios(context, param_sets, zero_mask)
+        cube = self._forecast_grid(context, settings, executor)
+        cube.update({
+            'names': settings['names'],
+            'years': context['years'],
+            'months': context['months'],
+            'groups': context['groups'],
+            'leaves': context['leaves']
+        })
+        return cube
+    
+    def _zero_keep(self, context, zero_mask):
+        """
+        * sıfırlama maskesini (Grup × 12) ufuk ızgarasına (H × L) 0/1 çarpan olarak yay -
+        son gerçekleşen yıldan sonraki tüm yıllar (yıl sabit kodlanmaz)
+        """
+        keep = np.ones((len(context['steps']), len(context['leaf_group'])))
+        if zero_mask is not None:
+            future = context['years'] > self.last_actual_year
+            zero_mask = np.asarray(zero_mask, dtype=bool)[context['leaf_group']]
+            keep[future] = ~zero_mask[:, context['m_idx'][future]].T
+        return keep
+    
+    def _actual_year_cells(self, year):
+        """Bir yılın gerçekleşen (son gerçekleşen aya kadar) hücreleri: (12 × L) bool"""
+        position = self.cube.year_position(year)
+        if position < 0:
+            return None, np.zeros((12, self.cube.present.shape[2]), dtype=bool)
+        
+        actual = self.cube.actual_months(self.last_actual_year, self.last_actual_month)[position]
+        return position, self.cube.present[position] & actual[:, None]
+    
+    def _yearly_metrics(self, context, grid, year):
+        """
+        Senaryo ızgarasından bir yılın özet metrikleri (get_summary_stats ile aynı tanımlar)
+        
+        Yılın gerçekleşen ayları (son gerçekleşen aya kadar) tüm senaryolarda ortaktır.
+        """
+        
+        # Gerçekleşen kısım (ay bazında toplamlar, sadece satırı olan aylar)
+        position, cells = self._actual_year_cells(year)
+        hist_months = cells.any(axis=1)
+        hist_monthly = {
+            col: (self.cube[col][position] * cells).sum(axis=1)[hist_months] if position is not None else np.zeros(0)
+            for col in ['Sales', 'GrossProfit', 'Stock', 'COGS']
+        }
+        
+        # Tahmin kısmı (S × ay)
+        in_year = context['years'] == year
+        present = grid['present'][:, in_year]
+        
+        def monthly(col):
+            return (grid[col][:, in_year] * present).sum(axis=2)
+        
+        has_rows = present.any(axis=2)
+        sales = monthly('Sales').sum(axis=1) + hist_monthly['Sales'].sum()
+        gross_profit = monthly('GrossProfit').sum(axis=1) + hist_monthly['GrossProfit'].sum()
+        
+        # Haftalık oran: Ort. Aylık Stok / (Toplam Yıllık SMM / 52)
+        month_count = has_rows.sum(axis=1) + hist_months.sum()
+        avg_monthly_stock = _safe_div(monthly('Stock').sum(axis=1) + hist_monthly['Stock'].sum(), month_count)
+        total_cogs = monthly('COGS').sum(axis=1) + hist_monthly['COGS'].sum()
+        
+        return {
+            'Total_Sales': sales,
+            'Total_GrossProfit': gross_profit,
+            'Avg_GrossMargin%': _safe_div(gross_profit, sales) * 100,
+            'Avg_Stock_COGS_Weekly': _safe_div(avg_monthly_stock, total_cogs / 52)
+        }
+    
+    @_profiled('sweep_parameters')
+    def sweep_parameters(self, grid, year=None, num_months=15, zero_mask=None, batch_size=500,
+                         executor=None, monthly_effect=1.0, maingroup_effect=1.0, **forecast_params):
+        """
+        Duyarlılık analizi - skaler parametrelerin Kartezyen ızgarasını toplu hesapla
+        
+        Parameters:
+        -----------
+        grid: Dict {parametre: değer listesi} - örn:
+              {'margin_improvement': [0.01, 0.02], 'stock_change_pct': [-0.2, 0, 0.2]}
+              Birlikte değişen parametreler tek eksen olur: {(p1, p2): [(a1, b1), (a2, b2)]}
+        year: Özet metriklerin hesaplanacağı yıl (varsayılan: last_actual_year + 1)
+        zero_mask: (G × 12) bool - * ile sıfırlanan hücreler
+        batch_size: Bir seferde hesaplanan ızgara noktası sayısı
+        executor: parallel_forecast.ForecastExecutor - her parti seri bölümlerinde paralel hesaplanır
+        monthly_effect, maingroup_effect: parameters bir ParameterSet ise derlemede kullanılan etki oranları
+        **forecast_params: Diğer forecast_future_months parametreleri (sabit) - parameters bir
+                           ParameterSet olabilir; o zaman growth_param / inflation_rate de taranabilir
+        
+        Returns:
+        --------
+        DataFrame: Her ızgara noktası için parametreler + Total_Sales, Total_GrossProfit,
+                   Avg_GrossMargin%, Avg_Stock_COGS_Weekly
+        """
+        
+        # Her eksen bir parametre grubu - tekil parametre tek elemanlı grup
+        axes = [(names if isinstance(names, tuple) else (names,), values) for names, values in grid.items()]
+        names = [name for axis_names, _ in axes for name in axis_names]
+        
+        unknown = set(names) - set(SWEEP_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Taranamayan parametre: {', '.join(sorted(unknown))}")
+        if len(set(names)) != len(names):
+            raise ValueError("Bir parametre ızgarada birden fazla eksende olamaz")
+        parameter_set = forecast_params.get('parameters')
+        if isinstance(parameter_set, ForecastParameters) and {'growth_param', 'inflation_rate'} & set(names):
+            raise ValueError("growth_param / inflation_rate derlenmiş parameters ile birlikte taranamaz")
+        
+        if year is None:
+            year = self.last_actual_year + 1
+        
+        # Kartezyen ızgara - eksen içindeki parametreler birlikte değişir
+        axis_values = [np.asarray(values, dtype=float).reshape(len(values), len(axis_names))
+                       for axis_names, values in axes]
+        mesh = np.meshgrid(*[np.arange(len(values)) for values in axis_values], indexing='ij')
+        points = pd.DataFrame({
+            name: values[positions.ravel(), column]
+            for (axis_names, _), values, positions in zip(axes, axis_values, mesh)
+            for column, name in enumerate(axis_names)
+        })
+        
+        context = self._forecast_context(num_months)
+        
+        # Parametreleri her farklı (growth_param, inflation_rate) için bir kez derle
+        compiled = {}
+        
+        def point_params(point):
+            params = {**forecast_params, **point}
+            if not isinstance(params.get('parameters'), ForecastParameters):
+                key = (params.get('growth_param', 0.1), params.get('inflation_rate', 0.25))
+                if key not in compiled:
+                    if parameter_set is not None:
+                        compiled[key] = parameter_set.compile(
+                            context['groups'],
+                            growth_param=key[0],
+                            monthly_effect=monthly_effect,
+                            maingroup_effect=maingroup_effect,
+                            inflation_rate=key[1]
+                        )
+                    else:
+                        compiled[key] = ForecastParameters.from_dicts(
+                            context['groups'],
+                            growth_param=key[0],
+                            monthly_growth_targets=params.get('monthly_growth_targets'),
+                            maingroup_growth_targets=params.get('maingroup_growth_targets'),
+                            lessons_learned=params.get('lessons_learned'),
+                            price_change_matrix=params.get('price_change_matrix'),
+                            inflation_rate=key[1]
+                        )
+                params['parameters'] = compiled[key]
+            return params
+        
+        records = points.to_dict('records')
+        metrics = []
+        for start in range(0, len(records), batch_size):
+            settings = self._compile_scenarios(
+                context, [point_params(point) for point in records[start:start + batch_size]], zero_mask
             )
-            month_forecast['SeasonalityIndex'] = month_forecast['SeasonalityIndex'].fillna(1.0)
-            
-            # Hedefleri uygula
-            if monthly_growth_targets is not None:
-                month_forecast['MonthlyGrowthTarget'] = monthly_growth_targets.get(target_month, growth_param)
-            else:
-                month_forecast['MonthlyGrowthTarget'] = growth_param
-            
-            if maingroup_growth_targets is not None:
-                month_forecast['MainGroupGrowthTarget'] = month_forecast['MainGroup'].map(maingroup_growth_targets)
-                month_forecast['MainGroupGrowthTarget'] = month_forecast['MainGroupGrowthTarget'].fillna(growth_param)
-            else:
-                month_forecast['MainGroupGrowthTarget'] = growth_param
-            
-            # Alınan dersler
-            if lessons_learned is not None:
-                month_forecast['LessonsScore'] = month_forecast.apply(
-                    lambda row: lessons_learned.get((row['MainGroup'], target_month), 0),
-                    axis=1
-                )
-                month_forecast['LessonsAdjustment'] = month_forecast['LessonsScore'] * 0.005
+            metrics.append(pd.DataFrame(self._yearly_metrics(context, self._forecast_grid(context, settings, executor), year)))
+        
+        return pd.concat([points, pd.concat(metrics, ignore_index=True)], axis=1)
+    
+    def _group_year_totals(self, context, grid, year, col):
+        """Senaryo ızgarasından bir yılın Ana Grup bazında toplamı (S × G) - gerçekleşen aylar dahil"""
+        
+        position, cells = self._actual_year_cells(year)
+        hist_totals = (self.cube[col][position] * cells).sum(axis=0) if position is not None else 0
+        
+        in_year = context['years'] == year
+        forecast_totals = (grid[col][:, in_year] * grid['present'][:, in_year]).sum(axis=1)
+        
+        # Yaprak seriler → Ana Grup (yapraklar Ana Gruba göre sıralı, bloklar ardışık)
+        return np.add.reduceat(forecast_totals + hist_totals, context['group_starts'], axis=-1)
+    
+    @_profiled('solve_growth_target')
+    def solve_growth_target(self, target, metric='Total_Sales', year=None, num_months=15,
+                            zero_mask=None, bounds=(-0.9, 5.0), tol=1e-6, max_iter=100,
+                            **forecast_params):
+        """
+        Hedef arama - bütçe rakamını tutturan büyüme hedefini bul (bisection)
+        
+        Büyüme hedefleri kombine hedefe doğrusal girdiği için parametreler bir kez derlenir,
+        her iterasyonda yalnızca kombine hedef ızgarası kaydırılıp tahmin çekirdeği çalışır.
+        
+        Parameters:
+        -----------
+        target: float - Toplam hedef → tüm aylar için tek (uniform) ay hedefi bulunur
+                Dict {maingroup: toplam} - Grup hedefleri → her grup için ana grup hedefi bulunur
+        metric: 'Total_Sales' veya 'Total_GrossProfit'
+        year: Hedefin ait olduğu yıl (varsayılan: last_actual_year + 1)
+        zero_mask: (G × 12) bool - * ile sıfırlanan hücreler
+        bounds: Büyüme hedefi arama aralığı (örn: -0.9 = -%90, 5.0 = +%500)
+        tol: Göreli tolerans
+        **forecast_params: Diğer forecast_future_months parametreleri (sabit)
+        
+        Returns:
+        --------
+        Dict: 'growth_target' (uniform) veya 'growth_targets' {maingroup: hedef},
+              'achieved', 'target', 'iterations', 'converged'
+        """
+        
+        columns = {'Total_Sales': 'Sales', 'Total_GrossProfit': 'GrossProfit'}
+        if metric not in columns:
+            raise ValueError(f"Desteklenmeyen metrik: {metric}")
+        if year is None:
+            year = self.last_actual_year + 1
+        
+        context = self._forecast_context(num_months)
+        settings = self._compile_scenarios(context, [forecast_params], zero_mask)
+        groups = context['groups']
+        
+        by_group = isinstance(target, dict)
+        if by_group:
+            solve_idx = pd.Index(groups).get_indexer(list(target.keys()))
+            if (solve_idx < 0).any():
+                missing = [g for g, i in zip(target.keys(), solve_idx) if i < 0]
+                raise ValueError(f"Bilinmeyen ana grup: {', '.join(map(str, missing))}")
+            targets = np.array(list(target.values()), dtype=float)
+            current = settings['group_targets'][0, solve_idx]
+        else:
+            targets = np.array([target], dtype=float)
+            current = settings['monthly_targets'][0, context['m_idx']]
+        
+        def evaluate(values):
+            # Hedef değişimi kombine hedefe yarı ağırlıkla girer: (Ay + Grup) / 2
+            shifted = dict(settings)
+            if by_group:
+                delta = np.zeros(len(groups))
+                delta[solve_idx] = values - current
+                shifted['combined_target'] = settings['combined_target'] + delta[None, None, context['leaf_group']] / 2
             else:
-                month_forecast['LessonsAdjustment'] = 0
-            
-            # *** STOK SAĞLIK FAKTÖRÜNÜ EKLE ***
-            month_forecast['StockHealthFactor'] = month_forecast['MainGroup'].map(stock_health_factors)
-            month_forecast['StockHealthFactor'] = month_forecast['StockHealthFactor'].fillna(1.0)
-            
-            # Kombine büyüme hedefi - ORTALAMA (eski mantık)
-            month_forecast['CombinedGrowthTarget'] = (
-                (month_forecast['MonthlyGrowthTarget'] + month_forecast['MainGroupGrowthTarget']) / 2 +
-                month_forecast['LessonsAdjustment']
-            )
-            
-            # Fiyat değişimini hesapla
-            month_forecast['PriceChange'] = month_forecast.apply(
-                lambda row: price_change_matrix.get((row['MainGroup'], target_month), inflation_rate) 
-                if price_change_matrix else inflation_rate,
-                axis=1
-            )
-            
-            # 2026 Birim Fiyat = 2025 Fiyat × (1 + Fiyat Değişimi)
-            month_forecast['UnitPrice'] = month_forecast['UnitPrice'] * (1 + month_forecast['PriceChange'])
-            
-            # Zaman faktörü (uzak gelecek daha konservatif)
-            time_discount = 1.0 - (i * 0.01)
-            time_discount = max(time_discount, 0.85)
-            
-            # SATIŞ TAHMİNİ - PARAMETRİK ORGANİK BÜYÜME
-            month_forecast['Sales'] = (
-                month_forecast['Sales'] *
-                (1 + organic_growth * organic_growth_rate) *  # Organik büyüme parametrik
-                (1 + month_forecast['CombinedGrowthTarget']) *  # Ay+Ana Grup ORTALAMA
-                (0.8 + month_forecast['SeasonalityIndex'] * 0.2) *
-                month_forecast['StockHealthFactor'] *
-                time_discount  # Zaman faktörü
-            )
-            
-            # ADET TAHMİNİ = Ciro / Birim Fiyat
-            month_forecast['Quantity'] = np.where(
-                month_forecast['UnitPrice'] > 0,
-                month_forecast['Sales'] / month_forecast['UnitPrice'],
-                0
-            )
-            
-            # Marj iyileştirme
-            month_forecast['GrossMargin%'] = (month_forecast['GrossMargin%'] + margin_improvement).clip(0, 1)
-            month_forecast['GrossProfit'] = month_forecast['Sales'] * month_forecast['GrossMargin%']
-            month_forecast['COGS'] = month_forecast['Sales'] - month_forecast['GrossProfit']
-            
-            # Stok
-            month_forecast['Stock'] = month_forecast['Stock'] * (1 + stock_change_pct)
-            month_forecast['Stock_COGS_Ratio'] = np.where(
-                month_forecast['COGS'] > 0,
-                month_forecast['Stock'] / month_forecast['COGS'],
-                0
-            )
-            
-            # Gereksiz kolonları temizle
-            month_forecast = month_forecast[['Year', 'Month', 'MainGroup', 'Quantity', 'UnitPrice',
-                                            'Sales', 'GrossProfit', 'GrossMargin%', 'Stock', 'COGS', 
-                                            'Stock_COGS_Ratio']]
+                shifted['combined_target'] = settings['combined_target'] + ((values[0] - current) / 2)[None, :, None]
             
-            forecast_data.append(month_forecast)
+            totals = self._group_year_totals(context, self._forecast_grid(context, shifted), year, columns[metric])[0]
+            return totals[solve_idx] if by_group else np.array([totals.sum()])
+        
+        lo = np.full(len(targets), bounds[0], dtype=float)
+        hi = np.full(len(targets), bounds[1], dtype=float)
+        f_lo = evaluate(lo)
+        f_hi = evaluate(hi)
+        bracketed = (f_lo <= targets) & (targets <= f_hi)
+        
+        # Aralık dışındaki hedefler en yakın sınıra sabitlenir
+        solution = np.where(targets < f_lo, lo, hi)
+        achieved = np.where(targets < f_lo, f_lo, f_hi)
+        
+        iterations = 0
+        active = bracketed.copy()
+        while active.any() and iterations < max_iter:
+            iterations += 1
+            mid = (lo + hi) / 2
+            f_mid = evaluate(mid)
+            below = f_mid < targets
+            lo = np.where(active & below, mid, lo)
+            hi = np.where(active & ~below, mid, hi)
+            solution = np.where(active, mid, solution)
+            achieved = np.where(active, f_mid, achieved)
+            active &= np.abs(f_mid - targets) > tol * np.maximum(np.abs(targets), 1.0)
+        
+        converged = bracketed & ~active
+        
+        if by_group:
+            return {
+                'growth_targets': dict(zip(groups[solve_idx], solution)),
+                'achieved': dict(zip(groups[solve_idx], achieved)),
+                'target': dict(target),
+                'iterations': iterations,
+                'converged': bool(converged.all())
+            }
+        
+        return {
+            'growth_target': float(solution[0]),
+            'achieved': float(achieved[0]),
+            'target': float(targets[0]),
+            'iterations': iterations,
+            'converged': bool(converged[0])
+        }
+    
+    @_profiled('simulate_forecast')
+    def simulate_forecast(self, n_draws=10000, num_months=15, growth_sigma=0.03, price_sigma=0.03,
+                          seasonality_sigma=0.05, organic_sigma=0.25, zero_mask=None, seed=None,
+                          batch_size=1000, executor=None, **forecast_params):
+        """
+        Monte Carlo belirsizlik modu - parametre pertürbasyonlarıyla N tahmin yolu
+        
+        Her çekilişte büyüme hedefi (ay bazında ortak şok), fiyat değişimi (Ana Grup bazında),
+        mevsimsellik indeksi (hücre bazında, çarpımsal) ve organik büyüme (göreli) bozulur.
+        Çekilişler senaryo ekseninde batch_size'lık parçalar halinde hesaplanır.
+        
+        Parameters:
+        -----------
+        n_draws: Simülasyon yolu sayısı
+        growth_sigma: Büyüme hedefi şokunun std. sapması (puan, örn: 0.03 = ±3 puan)
+        price_sigma: Fiyat değişimi şokunun std. sapması (puan)
+        seasonality_sigma: Mevsimsellik indeksinin göreli std. sapması
+        organic_sigma: Organik büyümenin göreli std. sapması
+        zero_mask: (G × 12) bool - * ile sıfırlanan hücreler (son gerçekleşen yıldan sonraki yıllarda sıfırlanır)
+        seed: Rastgele sayı üreteci tohumu
+        batch_size: Bir seferde hesaplanan çekiliş sayısı (bellek sınırı)
+        executor: parallel_forecast.ForecastExecutor - her parti seri bölümlerinde paralel hesaplanır
+        **forecast_params: forecast_future_months parametreleri
+        
+        Returns:
+        --------
+        Dict: 'by_group' (Yıl, Ay, Ana Grup), 'by_month' (Yıl, Ay) ve 'by_year' tabloları;
+              Sales / GrossProfit için P10 / P50 / P90 kolonları
+        """
+        
+        rng = np.random.default_rng(seed)
+        context = self._forecast_context(num_months)
+        # * sıfırlamaları: son gerçekleşen yıldan sonraki tahmin ayları (tüm çekilişlerde ortak)
+        base_settings = self._compile_scenarios(context, [forecast_params], zero_mask)
+        num_groups = len(context['groups'])
+        num_series = len(context['leaf_group'])
+        starts = context['group_starts']
+        
+        # Çekilişler Ana Grup bazında saklanır (yaprak seriler toplanır)
+        sales = np.empty((n_draws, num_months, num_groups))
+        gross_profit = np.empty((n_draws, num_months, num_groups))
+        present = np.zeros((num_months, num_groups), dtype=bool)
+        
+        for start in range(0, n_draws, batch_size):
+            n = min(batch_size, n_draws - start)
+            settings = {
+                'organic_factor': 1 + (base_settings['organic_factor'] - 1) * (1 + rng.normal(0, organic_sigma, n)),
+                'margin_improvement': np.repeat(base_settings['margin_improvement'], n),
+                'stock_change_pct': np.repeat(base_settings['stock_change_pct'], n),
+                'combined_target': base_settings['combined_target'] + rng.normal(0, growth_sigma, (n, num_months, 1)),
+                'price_multiplier': (base_settings['price_multiplier'] +
+                                     rng.normal(0, price_sigma, (n, 1, num_groups))[..., context['leaf_group']]),
+                'seasonality': context['seasonality'][None] * (1 + rng.normal(0, seasonality_sigma, (n, num_months, num_series))),
+                'keep': base_settings['keep']
+            }
+            grid = self._forecast_grid(context, settings, executor)
+            sales[start:start + n] = np.add.reduceat(grid['Sales'], starts, axis=2)
+            gross_profit[start:start + n] = np.add.reduceat(grid['GrossProfit'], starts, axis=2)
+            present |= np.logical_or.reduceat(grid['present'].any(axis=0), starts, axis=1)
+        
+        quantiles = [10, 50, 90]
+        
+        def bands(values, frame):
+            for name, metric in (('Sales', values[0]), ('GrossProfit', values[1])):
+                p10, p50, p90 = np.percentile(metric, quantiles, axis=0)
+                frame[f'{name}_P10'] = p10
+                frame[f'{name}_P50'] = p50
+                frame[f'{name}_P90'] = p90
+            return frame
+        
+        # Grup bazında bantlar
+        h_idx, g_idx = np.nonzero(present)
+        by_group = bands(
+            (sales[:, h_idx, g_idx], gross_profit[:, h_idx, g_idx]),
+            pd.DataFrame({
+                'Year': context['years'][h_idx],
+                'Month': context['months'][h_idx],
+                'MainGroup': context['groups'][g_idx]
+            })
+        )
+        
+        # Ay toplamı bantları (çekiliş başına toplam, sonra yüzdelik)
+        by_month = bands(
+            (sales.sum(axis=2), gross_profit.sum(axis=2)),
+            pd.DataFrame({'Year': context['years'], 'Month': context['months']})
+        )
+        
+        # Yıl toplamı bantları
+        forecast_years = np.unique(context['years'])
+        year_onehot = (context['years'][:, None] == forecast_years[None, :]).astype(float)
+        by_year = bands(
+            (sales.sum(axis=2) @ year_onehot, gross_profit.sum(axis=2) @ year_onehot),
+            pd.DataFrame({'Year': forecast_years})
+        )
+        
+        return {
+            'n_draws': n_draws,
+            'by_group': by_group,
+            'by_month': by_month,
+            'by_year': by_year
+        }
+    
+    @staticmethod
+    @_profiled('scenario_frame')
+    def scenario_frame(cube, scenario=0):
+        """Senaryo küpünden bir senaryoyu uzun formatlı tahmin tablosuna çevir"""
+        
+        if not isinstance(scenario, (int, np.integer)):
+            scenario = cube['names'].index(scenario)
+        
+        # Izgarayı uzun formata çevir (sadece var olan satırlar)
+        return _long_frame(cube['years'], cube['months'], cube['leaves'], cube['present'][scenario],
+                           {col: cube[col][scenario] for col in HISTORY_METRICS})
+    
+    @_profiled('forecast_future_months')
+    def forecast_future_months(self, num_months=15, growth_param=0.1, margin_improvement=0.0, 
+                              stock_change_pct=0.0, monthly_growth_targets=None, 
+                              maingroup_growth_targets=None, lessons_learned=None,
+                              inflation_adjustment=1.0, organic_multiplier=0.5,
+                              price_change_matrix=None, inflation_rate=0.25, organic_growth_rate=0.15,
+                              parameters=None, executor=None, zero_mask=None):
+        """
+        Son gerçekleşen aydan itibaren belirtilen sayıda ay tahmin et
         
-        # Tüm tahminleri birleştir
-        all_forecasts = pd.concat(forecast_data, ignore_index=True)
+        Tüm ufuk × Ana Grup ızgarası NumPy dizileri üzerinde hesaplanır
+        (tek senaryolu forecast_scenarios).
         
-        return all_forecasts
+        Parameters:
+        -----------
+        num_months: Kaç ay ileriye tahmin yapılacak (varsayılan 15)
+        growth_param: Genel büyüme hedefi
+        margin_improvement: Brüt marj iyileşme hedefi
+        stock_change_pct: Stok tutar değişim yüzdesi
+        monthly_growth_targets: Dict {month: growth_rate} - Her ay için özel hedef
+        maingroup_growth_targets: Dict {maingroup: growth_rate} - Her ana grup için özel hedef
+        lessons_learned: Dict {(maingroup, month): score} - Alınan dersler (-10 ile +10 arası)
+        inflation_adjustment: Enflasyon düzeltme faktörü (örn: 25/35 = 0.71)
+        organic_multiplier: Organik büyüme çarpanı (0.0=Çekimser, 0.5=Normal, 1.0=İyimser)
+        price_change_matrix: Dict {(maingroup, month): price_change_pct} - Fiyat değişim matrisi
+        inflation_rate: Enflasyon oranı (default fiyat artışı için, örn: 0.25 = %25)
+        organic_growth_rate: Organik büyüme oranı (örn: 0.15 = %15) - Yeni parametre
+        parameters: ForecastParameters - verilirse growth_param, monthly/maingroup hedefleri,
+                    lessons_learned, price_change_matrix ve inflation_rate yerine kullanılır
+        executor: parallel_forecast.ForecastExecutor - seri / thread / process yürütme
+        zero_mask: (Ana Grup × 12) bool - * ile sıfırlanan (grup, ay) hücreleri
+                   (bkz. zero_reset_mask); son gerçekleşen yıldan sonraki tahmin yıllarında
+                   ZERO_RESET_COLUMNS tek bir vektörel çarpımla 0 olur
+        """
+        
+        cube = self.forecast_scenarios([{
+            'growth_param': growth_param,
+            'margin_improvement': margin_improvement,
+            'stock_change_pct': stock_change_pct,
+            'monthly_growth_targets': monthly_growth_targets,
+            'maingroup_growth_targets': maingroup_growth_targets,
+            'lessons_learned': lessons_learned,
+            'inflation_adjustment': inflation_adjustment,
+            'organic_multiplier': organic_multiplier,
+            'price_change_matrix': price_change_matrix,
+            'inflation_rate': inflation_rate,
+            'organic_growth_rate': organic_growth_rate,
+            'parameters': parameters
+        }], num_months=num_months, executor=executor, zero_mask=zero_mask)
+        
+        return self.scenario_frame(cube, 0)
     
+    @_profiled('get_full_data_with_forecast')
     def get_full_data_with_forecast(self, num_months=15, growth_param=0.1, margin_improvement=0.0, 
                                     stock_change_pct=0.0, monthly_growth_targets=None, 
                                     maingroup_growth_targets=None, lessons_learned=None,
                                     inflation_adjustment=1.0, organic_multiplier=0.5,
-                                    price_change_matrix=None, inflation_rate=0.25, organic_growth_rate=0.15):
+                                    price_change_matrix=None, inflation_rate=0.25, organic_growth_rate=0.15,
+                                    parameters=None, executor=None, zero_mask=None):
         """Gerçekleşen veri + gelecek tahminlerini birleştir"""
         
         # Gelecek tahminini yap
@@ -498,70 +2191,93 @@ class BudgetForecaster:
             organic_multiplier=organic_multiplier,
             price_change_matrix=price_change_matrix,
             inflation_rate=inflation_rate,
-            organic_growth_rate=organic_growth_rate
+            organic_growth_rate=organic_growth_rate,
+            parameters=parameters,
+            executor=executor,
+            zero_mask=zero_mask
         )
         
-        # Gerçekleşen veriyi düzenle - TAHMİN EDİLEN AYLARI ÇIKAR
-        historical = self.data[['Year', 'Month', 'MainGroup', 'Quantity', 'UnitPrice',
-                               'Sales', 'GrossProfit', 'GrossMargin%', 'Stock', 'COGS', 
-                               'Stock_COGS_Ratio']].copy()
+        return self.combine_with_history(forecast)
+    
+    @_profiled('combine_with_history')
+    def combine_with_history(self, forecast):
+        """Gerçekleşen veri (son gerçekleşen aya kadar) + verilen tahmin tablosunu birleştir"""
         
-        # Sadece gerçek veriyi al (son gerçekleşen aya kadar)
-        historical = historical[
-            (historical['Year'] < self.last_actual_year) |
-            ((historical['Year'] == self.last_actual_year) & (historical['Month'] <= self.last_actual_month))
-        ]
+        # Sadece gerçek veriyi al (son gerçekleşen aya kadar) - TAHMİN EDİLEN AYLAR HARİÇ
+        historical = self.cube.to_frame(until=(self.last_actual_year, self.last_actual_month))
         
         # Birleştir
         full_data = pd.concat([historical, forecast], ignore_index=True)
         
         return full_data
     
-    def get_summary_stats(self, data):
-        """Özet istatistikler - Haftalık normalize edilmiş stok/SMM oranı dahil"""
+    @_profiled('get_summary_stats')
+    def get_summary_stats(self, data, group_level=None, quarterly=False):
+        """
+        Özet istatistikler - Haftalık normalize edilmiş stok/SMM oranı dahil
         
-        summary = {}
+        Veri tek bir (Yıl, Ay[, Grup]) gruplamasıyla toplanır; yıllık metrikler ve
+        istenirse grup / çeyrek özetleri bu küçük tablodan türetilir.
         
-        # Tüm yılları al
-        years = sorted(data['Year'].unique())
+        Parameters:
+        -----------
+        data: Yıl / Ay / metrik kolonlu detay veri (ör. get_full_data_with_forecast)
+        group_level: Verilirse bu kolon (ör. 'MainGroup') için Yıl × Grup özeti
+        quarterly: True ise Yıl × Çeyrek özeti
+        
+        Returns:
+        --------
+        Dict: Yıl → metrikler. group_level veya quarterly verilirse
+              (özet, {'groups': DataFrame, 'quarters': DataFrame}) tuple'ı
+        """
         
-        for year in years:
-            year_data = data[data['Year'] == year].copy()
-            
-            # Yıllık Stok/SMM hesapla
-            # Önce her ay için toplam stok ve SMM hesapla
-            monthly_totals = year_data.groupby('Month').agg({
-                'Stock': 'sum',
-                'COGS': 'sum'
-            }).reset_index()
-            
-            # Ortalama aylık stok ve toplam yıllık SMM
-            avg_monthly_stock = monthly_totals['Stock'].mean()
-            total_yearly_cogs = monthly_totals['COGS'].sum()
-            
-            # Haftalık oran: Ort. Aylık Stok / (Toplam Yıllık SMM / 52)
-            stock_cogs_weekly = (avg_monthly_stock / (total_yearly_cogs / 52)) if total_yearly_cogs > 0 else 0
-            
+        keys = ['Year', 'Month'] + ([group_level] if group_level else [])
+        columns = ['Sales', 'GrossProfit', 'Stock', 'COGS', 'Stock_COGS_Ratio']
+        
+        # Tek geçiş: toplam ve dolu satır sayısı (ortalamalar NaN'ları atlar)
+        totals = data.groupby(keys, sort=True)[columns].agg(['sum', 'count'])
+        monthly = totals.groupby(level=['Year', 'Month']).sum() if group_level else totals
+        
+        summary = {}
+        for year, row in _period_summary(monthly, ['Year'], weeks=52).iterrows():
             summary[year] = {
-                'Total_Sales': year_data['Sales'].sum(),
-                'Total_GrossProfit': year_data['GrossProfit'].sum(),
-                'Avg_GrossMargin%': (year_data['GrossProfit'].sum() / year_data['Sales'].sum() * 100) if year_data['Sales'].sum() > 0 else 0,
-                'Avg_Stock': year_data['Stock'].mean(),
-                'Avg_Stock_COGS_Ratio': year_data['Stock_COGS_Ratio'].mean(),
-                'Avg_Stock_COGS_Weekly': stock_cogs_weekly
+                'Total_Sales': row['Total_Sales'],
+                'Total_GrossProfit': row['Total_GrossProfit'],
+                'Avg_GrossMargin%': row['Avg_GrossMargin%'],
+                'Avg_Stock': row['Avg_Stock'],
+                'Avg_Stock_COGS_Ratio': row['Avg_Stock_COGS_Ratio'],
+                'Avg_Stock_COGS_Weekly': row['Avg_Stock_COGS_Weekly']
             }
         
-        return summary
+        if not group_level and not quarterly:
+            return summary
+        
+        breakdowns = {}
+        if group_level:
+            breakdowns['groups'] = _period_summary(totals, ['Year', group_level], weeks=52).reset_index()
+        if quarterly:
+            quarters = monthly.assign(Quarter=(monthly.index.get_level_values('Month') - 1) // 3 + 1)
+            quarters = quarters.set_index('Quarter', append=True)
+            breakdowns['quarters'] = _period_summary(quarters, ['Year', 'Quarter'], weeks=13).reset_index()
+        return summary, breakdowns
     
-    def get_forecast_quality_metrics(self, data):
-        """Forecast kalite metriklerini hesapla"""
+    @_profiled('get_forecast_quality_metrics')
+    def get_forecast_quality_metrics(self, data, years=None):
+        """
+        Forecast kalite metriklerini hesapla
+        
+        years: Karşılaştırılan (önceki, son) gerçekleşen yıl - varsayılan
+               (last_actual_year - 1, last_actual_year)
+        """
+        
+        prev_year, last_year = years or (self.last_actual_year - 1, self.last_actual_year)
         
-        # 2024 ve 2025 verilerini al
-        data_2024 = data[data['Year'] == 2024].groupby('Month')['Sales'].sum().reset_index()
-        data_2025 = data[data['Year'] == 2025].groupby('Month')['Sales'].sum().reset_index()
+        # Önceki ve son gerçekleşen yılın verilerini al
+        prev_data = data[data['Year'] == prev_year].groupby('Month')['Sales'].sum().reset_index()
+        last_data = data[data['Year'] == last_year].groupby('Month')['Sales'].sum().reset_index()
         
         # Ortak ayları bul
-        common_months = set(data_2024['Month']) & set(data_2025['Month'])
+        common_months = set(prev_data['Month']) & set(last_data['Month'])
         
         if len(common_months) < 3:
             return {
@@ -569,22 +2285,23 @@ class BudgetForecaster:
                 'mape': None,
                 'trend_consistency': None,
                 'confidence_level': 'Düşük',
-                'avg_growth_2024_2025': None
+                'avg_growth': None,
+                'years': (prev_year, last_year)
             }
         
         # Ortak aylara göre filtrele
-        sales_2024 = data_2024[data_2024['Month'].isin(common_months)].sort_values('Month')['Sales'].values
-        sales_2025 = data_2025[data_2025['Month'].isin(common_months)].sort_values('Month')['Sales'].values
+        prev_sales = prev_data[prev_data['Month'].isin(common_months)].sort_values('Month')['Sales'].values
+        last_sales = last_data[last_data['Month'].isin(common_months)].sort_values('Month')['Sales'].values
         
         # Büyüme oranları
-        growth_rates = (sales_2025 - sales_2024) / sales_2024
+        growth_rates = (last_sales - prev_sales) / prev_sales
         
         # Tutarlılık
         trend_consistency = 1 - min(np.std(growth_rates), 1.0)
         
         # R²
-        if len(sales_2024) > 1:
-            correlation = np.corrcoef(sales_2024, sales_2025)[0, 1]
+        if len(prev_sales) > 1:
+            correlation = np.corrcoef(prev_sales, last_sales)[0, 1]
             r2_score = correlation ** 2
         else:
             r2_score = 0.5
@@ -605,5 +2322,370 @@ class BudgetForecaster:
             'mape': mape,
             'trend_consistency': trend_consistency,
             'confidence_level': confidence,
-            'avg_growth_2024_2025': np.mean(growth_rates) * 100
+            'avg_growth': np.mean(growth_rates) * 100,
+            'years': (prev_year, last_year)
         }
+
+
+class IncrementalForecast:
+    """
+    Son tahmin sonucunu ve ara faktörlerini tutan tahmin oturumu
+    
+    Parametre değişikliğinde (örn: Alınan Dersler / Fiyat Değişimi tablosunda tek hücre)
+    sadece etkilenen Ana Grupların serileri yeniden hesaplanır; yıllık özetler (Yıl × Ay)
+    toplamlarına fark (delta) eklenerek güncellenir. Hiyerarşi seviyelerine toplanmış
+    tablolar (rollup) istendiğinde bir kez üretilir ve sonraki güncellemeye kadar
+    saklanır. Paylaşılan forecaster salt-okunur olduğundan bu durum forecaster'da
+    değil, her oturumun kendi nesnesinde tutulur.
+    
+    Parameters:
+    -----------
+    forecaster: BudgetForecaster
+    param_sets: List[Dict] - forecast_scenarios ile aynı senaryo parametre setleri
+    num_months: Kaç ay ileriye tahmin yapılacak
+    zero_mask: (Grup × 12) bool - * ile sıfırlanan hücreler (son gerçekleşen yıldan sonrası)
+    executor: parallel_forecast.ForecastExecutor - tam yeniden hesaplamalarda kullanılır
+    """
+    
+    TOTAL_COLUMNS = ['Sales', 'GrossProfit', 'Stock', 'COGS', 'Stock_COGS_Ratio', 'Rows']
+    
+    @_profiled('incremental_forecast')
+    def __init__(self, forecaster, param_sets, num_months=15, zero_mask=None, executor=None):
+        self.forecaster = forecaster
+        self.num_months = num_months
+        self.executor = executor
+        self.context = forecaster._forecast_context(num_months)
+        
+        # Gerçekleşen kısım (son gerçekleşen aya kadar) - parametreden bağımsız
+        cube = forecaster.cube
+        cells = cube.present & cube.actual_months(forecaster.last_actual_year, forecaster.last_actual_month)[..., None]
+        self.years = np.union1d(cube.years[cells.any(axis=(1, 2))], self.context['years'])
+        
+        self.history_totals = np.zeros((len(self.years), 12, len(self.TOTAL_COLUMNS)))
+        positions = np.searchsorted(self.years, cube.years)
+        found = np.isin(cube.years, self.years)
+        for k, col in enumerate(self.TOTAL_COLUMNS[:-1]):
+            self.history_totals[positions[found], :, k] = (cube[col] * cells).sum(axis=2)[found]
+        self.history_totals[positions[found], :, -1] = cells.sum(axis=2)[found]
+        
+        # Ufuk adımlarının (Yıl, Ay) konumu
+        self.step_years = np.searchsorted(self.years, self.context['years'])
+        
+        self._rebuild(forecaster._compile_scenarios(self.context, param_sets, zero_mask))
+    
+    @_profiled('incremental_rebuild')
+    def _rebuild(self, settings):
+        """Tüm ızgarayı baştan hesapla"""
+        self.settings = settings
+        self.grid = self.forecaster._forecast_grid(self.context, settings, self.executor)
+        self.step_totals = self._step_totals(slice(None))
+        self._rollups = {}
+    
+    def _step_totals(self, cols):
+        """Verilen seri kolonlarının ufuk adımı bazında toplamları (Senaryo × Ay × kolon)"""
+        present = self.grid['present'][:, :, cols]
+        
+        totals = [(self.grid[col][:, :, cols] * present).sum(axis=2) for col in self.TOTAL_COLUMNS[:4]]
+        totals.append((self.grid['Stock_COGS_Ratio'][:, :, cols] * present).sum(axis=2))
+        totals.append(present.sum(axis=2).astype(float))
+        return np.stack(totals, axis=-1)
+    
+    @staticmethod
+    def _slice_series(context, cols):
+        """Context'i verilen seri kolonlarına indir (toplam bazlı alanlar olduğu gibi kalır)"""
+        sliced = dict(context)
+        sliced['leaf_group'] = context['leaf_group'][cols]
+        sliced['leaves'] = context['leaves'].iloc[cols]
+        sliced['base'] = {col: values[cols] for col, values in context['base'].items()}
+        sliced['prev'] = {col: values[:, cols] for col, values in context['prev'].items()}
+        for key in ('base_present', 'stock_health'):
+            sliced[key] = context[key][cols]
+        for key in ('seasonality', 'prev_present'):
+            sliced[key] = context[key][:, cols]
+        return sliced
+    
+    @_profiled('incremental_update')
+    def update(self, param_sets, zero_mask=None):
+        """
+        Yeni parametrelerle sonucu güncelle
+        
+        Sadece kombine hedefi, fiyat çarpanı veya sıfırlaması değişen Ana Gruplar yeniden
+        hesaplanır. Senaryo yapısı ya da tüm grupları etkileyen parametreler (marj, stok,
+        organik büyüme) değiştiyse veya değişiklik kaynak seçimini (12 ay önceki tahmin
+        toplamı eşiği) etkilediyse tüm ızgara baştan hesaplanır.
+        
+        Returns:
+        --------
+        np.ndarray: Yeniden hesaplanan / özeti güncellenen Ana Gruplar
+        """
+        forecaster = self.forecaster
+        context = self.context
+        groups = context['groups']
+        settings = forecaster._compile_scenarios(context, param_sets, zero_mask)
+        
+        scalar_keys = ('organic_factor', 'margin_improvement', 'stock_change_pct')
+        if (settings['names'] != self.settings['names'] or
+                any(not np.array_equal(settings[key], self.settings[key]) for key in scalar_keys)):
+            self._rebuild(settings)
+            return groups
+        
+        # Değişen Ana Gruplar (sıfırlaması değişenler dahil - sıfırlama ızgarada uygulanır)
+        changed = (settings['keep'] != self.settings['keep']).any(axis=0)
+        for key in ('combined_target', 'price_multiplier'):
+            changed |= (settings[key] != self.settings[key]).any(axis=(0, 1))
+        touched = np.flatnonzero(changed)
+        
+        self.settings = settings
+        self._rollups = {}
+        if len(touched) == 0:
+            return groups[:0]
+        
+        before = self._step_totals(touched)
+        
+        sub_grid = forecaster._forecast_grid(self._slice_series(context, touched), {
+            **settings,
+            'combined_target': settings['combined_target'][:, :, touched],
+            'price_multiplier': settings['price_multiplier'][:, :, touched],
+            'keep': settings['keep'][:, touched],
+            'sources': self.grid['sources']
+        })
+        for key in HISTORY_METRICS + ['present']:
+            self.grid[key][:, :, touched] = sub_grid[key]
+        
+        # Kaynak seçimi 12 ay önceki tahmin toplamına bağlı - değiştiyse tam hesap
+        for start in range(12, self.num_months, 12):
+            block = slice(start, min(start + 12, self.num_months))
+            selected = forecaster._select_sources(context, block, self.grid['present'], self.grid['Sales'])
+            for key, values in zip(('use_data', 'use_fc', 'special'), selected):
+                if not np.array_equal(values, self.grid['sources'][key][:, block]):
+                    self._rebuild(settings)
+                    return groups
+        
+        self.step_totals += self._step_totals(touched) - before
+        return groups[np.unique(context['leaf_group'][touched])]
+    
+    def _scenario_index(self, scenario):
+        if not isinstance(scenario, (int, np.integer)):
+            scenario = self.settings['names'].index(scenario)
+        return scenario
+    
+    @property
+    def cube(self):
+        """forecast_scenarios formatında senaryo küpü"""
+        return {
+            **self.grid,
+            'names': self.settings['names'],
+            'years': self.context['years'],
+            'months': self.context['months'],
+            'groups': self.context['groups'],
+            'leaves': self.context['leaves']
+        }
+    
+    def totals(self, scenario=0):
+        """Gerçekleşen + tahmin (Yıl × Ay) toplamları: Dict[kolon → (Y × 12)]"""
+        totals = self.history_totals.copy()
+        totals[self.step_years, self.context['m_idx']] += self.step_totals[self._scenario_index(scenario)]
+        return {col: totals[..., k] for k, col in enumerate(self.TOTAL_COLUMNS)}
+    
+    @_profiled('incremental_summary')
+    def summary(self, scenario=0):
+        """get_summary_stats(full_data(scenario)) ile aynı yıllık özet - toplamlardan"""
+        return _summary_from_totals(self.years, self.totals(scenario))
+    
+    def monthly_sales(self, scenario=0, year=None):
+        """Bir yılın (varsayılan: last_actual_year + 1) aylık toplam satışları (Ay indeksli Series)"""
+        if year is None:
+            year = self.forecaster.last_actual_year + 1
+        totals = self.totals(scenario)
+        y = np.searchsorted(self.years, year)
+        if y >= len(self.years) or self.years[y] != year:
+            return pd.Series(dtype=float, name='Sales')
+        
+        months = np.flatnonzero(totals['Rows'][y] > 0)
+        return pd.Series(totals['Sales'][y, months], index=pd.Index(months + 1, name='Month'), name='Sales')
+    
+    @_profiled('incremental_quality_metrics')
+    def quality_metrics(self, scenario=0):
+        """get_forecast_quality_metrics(full_data(scenario)) ile aynı - aylık toplamlardan"""
+        last_year = self.forecaster.last_actual_year
+        monthly = pd.concat([
+            self.monthly_sales(scenario, year).reset_index().assign(Year=year)
+            for year in self.years if last_year - 1 <= year <= last_year
+        ], ignore_index=True)
+        return self.forecaster.get_forecast_quality_metrics(monthly, years=(last_year - 1, last_year))
+    
+    @_profiled('incremental_full_data')
+    def full_data(self, scenario=0):
+        """Gerçekleşen veri + tahmin tablosu (* sıfırlaması ızgarada uygulanmış)"""
+        forecast = BudgetForecaster.scenario_frame(self.cube, self._scenario_index(scenario))
+        return self.forecaster.combine_with_history(forecast)
+    
+    @_profiled('incremental_rollup')
+    def rollup(self, level, scenario=0):
+        """
+        Gerçekleşen veri + tahmin tablosunun bir hiyerarşi seviyesine toplanmış hali
+        
+        Yaprak seviyedeki küp ve ızgara (* sıfırlaması uygulanmış) np.add.reduceat ile
+        toplanır; sonuç bir sonraki update'e kadar saklanır, böylece kırılımlar arasında
+        gezinmek yeniden hesaplama gerektirmez.
+        
+        level: Hiyerarşi seviyesi (örn: 'MainGroup', 'SubGroup')
+        """
+        scenario = self._scenario_index(scenario)
+        if (level, scenario) in self._rollups:
+            return self._rollups[(level, scenario)]
+        
+        forecaster = self.forecaster
+        keys, starts = forecaster.cube.level_blocks(level)
+        
+        # Tahmin kısmı (* sıfırlaması ızgarada uygulanmış)
+        present = self.grid['present'][scenario]
+        metrics = {col: self.grid[col][scenario] * present for col in HISTORY_METRICS}
+        metrics, present = _rollup_metrics(metrics, present, starts)
+        forecast = _long_frame(self.context['years'], self.context['months'], keys, present, metrics)
+        
+        historical = forecaster.cube.to_frame(until=(forecaster.last_actual_year, forecaster.last_actual_month),
+                                              level=level)
+        
+        frame = pd.concat([historical, forecast], ignore_index=True)
+        self._rollups[(level, scenario)] = frame
+        return frame
+
+
+def frame_content_hash(frame):
+    """
+    Tablonun içerik özeti (SHA-256) - kolonlar, tipler ve değerler
+    
+    Aynı tahmin sonucu için aynı anahtar: export dosyaları gibi sonuçtan türetilen
+    çıktıları önbelleklemek için
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(col), str(dtype)] for col, dtype in frame.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def write_excel_sheets(sheets, output):
+    """
+    Tabloları akışlı (write-only) Excel'e yaz - bellek kullanımı satır sayısından bağımsız
+    
+    Satırlar EXPORT_CHUNK_ROWS'luk parçalar halinde nesneye çevrilip doğrudan dosyaya
+    akıtılır; hücre nesneleri bellekte tutulmaz. NaN boş hücre, ±sonsuz 'inf' / '-inf'
+    olarak yazılır (pandas to_excel ile aynı).
+    
+    Parameters:
+    -----------
+    sheets: (sheet adı, DataFrame) çiftleri veya dict - tembel bir iterator da olabilir
+    output: Dosya yolu veya file-like obje
+    """
+    if isinstance(sheets, dict):
+        sheets = sheets.items()
+    
+    workbook = Workbook(write_only=True)
+    header_font = Font(bold=True)
+    for name, frame in sheets:
+        sheet = workbook.create_sheet(str(name))
+        
+        header = []
+        for col in frame.columns:
+            cell = WriteOnlyCell(sheet, value=str(col))
+            cell.font = header_font
+            header.append(cell)
+        sheet.append(header)
+        
+        for start in range(0, len(frame), EXPORT_CHUNK_ROWS):
+            chunk = frame.iloc[start:start + EXPORT_CHUNK_ROWS].replace([np.inf, -np.inf], ['inf', '-inf'])
+            for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+                sheet.append(row)
+    
+    workbook.save(output)
+
+
+@_profiled('excel_export')
+def write_detail_report(full_data, output, years=None):
+    """
+    Detay raporu Excel'i: her yıl için ayrı sheet + (Yıl × Ay) 'Özet' sheet'i
+    
+    Akışlı yazılır (write_excel_sheets) - yıl sheet'leri sırayla üretilir.
+    
+    Parameters:
+    -----------
+    full_data: Gerçekleşen + tahmin tablosu
+    output: Dosya yolu veya file-like obje
+    years: Rapordaki yıllar (varsayılan: veride olan tüm yıllar)
+    """
+    if years is None:
+        years = sorted(full_data['Year'].unique())
+    
+    # Özet: her (Yıl, Ay) için toplamlar - verisi olmayan aylar 0
+    index = pd.MultiIndex.from_product([years, range(1, 13)], names=['Yıl', 'Ay'])
+    summary_df = (
+        full_data.groupby(['Year', 'Month'])[['Sales', 'GrossProfit', 'Quantity']].sum()
+        .rename_axis(['Yıl', 'Ay'])
+        .reindex(index, fill_value=0)
+        .rename(columns={'Sales': 'Satış', 'GrossProfit': 'Brüt Kar', 'Quantity': 'Adet'})
+        .reset_index()
+    )
+    
+    # Her yıl için ayrı sheet - dilimler yazılırken üretilir
+    sheets = ((year, full_data[full_data['Year'] == year]) for year in years)
+    write_excel_sheets(itertools.chain(sheets, [('Özet', summary_df)]), output)
+
+
+@_profiled('monthly_performance')
+def build_monthly_performance(full_data, years=None):
+    """
+    Ay bazında performans raporu: her ayın yıl toplamına oranları, brüt marjı,
+    stok haftası ve son iki yılın büyüme oranları
+    
+    Tüm metrikler tek bir (Yıl, Ay) gruplamasından türetilir - maliyet gösterilen
+    yıl sayısından bağımsızdır. Verisi olmayan ay / yıllar 0 olarak raporlanır.
+    
+    Parameters:
+    -----------
+    full_data: Gerçekleşen + tahmin tablosu
+    years: Rapordaki yıllar (varsayılan: veride olan tüm yıllar)
+    
+    Returns:
+    --------
+    DataFrame: Ay, Ay Adı, '{yıl} Ciro' ... '{yıl} Stok Hft' kolon grupları ve
+               '26/25 Ciro Büyüme %' gibi büyüme kolonları (12 satır)
+    """
+    if years is None:
+        years = sorted(full_data['Year'].unique())
+    years = [int(year) for year in years]
+    
+    # (Yıl × Ay) toplamları → metrik başına (12 × Y) dizi
+    index = pd.MultiIndex.from_product([years, range(1, 13)], names=['Year', 'Month'])
+    pivot = (
+        full_data.groupby(['Year', 'Month'])[['Sales', 'Quantity', 'GrossProfit', 'COGS', 'Stock']].sum()
+        .reindex(index, fill_value=0)
+    )
+    totals = {col: pivot[col].to_numpy(dtype=float).reshape(len(years), 12).T for col in pivot.columns}
+    
+    sales, quantity, gross_profit = totals['Sales'], totals['Quantity'], totals['GrossProfit']
+    metrics = {
+        'Ciro': sales,
+        'Ciro %': _safe_div(sales, sales.sum(axis=0)) * 100,
+        'Adet': quantity,
+        'Adet %': _safe_div(quantity, quantity.sum(axis=0)) * 100,
+        'Kar': gross_profit,
+        'Kar %': _safe_div(gross_profit, gross_profit.sum(axis=0)) * 100,
+        'BM %': _safe_div(gross_profit, sales) * 100,
+        # Stok toplamı (ortalama değil) / SMM × ayın hafta sayısı
+        'Stok Hft': _safe_div(totals['Stock'], totals['COGS']) * WEEKS_IN_MONTH[:, None]
+    }
+    
+    report = pd.DataFrame({'Ay': range(1, 13), 'Ay Adı': MONTH_NAMES})
+    # Kolon düzeni: tüm yılların Ciro'ları yan yana, ardından Ciro %'leri ...
+    for name, values in metrics.items():
+        for y, year in enumerate(years):
+            report[f'{year} {name}'] = values[:, y]
+    
+    # Büyüme oranları: son yıl / önceki yıl
+    if len(years) >= 2:
+        label = f'{years[-1] % 100:02d}/{years[-2] % 100:02d}'
+        for name, values in (('Ciro', sales), ('Adet', quantity), ('Kar', gross_profit)):
+            report[f'{label} {name} Büyüme %'] = _safe_div(values[:, -1] - values[:, -2], values[:, -2]) * 100
+    
+    return report
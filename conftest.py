@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic_actuals
+from budget_forecast import BudgetForecaster, ParameterSet
+
+
+@pytest.fixture(scope='session')
+def forecaster():
+    # 12 seri, 2 yıl (son gerçekleşen: 2. yılın Ekim'i) - Excel okuma atlanır
+    return BudgetForecaster.from_frame(synthetic_actuals(12, years=2, seed=0)).freeze()
+
+
+@pytest.fixture(scope='session')
+def parameter_set(forecaster):
+    groups = list(forecaster.groups)
+    # Fiyat tablosunun boş hücreleri derlemede inflation_rate ile dolar
+    prices = pd.DataFrame({'Ana Grup': groups[:2], **{str(month): ['5', ''] for month in range(1, 13)}})
+    return ParameterSet.from_tables(
+        monthly_targets=pd.DataFrame({'Ay': [1, 3, 7], 'Hedef (%)': ['15', '*', '30']}),
+        maingroup_targets=pd.DataFrame({'Ana Grup': groups[:3], 'Hedef (%)': ['10', '25', '*']}),
+        lessons_learned=pd.DataFrame({'Ana Grup': groups[1:2], **{str(month): ['2'] for month in range(1, 13)}}),
+        price_changes=prices
+    )
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import time
+from io import BytesIO
+
+import pandas as pd
+
+from budget_forecast import BudgetForecaster
+
+# İşlenmiş veri formatı değişirse artır - eski önbellek dosyaları kullanılmaz
+# (3: eksik aylar her yılda doldurulur, son gerçekleşen aydan sonrası doldurulmaz;
+#  4: SubGroup / SKU hiyerarşi seviyeleri)
+CACHE_VERSION = 4
+
+
+class ParsedDataCache:
+    """
+    Yüklenen Excel dosyaları için içerik hash'i ile anahtarlanmış disk önbelleği
+    
+    BudgetForecaster.data Parquet olarak, son gerçekleşen dönem JSON sidecar
+    olarak saklanır. Aynı dosya tekrar yüklendiğinde (veya sunucu yeniden
+    başladığında) Excel okuma ve işleme tamamen atlanır. Toplam boyut
+    max_bytes'ı aşarsa en uzun süredir kullanılmayan girdiler silinir (LRU).
+    """
+    
+    def __init__(self, cache_dir='.budget_cache', max_bytes=500 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+    
+    @staticmethod
+    def content_hash(file_bytes):
+        """Dosya içeriğinin SHA-256 özeti"""
+        return hashlib.sha256(file_bytes).hexdigest()
+    
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return f'{base}.parquet', f'{base}.json'
+    
+    def load(self, key):
+        """Önbellekten forecaster yükle - yoksa None"""
+        data_path, meta_path = self._paths(key)
+        if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+            return None
+        
+        try:
+            start = time.perf_counter()
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') != CACHE_VERSION:
+                return None
+            
+            forecaster = BudgetForecaster.from_data(
+                pd.read_parquet(data_path),
+                meta['last_actual_year'],
+                meta['last_actual_month']
+            )
+            forecaster.load_timings['cache_load'] = time.perf_counter() - start
+        except Exception as e:
+            print(f"⚠️ Önbellek okunamadı ({key[:12]}): {e}")
+            return None
+        
+        # LRU: son kullanım zamanını güncelle
+        now = time.time()
+        os.utime(data_path, (now, now))
+        os.utime(meta_path, (now, now))
+        
+        return forecaster
+    
+    def store(self, key, forecaster):
+        """Forecaster'ın işlenmiş verisini önbelleğe yaz"""
+        data_path, meta_path = self._paths(key)
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            forecaster.data.to_parquet(data_path, index=False)
+            with open(meta_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': CACHE_VERSION,
+                    'last_actual_year': forecaster.last_actual_year,
+                    'last_actual_month': forecaster.last_actual_month
+                }, f)
+        except Exception as e:
+            # Parquet motoru (pyarrow) yoksa veya disk yazılamıyorsa önbelleksiz devam et
+            print(f"⚠️ Önbelleğe yazılamadı: {e}")
+            for path in (data_path, meta_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            return False
+        
+        self._evict()
+        return True
+    
+    def _evict(self):
+        """Toplam boyut max_bytes'ı aşıyorsa en eski kullanılan girdileri sil"""
+        entries = {}
+        for name in os.listdir(self.cache_dir):
+            key, ext = os.path.splitext(name)
+            if ext in ('.parquet', '.json'):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                size, last_used = entries.get(key, (0, 0))
+                entries[key] = (size + stat.st_size, max(last_used, stat.st_mtime))
+        
+        total = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+    
+    def get_or_load(self, file_bytes, key=None):
+        """Önbellekte varsa oradan, yoksa Excel'den yükle ve önbelleğe yaz"""
+        key = key or self.content_hash(file_bytes)
+        
+        forecaster = self.load(key)
+        if forecaster is not None:
+            print(f"💾 Önbellekten yüklendi ({key[:12]}): {forecaster.load_timings['cache_load']:.2f} sn")
+            return forecaster
+        
+        forecaster = BudgetForecaster(BytesIO(file_bytes))
+        self.store(key, forecaster)
+        return forecaster
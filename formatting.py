@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+
+# Format fonksiyonları (Türkçe ayraçlar: binlik '.', ondalık ',')
+def format_number(num, decimals=0):
+    if pd.isna(num) or num == 0:
+        return "-"
+    if decimals == 0:
+        return f"{num:,.0f}".replace(",", ".")
+    else:
+        formatted = f"{num:,.{decimals}f}"
+        formatted = formatted.replace(",", "TEMP").replace(".", ",").replace("TEMP", ".")
+        return formatted
+
+
+def format_currency(num):
+    if pd.isna(num) or num == 0:
+        return "-"
+    return f"₺{format_number(num, 0)}"
+
+
+def format_percent(num, decimals=1):
+    if pd.isna(num):
+        return "-"
+    return f"%{format_number(num, decimals)}"
+
+
+# Kolon formatlama - tüm kolon numpy string işlemleriyle tek seferde (hücre başına Python çağrısı yok)
+_DIGIT_GROUPS = np.array([str(i) for i in range(1000)])
+_PADDED_GROUPS = np.array([f'{i:03d}' for i in range(1000)])
+
+
+def _group_thousands(values):
+    """Negatif olmayan tam sayılar → '1.234.567' (3 haneli gruplar tablodan)"""
+    rest = np.asarray(values, dtype=np.int64)
+    lead = rest % 1000
+    tail = np.full(rest.shape, '', dtype='U1')
+    rest = rest // 1000
+    while (rest > 0).any():
+        more = rest > 0
+        tail = np.where(more, np.char.add(np.char.add('.', _PADDED_GROUPS[lead]), tail), tail)
+        lead = np.where(more, rest % 1000, lead)
+        rest = rest // 1000
+    return np.char.add(_DIGIT_GROUPS[lead], tail)
+
+
+def _format_values(values, decimals):
+    """Sayılar → Türkçe ayraçlı metin (binlik '.', ondalık ',') - NaN / 0 ayrımı çağıranda"""
+    values = np.asarray(values, dtype=float)
+    scale = 10 ** decimals
+    product = np.abs(np.where(np.isfinite(values), values, 0)) * scale
+    scaled = np.rint(product).astype(np.int64)
+    # Çarpım yarıma kayan nokta hatası kadar yakınsa (örn: 12.345 * 100 = 1234.4999...)
+    # format_number gibi ikili değerin tam ondalık yuvarlaması kullanılır
+    near_half = np.abs(product - np.floor(product) - 0.5) <= 4 * np.spacing(product)
+    for k in np.flatnonzero(near_half):
+        scaled.flat[k] = int(f'{abs(values.flat[k]):.{decimals}f}'.replace('.', ''))
+    
+    text = _group_thousands(scaled // scale)
+    if 0 < decimals <= 3:
+        # '%03d' tablosundan ilk 'decimals' hane
+        fraction = _PADDED_GROUPS[(scaled % scale) * 10 ** (3 - decimals)].astype(f'U{decimals}')
+        text = np.char.add(np.char.add(text, ','), fraction)
+    elif decimals > 3:
+        text = np.char.add(np.char.add(text, ','), np.char.zfill((scaled % scale).astype(str), decimals))
+    text = np.where(values < 0, np.char.add('-', text), text)
+    return np.where(np.isinf(values), np.where(values > 0, 'inf', '-inf'), text)
+
+
+def format_number_column(series, decimals=0):
+    """format_number'ın kolon versiyonu: NaN / 0 → '-'"""
+    values = series.to_numpy(dtype=float)
+    text = np.where(np.isnan(values) | (values == 0), '-', _format_values(values, decimals))
+    return pd.Series(text, index=series.index, dtype=object)
+
+
+def format_currency_column(series):
+    """format_currency'nin kolon versiyonu: '₺1.234.567', NaN / 0 → '-'"""
+    values = series.to_numpy(dtype=float)
+    text = np.where(np.isnan(values) | (values == 0), '-', np.char.add('₺', _format_values(values, 0)))
+    return pd.Series(text, index=series.index, dtype=object)
+
+
+def format_percent_column(series, decimals=1):
+    """Yüzde kolonu: '%12,3' (değerler zaten yüzde), NaN → '-'"""
+    values = series.to_numpy(dtype=float)
+    text = np.where(np.isnan(values), '-', np.char.add('%', _format_values(values, decimals)))
+    return pd.Series(text, index=series.index, dtype=object)
@@ -0,0 +1,300 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from budget_forecast import HISTORY_METRICS, BudgetForecaster
+
+FORECAST_BACKENDS = ('serial', 'thread', 'process')
+
+# Seri ekseni olmayan (bölümlere dilimlenmeyen) diziler
+_UNSLICED = {'context/time_discount', 'settings/organic_factor', 'settings/margin_improvement',
+             'settings/stock_change_pct'}
+
+# Process worker'larında bağlanılan paylaşılan bellek: segment adı → (SharedMemory, diziler)
+_ATTACHED = {}
+
+
+def partition_series(group_starts, num_series, num_partitions):
+    """
+    Yaprak serileri Ana Grup sınırlarında kesilen, seri sayısı dengeli ardışık
+    bölümlere ayır
+    
+    Returns:
+    --------
+    List[slice]: Boş olmayan, sıralı ve ayrık seri aralıkları
+    """
+    boundaries = np.append(np.asarray(group_starts), num_series)
+    targets = np.linspace(0, num_series, num_partitions + 1)[1:-1]
+    cuts = np.unique(np.concatenate([[0], boundaries[np.searchsorted(boundaries, targets)], [num_series]]))
+    return [slice(int(start), int(stop)) for start, stop in zip(cuts[:-1], cuts[1:])]
+
+
+def _flatten(context, settings, out, out_present):
+    """Bir bloğun ihtiyaç duyduğu dizileri 'context/base/Sales' gibi düz anahtarlara topla"""
+    arrays = {}
+    for key in ('base_present', 'stock_health', 'seasonality', 'prev_present', 'time_discount'):
+        arrays[f'context/{key}'] = context[key]
+    for key in ('base', 'prev'):
+        for col, values in context[key].items():
+            arrays[f'context/{key}/{col}'] = values
+    for key in ('organic_factor', 'margin_improvement', 'stock_change_pct', 'combined_target',
+                'price_multiplier', 'seasonality', 'keep'):
+        if key in settings:
+            arrays[f'settings/{key}'] = np.asarray(settings[key])
+    for col, values in out.items():
+        arrays[f'out/{col}'] = values
+    arrays['out_present'] = out_present
+    return arrays
+
+
+def _forecast_partition(arrays, series, block, selected):
+    """Düz dizilerin bir seri bölümü için bloğu hesapla (çıktılar yerinde yazılır)"""
+    nested = {}
+    for key, values in arrays.items():
+        *path, name = key.split('/')
+        target = nested
+        for part in path:
+            target = target.setdefault(part, {})
+        target[name] = values if key in _UNSLICED else values[..., series]
+    
+    BudgetForecaster._forecast_block(nested['context'], nested['settings'], block, selected,
+                                     nested['out'], nested['out_present'])
+
+
+def _attach(layout):
+    """Worker: paylaşılan bellek segmentine (grid başına bir kez) bağlan"""
+    name = layout['name']
+    if name not in _ATTACHED:
+        # Önceki ızgaraların segmentlerini bırak
+        for old in list(_ATTACHED):
+            shm, arrays = _ATTACHED.pop(old)
+            arrays.clear()
+            shm.close()
+        shm = shared_memory.SharedMemory(name=name)
+        arrays = {
+            key: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            for key, (offset, shape, dtype) in layout['arrays'].items()
+        }
+        _ATTACHED[name] = (shm, arrays)
+    return _ATTACHED[name][1]
+
+
+def _forecast_shared_partition(layout, series, block, selected):
+    _forecast_partition(_attach(layout), series, block, selected)
+
+
+class _PartitionedGrid:
+    """
+    Bir tahmin ızgarasının bölümlere ayrılmış yürütmesi (serial / thread)
+    
+    Bölümler ayrık seri aralıklarına yazdığı için birleştirme bölümlerin bitiş
+    sırasından bağımsızdır (deterministik) ve sonuç seri yürütme ile birebir aynıdır.
+    """
+    
+    def __init__(self, executor, context, settings, shape):
+        self.executor = executor
+        self.partitions = partition_series(context['group_starts'], shape[2], executor.partitions)
+        self.present = np.zeros(shape, dtype=bool)
+        self.out = {col: np.zeros(shape) for col in HISTORY_METRICS}
+        self.arrays = _flatten(context, settings, self.out, self.present)
+    
+    def run_block(self, block, selected):
+        tasks = [(self.arrays, series, block, selected) for series in self.partitions]
+        self.executor.map(_forecast_partition, tasks)
+    
+    def collect(self):
+        return self.out, self.present
+    
+    def close(self):
+        pass
+
+
+class _SharedGrid(_PartitionedGrid):
+    """
+    Process havuzu için ızgara: girdi ve çıktı dizileri tek bir paylaşılan bellek
+    segmentindedir - görevlere sadece segment düzeni (ad, ofset, boyut) gönderilir,
+    diziler pickle edilmez
+    """
+    
+    def __init__(self, executor, context, settings, shape):
+        self.executor = executor
+        self.partitions = partition_series(context['group_starts'], shape[2], executor.partitions)
+        
+        outputs = {f'out/{col}': np.dtype(float) for col in HISTORY_METRICS}
+        outputs['out_present'] = np.dtype(bool)
+        inputs = {
+            key: np.ascontiguousarray(values)
+            for key, values in _flatten(context, settings, {}, None).items() if key != 'out_present'
+        }
+        
+        # Düzen: 64 byte hizalı ofsetler
+        layout, offset = {}, 0
+        specs = [(key, values.shape, values.dtype) for key, values in inputs.items()]
+        specs += [(key, shape, dtype) for key, dtype in outputs.items()]
+        for key, array_shape, dtype in specs:
+            layout[key] = (offset, array_shape, dtype.str)
+            offset += -(-int(np.prod(array_shape)) * dtype.itemsize // 64) * 64
+        
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.layout = {'name': self.shm.name, 'arrays': layout}
+        self.arrays = {
+            key: np.ndarray(array_shape, dtype=dtype, buffer=self.shm.buf, offset=offset)
+            for key, (offset, array_shape, dtype) in layout.items()
+        }
+        for key, values in inputs.items():
+            self.arrays[key][...] = values
+        self.arrays['out_present'][...] = False
+        for col in HISTORY_METRICS:
+            self.arrays[f'out/{col}'][...] = 0.0
+        
+        self.out = {col: self.arrays[f'out/{col}'] for col in HISTORY_METRICS}
+        self.present = self.arrays['out_present']
+    
+    def run_block(self, block, selected):
+        tasks = [(self.layout, series, block, selected) for series in self.partitions]
+        self.executor.map(_forecast_shared_partition, tasks)
+    
+    def collect(self):
+        # Segment kapanmadan önce özel kopyalar
+        return {col: values.copy() for col, values in self.out.items()}, self.present.copy()
+    
+    def close(self):
+        if self.shm is None:
+            return
+        self.arrays = self.out = self.present = None
+        self.shm.unlink()
+        try:
+            self.shm.close()
+        except BufferError:
+            # Hata yolunda çağıranda kalan görünümler - eşleme onlarla birlikte serbest kalır
+            pass
+        self.shm = None
+
+
+class ForecastExecutor:
+    """
+    Tahmin ızgarasını Ana Grup sınırlarında bölümlere ayırıp havuzda hesaplayan yürütücü
+    
+    forecast_scenarios / forecast_future_months / get_full_data_with_forecast /
+    sweep_parameters / simulate_forecast metotlarına executor= ile verilir. Havuz ilk
+    kullanımda açılır ve close() (veya with bloğu) ile kapanır; çağrılar arasında
+    yeniden kullanılır.
+    
+    Parameters:
+    -----------
+    backend: 'serial' (bölümler sırayla, aynı süreçte), 'thread' (NumPy GIL'i bırakır)
+             veya 'process' (paylaşılan bellek, pickle yok)
+    workers: Havuz boyutu (varsayılan: CPU sayısı)
+    partitions: Izgara başına bölüm sayısı (varsayılan: workers)
+    """
+    
+    def __init__(self, backend='process', workers=None, partitions=None):
+        if backend not in FORECAST_BACKENDS:
+            raise ValueError(f"Bilinmeyen backend: {backend} ({', '.join(FORECAST_BACKENDS)})")
+        self.backend = backend
+        self.workers = workers or os.cpu_count() or 1
+        self.partitions = partitions or self.workers
+        self._pool = None
+    
+    def _get_pool(self):
+        if self._pool is None:
+            pool_class = ThreadPoolExecutor if self.backend == 'thread' else ProcessPoolExecutor
+            self._pool = pool_class(max_workers=self.workers)
+        return self._pool
+    
+    def map(self, function, tasks):
+        """Görevleri çalıştır ve hepsinin bitmesini bekle (hatalar yeniden fırlatılır)"""
+        if self.backend == 'serial' or len(tasks) == 1:
+            for task in tasks:
+                function(*task)
+            return
+        
+        futures = [self._get_pool().submit(function, *task) for task in tasks]
+        for future in futures:
+            future.result()
+    
+    def open_grid(self, context, settings, shape):
+        if self.backend == 'process':
+            return _SharedGrid(self, context, settings, shape)
+        return _PartitionedGrid(self, context, settings, shape)
+    
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def benchmark_scaling(forecaster, param_sets, workers=None, backends=('thread', 'process'),
+                      num_months=15, repeat=3):
+    """
+    forecast_scenarios'un 1 → N çekirdek ölçeklenme ölçümü
+    
+    Her backend / worker sayısı için havuz bir kez ısıtılır, ardından en iyi süre
+    alınır. Sonuçların seri yürütme ile aynı olduğu da doğrulanır.
+    
+    Parameters:
+    -----------
+    forecaster: BudgetForecaster
+    param_sets: forecast_scenarios senaryo parametre setleri
+    workers: Denenecek worker sayıları (varsayılan: 1, 2, 4, ... CPU sayısı)
+    backends: Denenecek paralel backend'ler
+    repeat: Ölçüm tekrarı
+    
+    Returns:
+    --------
+    DataFrame: backend, workers, seconds, speedup (seri yürütmeye göre)
+    """
+    if workers is None:
+        cpu_count = os.cpu_count() or 1
+        workers = sorted({2 ** k for k in range(cpu_count.bit_length()) if 2 ** k <= cpu_count} | {cpu_count})
+    
+    def best_time(executor):
+        cube = forecaster.forecast_scenarios(param_sets, num_months=num_months, executor=executor)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            forecaster.forecast_scenarios(param_sets, num_months=num_months, executor=executor)
+            times.append(time.perf_counter() - start)
+        return min(times), cube
+    
+    serial_time, reference = best_time(None)
+    records = [{'backend': 'serial', 'workers': 1, 'seconds': serial_time, 'speedup': 1.0}]
+    
+    for backend in backends:
+        for count in workers:
+            with ForecastExecutor(backend, workers=count) as executor:
+                seconds, cube = best_time(executor)
+            if not all(np.array_equal(cube[key], reference[key]) for key in HISTORY_METRICS + ['present']):
+                raise AssertionError(f"{backend} × {count}: sonuç seri yürütmeden farklı")
+            records.append({'backend': backend, 'workers': count, 'seconds': seconds,
+                            'speedup': serial_time / seconds})
+    
+    return pd.DataFrame(records)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Paralel tahmin ölçeklenme ölçümü (1 → N çekirdek)")
+    parser.add_argument('excel_path', help="Bütçe Excel dosyası (Sayfa1)")
+    parser.add_argument('--workers', type=int, nargs='+', help="Denenecek worker sayıları")
+    parser.add_argument('--backends', nargs='+', default=['thread', 'process'], choices=FORECAST_BACKENDS[1:])
+    parser.add_argument('--scenarios', type=int, default=3, help="Senaryo (batch) sayısı")
+    parser.add_argument('--months', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    
+    forecaster = BudgetForecaster(args.excel_path)
+    param_sets = [{'name': i, 'organic_multiplier': i / max(args.scenarios - 1, 1)} for i in range(args.scenarios)]
+    result = benchmark_scaling(forecaster, param_sets, workers=args.workers, backends=args.backends,
+                               num_months=args.months, repeat=args.repeat)
+    print(result.to_string(index=False, float_format=lambda x: f'{x:.3f}'))
@@ -0,0 +1,60 @@
+import json
+
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic_actuals, write_actuals_workbook
+from data_cache import CACHE_VERSION, ParsedDataCache
+
+
+@pytest.fixture(scope='module')
+def workbook_bytes(tmp_path_factory):
+    path = tmp_path_factory.mktemp('workbook') / 'actuals.xlsx'
+    write_actuals_workbook(synthetic_actuals(6, years=2, seed=1), path)
+    return path.read_bytes()
+
+
+def test_round_trip(tmp_path, workbook_bytes):
+    cache = ParsedDataCache(tmp_path / 'cache')
+    parsed = cache.get_or_load(workbook_bytes)
+    assert 'read_excel' in parsed.load_timings
+    
+    cached = cache.get_or_load(workbook_bytes)
+    assert 'cache_load' in cached.load_timings
+    assert 'read_excel' not in cached.load_timings
+    assert (cached.last_actual_year, cached.last_actual_month) == (parsed.last_actual_year, parsed.last_actual_month)
+    pd.testing.assert_frame_equal(cached.data.reset_index(drop=True), parsed.data.reset_index(drop=True),
+                                  check_dtype=False, check_categorical=False)
+    
+    # Aynı parametrelerle aynı tahmin
+    params = {'margin_improvement': 0.02, 'monthly_growth_targets': {5: 0.2}}
+    pd.testing.assert_frame_equal(cached.forecast_future_months(**params), parsed.forecast_future_months(**params))
+
+
+def test_stale_version_is_ignored(tmp_path, workbook_bytes):
+    cache = ParsedDataCache(tmp_path)
+    key = cache.content_hash(workbook_bytes)
+    cache.get_or_load(workbook_bytes)
+    
+    meta_path = tmp_path / f'{key}.json'
+    meta = json.loads(meta_path.read_text(encoding='utf-8'))
+    assert meta['version'] == CACHE_VERSION
+    meta_path.write_text(json.dumps({**meta, 'version': CACHE_VERSION - 1}), encoding='utf-8')
+    
+    assert cache.load(key) is None
+    # Yeniden okunur ve güncel sürümle yazılır
+    assert 'read_excel' in cache.get_or_load(workbook_bytes).load_timings
+    assert json.loads(meta_path.read_text(encoding='utf-8'))['version'] == CACHE_VERSION
+
+
+def test_eviction_keeps_newest(tmp_path, workbook_bytes):
+    cache = ParsedDataCache(tmp_path)
+    cache.get_or_load(workbook_bytes, key='first')
+    entry_bytes = sum(path.stat().st_size for path in tmp_path.glob('first.*'))
+    
+    # Bir girdilik sınır: ikinci yazımda en eski kullanılan girdi silinir
+    cache.max_bytes = entry_bytes
+    cache.get_or_load(workbook_bytes, key='second')
+    
+    assert not list(tmp_path.glob('first.*'))
+    assert cache.load('second') is not None
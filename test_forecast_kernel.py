@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+# Vektörize çekirdekten önceki (satır satır) uygulamanın aynı sentetik veri ve
+# parametrelerle ürettiği değerler
+BASELINE_SUMMARY = {
+    2025: [113127068.60206485, 38854597.420416296, 34.34597740448046, 8.95763941226074],
+    2026: [119830441.41367199, 43559481.601215355, 36.35093143890018, 9.595219706327653],
+    2027: [10372290.006425422, 3963329.8612123425, 38.210750555153595, 131.10277223940224],
+}
+BASELINE_MONTHLY_SALES = {
+    (2025, 11): 8963425.33845489, (2025, 12): 9076347.34637744,
+    (2026, 1): 10313969.585123925, (2026, 2): 10546323.619320773, (2026, 3): 11056957.245326374,
+    (2026, 4): 10563633.975443289, (2026, 5): 11259139.207824774, (2026, 6): 10625235.01881684,
+    (2026, 7): 11473426.115307791, (2026, 8): 9938353.728955206, (2026, 9): 9208865.562994909,
+    (2026, 10): 9129265.457792277, (2026, 11): 7869098.2972655995, (2026, 12): 7846173.599500233,
+    (2027, 1): 10372290.006425422,
+}
+METRICS = ['Total_Sales', 'Total_GrossProfit', 'Avg_GrossMargin%', 'Avg_Stock_COGS_Weekly']
+
+
+@pytest.fixture
+def baseline_params(forecaster):
+    groups = sorted(forecaster.groups)
+    return dict(
+        growth_param=0.1, margin_improvement=0.02, stock_change_pct=0.1,
+        monthly_growth_targets={1: 0.15, 7: 0.3},
+        maingroup_growth_targets={groups[0]: 0.1, groups[1]: 0.25},
+        lessons_learned={(groups[1], month): 2.0 for month in range(1, 13)},
+        inflation_adjustment=25 / 35, organic_multiplier=0.5,
+        price_change_matrix={(groups[0], month): 0.05 for month in range(1, 13)},
+        inflation_rate=0.25, organic_growth_rate=0.15
+    )
+
+
+def test_matches_baseline(forecaster, baseline_params):
+    full_data = forecaster.get_full_data_with_forecast(**baseline_params)
+    summary = forecaster.get_summary_stats(full_data)
+    
+    for year, expected in BASELINE_SUMMARY.items():
+        np.testing.assert_allclose([summary[year][metric] for metric in METRICS], expected, rtol=1e-9)
+    
+    forecast = forecaster.forecast_future_months(**baseline_params)
+    monthly = forecast.groupby(['Year', 'Month'])['Sales'].sum()
+    assert list(monthly.index) == list(BASELINE_MONTHLY_SALES)
+    np.testing.assert_allclose(monthly.to_numpy(), list(BASELINE_MONTHLY_SALES.values()), rtol=1e-9)
+
+
+def test_forecast_layout(forecaster, baseline_params):
+    forecast = forecaster.forecast_future_months(num_months=5, **baseline_params)
+    
+    # Her ay × Ana Grup bir satır, gerçekleşen aylar tekrar edilmez
+    assert len(forecast) == 5 * len(forecaster.groups)
+    months = sorted(set(zip(forecast['Year'], forecast['Month'])))
+    assert months[0] == (forecaster.last_actual_year, forecaster.last_actual_month + 1)
+    assert not forecast[['Sales', 'GrossProfit', 'Stock', 'COGS']].isna().any().any()
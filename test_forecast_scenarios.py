@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+METRICS = ['Quantity', 'Sales', 'GrossProfit', 'Stock', 'COGS']
+
+
+@pytest.fixture
+def param_sets(forecaster, parameter_set):
+    groups = sorted(forecaster.groups)
+    return [
+        {'name': 'sözlük', 'margin_improvement': 0.01, 'monthly_growth_targets': {2: 0.2},
+         'maingroup_growth_targets': {groups[2]: -0.05}, 'inflation_adjustment': 0.8},
+        {'name': 'derlenmiş', 'stock_change_pct': -0.2, 'organic_multiplier': 1.0,
+         'parameters': parameter_set.compile(forecaster.groups, monthly_effect=0.5)},
+        {'name': 'varsayılan'},
+    ]
+
+
+def test_scenarios_match_single_runs(forecaster, param_sets):
+    zero_mask = np.zeros((len(forecaster.groups), 12), dtype=bool)
+    zero_mask[1, 2] = True
+    result = forecaster.forecast_scenarios(param_sets, zero_mask=zero_mask)
+    
+    assert result['names'] == ['sözlük', 'derlenmiş', 'varsayılan']
+    leaves = result['leaves']['MainGroup']
+    
+    for scenario, params in enumerate(param_sets):
+        single = forecaster.forecast_future_months(
+            zero_mask=zero_mask, **{key: value for key, value in params.items() if key != 'name'}
+        )
+        present = result['present'][scenario]
+        
+        # Ay bazında toplamlar (ufuk sırası)
+        by_month = single.groupby(['Year', 'Month'])[METRICS].sum()
+        assert list(by_month.index) == list(zip(result['years'], result['months']))
+        # Seri bazında toplamlar
+        by_leaf = single.groupby('MainGroup')[METRICS].sum().reindex(leaves)
+        
+        for metric in METRICS:
+            values = np.where(present, result[metric][scenario], 0.0)
+            np.testing.assert_allclose(values.sum(axis=1), by_month[metric], rtol=1e-9, atol=1e-6)
+            np.testing.assert_allclose(values.sum(axis=0), by_leaf[metric], rtol=1e-9, atol=1e-6)
+
+
+def test_unknown_parameter_is_rejected(forecaster):
+    with pytest.raises(TypeError):
+        forecaster.forecast_scenarios([{'growth': 0.1}])
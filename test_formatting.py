@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from formatting import (format_currency, format_currency_column, format_number, format_number_column,
+                        format_percent, format_percent_column)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    special = [0.0, np.nan, 0.4, 0.5, 1.5, -0.6, 999.5, 1000.0, 1234567.891, -9876543.21, 1e12, 0.004, 12.345]
+    random = rng.normal(0, 1, 500) * 10.0 ** rng.integers(0, 10, 500)
+    return pd.Series(special + list(random), index=range(100, 613))
+
+
+@pytest.mark.parametrize('decimals', [0, 1, 2, 3, 5])
+def test_number_column_matches_scalar(values, decimals):
+    result = format_number_column(values, decimals)
+    
+    assert result.index.equals(values.index)
+    assert result.tolist() == [format_number(value, decimals) for value in values]
+
+
+def test_currency_column_matches_scalar(values):
+    assert format_currency_column(values).tolist() == [format_currency(value) for value in values]
+
+
+def test_percent_column(values):
+    result = format_percent_column(values, 1)
+    
+    nonzero = values.notna() & (values != 0)
+    assert result[nonzero].tolist() == [format_percent(value, 1) for value in values[nonzero]]
+    # Sıfır yüzde gösterilir, eksik değer '-'
+    assert result[values == 0].tolist() == ['%0,0']
+    assert result[values.isna()].tolist() == ['-']
+
+
+def test_examples():
+    series = pd.Series([1234567.891, -0.5, 0.0, np.nan, np.inf])
+    
+    assert format_number_column(series, 2).tolist() == ['1.234.567,89', '-0,50', '-', '-', 'inf']
+    assert format_currency_column(series).tolist() == ['₺1.234.568', '₺-0', '-', '-', '₺inf']
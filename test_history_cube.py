@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from budget_forecast import HISTORY_METRICS, HistoryCube
+
+
+def _row(year, month, group, subgroup, sales, quantity=10.0, gross_profit=None, stock=50.0, cogs=None):
+    gross_profit = sales * 0.3 if gross_profit is None else gross_profit
+    cogs = sales - gross_profit if cogs is None else cogs
+    return {'Year': year, 'Month': month, 'MainGroup': group, 'SubGroup': subgroup,
+            'Quantity': quantity, 'UnitPrice': sales / quantity, 'Sales': sales, 'GrossProfit': gross_profit,
+            'GrossMargin%': gross_profit / sales, 'Stock': stock, 'COGS': cogs, 'Stock_COGS_Ratio': stock / cogs}
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame([
+        _row(2024, 1, 'B', 'y', 100.0),
+        _row(2024, 1, 'A', 'x', 200.0),
+        _row(2024, 2, 'A', 'z', 50.0),
+        # 2025 verisi yok - ara yıl küpte boş kalır
+        _row(2026, 12, 'A', 'x', 80.0),
+        # Ay dışı satır alınmaz
+        _row(2026, 13, 'A', 'x', 999.0),
+    ])
+
+
+def test_layout_and_round_trip(frame):
+    cube = HistoryCube.from_frame(frame)
+    
+    assert cube.levels == ['MainGroup', 'SubGroup']
+    assert cube.years.tolist() == [2024, 2025, 2026]
+    assert cube.leaves.values.tolist() == [['A', 'x'], ['A', 'z'], ['B', 'y']]
+    assert cube.groups.tolist() == ['A', 'B']
+    assert cube.leaf_group.tolist() == [0, 0, 1]
+    assert cube.present.shape == (3, 12, 3)
+    assert cube.present.sum() == 4
+    assert not cube.present[1].any()
+    assert cube.year_position(2026) == 2 and cube.year_position(2030) == -1
+    
+    # Yıl, Ay, seri sırasıyla aynı satırlar
+    expected = frame[frame['Month'] <= 12].sort_values(['Year', 'Month', 'MainGroup', 'SubGroup'])
+    result = cube.to_frame()
+    pd.testing.assert_frame_equal(result[['Year', 'Month', 'MainGroup', 'SubGroup'] + HISTORY_METRICS],
+                                  expected.reset_index(drop=True), check_dtype=False)
+    
+    # until: son gerçekleşen döneme kadar
+    assert len(cube.to_frame(until=(2024, 1))) == 2
+
+
+def test_duplicates_and_rollup(frame):
+    duplicated = pd.concat([frame, pd.DataFrame([_row(2024, 1, 'A', 'x', 100.0, quantity=30.0, gross_profit=10.0)])])
+    cube = HistoryCube.from_frame(duplicated)
+    
+    # Tekrarlanan hücre toplanır, oranlar toplamlardan yeniden hesaplanır
+    cell = (0, 0, 0)
+    assert cube['Sales'][cell] == pytest.approx(300.0)
+    assert cube['Quantity'][cell] == pytest.approx(40.0)
+    assert cube['UnitPrice'][cell] == pytest.approx(300.0 / 40.0)
+    assert cube['GrossMargin%'][cell] == pytest.approx(70.0 / 300.0)
+    
+    keys, starts = cube.level_blocks('MainGroup')
+    assert keys['MainGroup'].tolist() == ['A', 'B'] and starts.tolist() == [0, 2]
+    
+    rolled = cube.to_frame(level='MainGroup').set_index(['Year', 'Month', 'MainGroup'])
+    assert 'SubGroup' not in rolled.columns
+    assert rolled.loc[(2024, 1, 'A'), 'Sales'] == pytest.approx(300.0)
+    assert rolled.loc[(2024, 2, 'A'), 'Sales'] == pytest.approx(50.0)
+    assert rolled.loc[(2024, 1, 'A'), 'Stock_COGS_Ratio'] == pytest.approx(
+        rolled.loc[(2024, 1, 'A'), 'Stock'] / rolled.loc[(2024, 1, 'A'), 'COGS'])
+
+
+def test_freeze(frame):
+    cube = HistoryCube.from_frame(frame).freeze()
+    with pytest.raises(ValueError):
+        cube.values[0, 0, 0, 0] = 1.0
@@ -0,0 +1,67 @@
+import copy
+
+import numpy as np
+import pytest
+
+from budget_forecast import HISTORY_METRICS, IncrementalForecast
+
+SUMMARY_KEYS = ['Total_Sales', 'Total_GrossProfit', 'Avg_GrossMargin%', 'Avg_Stock', 'Avg_Stock_COGS_Weekly']
+
+
+def _edited(parameter_set, group, month, price):
+    # Tek fiyat hücresi değişmiş kopya
+    edited = copy.deepcopy(parameter_set)
+    edited.price_changes[list(edited.groups).index(group), month - 1] = price
+    return edited
+
+
+def _assert_matches_full_recompute(incremental, forecaster, scenario_sets, zero_mask):
+    expected = forecaster.forecast_scenarios(scenario_sets, zero_mask=zero_mask)
+    for key in HISTORY_METRICS + ['present']:
+        np.testing.assert_allclose(incremental.grid[key], expected[key], rtol=1e-12, atol=1e-9)
+    
+    for scenario in range(len(scenario_sets)):
+        full_data = forecaster.combine_with_history(forecaster.scenario_frame(expected, scenario))
+        expected_summary = forecaster.get_summary_stats(full_data)
+        summary = incremental.summary(scenario)
+        assert sorted(summary) == sorted(expected_summary)
+        for year, metrics in expected_summary.items():
+            for key in SUMMARY_KEYS:
+                assert summary[year][key] == pytest.approx(metrics[key], rel=1e-9)
+        
+        quality = incremental.quality_metrics(scenario)
+        expected_quality = forecaster.get_forecast_quality_metrics(full_data)
+        assert quality['avg_growth'] == pytest.approx(expected_quality['avg_growth'], rel=1e-9)
+
+
+def test_cell_edit_recomputes_one_group(forecaster, parameter_set):
+    zero_mask = forecaster.zero_reset_mask(parameter_set)
+    incremental = IncrementalForecast(forecaster, forecaster.budget_scenarios(parameter_set), zero_mask=zero_mask)
+    
+    group = parameter_set.groups[0]
+    scenario_sets = forecaster.budget_scenarios(_edited(parameter_set, group, 12, 40.0))
+    touched = incremental.update(scenario_sets, zero_mask=zero_mask)
+    
+    assert list(touched) == [group]
+    _assert_matches_full_recompute(incremental, forecaster, scenario_sets, zero_mask)
+
+
+def test_zero_mask_and_scalar_changes(forecaster, parameter_set):
+    scenario_sets = forecaster.budget_scenarios(parameter_set)
+    incremental = IncrementalForecast(forecaster, scenario_sets)
+    
+    # Sıfırlama sadece o Ana Grubu etkiler
+    zero_mask = np.zeros((len(forecaster.groups), 12), dtype=bool)
+    zero_mask[3, :6] = True
+    touched = incremental.update(scenario_sets, zero_mask=zero_mask)
+    assert list(touched) == [forecaster.groups[3]]
+    _assert_matches_full_recompute(incremental, forecaster, scenario_sets, zero_mask)
+    
+    # Tüm grupları etkileyen parametre → tam yeniden hesaplama
+    scenario_sets = forecaster.budget_scenarios(parameter_set, margin_improvement=0.05)
+    touched = incremental.update(scenario_sets, zero_mask=zero_mask)
+    assert len(touched) == len(forecaster.groups)
+    _assert_matches_full_recompute(incremental, forecaster, scenario_sets, zero_mask)
+    
+    # Değişiklik yoksa hiçbir grup yeniden hesaplanmaz
+    assert len(incremental.update(scenario_sets, zero_mask=zero_mask)) == 0
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from budget_forecast import build_monthly_performance
+
+
+def _rows(year, month, sales, quantity, gross_profit, cogs, stock):
+    # Her ay iki satıra bölünür - rapor (Yıl, Ay) toplamlarını kullanmalı
+    return [
+        {'Year': year, 'Month': month, 'MainGroup': 'A', 'Sales': sales * 0.6, 'Quantity': quantity * 0.6,
+         'GrossProfit': gross_profit * 0.6, 'COGS': cogs * 0.6, 'Stock': stock * 0.6},
+        {'Year': year, 'Month': month, 'MainGroup': 'B', 'Sales': sales * 0.4, 'Quantity': quantity * 0.4,
+         'GrossProfit': gross_profit * 0.4, 'COGS': cogs * 0.4, 'Stock': stock * 0.4},
+    ]
+
+
+@pytest.fixture
+def full_data():
+    rows = []
+    # 2024: tek ay, negatif yıllık kar (Kar % paydası <= 0)
+    rows += _rows(2024, 1, 10, 1, -5, 15, 0)
+    # 2025: Mart'ta satış ve SMM yok, sadece stok
+    rows += _rows(2025, 1, 100, 10, 40, 60, 120)
+    rows += _rows(2025, 2, 300, 30, 60, 240, 0)
+    rows += _rows(2025, 3, 0, 0, 0, 0, 50)
+    # 2026: Ocak'ta negatif kar
+    rows += _rows(2026, 1, 150, 10, -10, 160, 320)
+    rows += _rows(2026, 2, 300, 20, 90, 210, 0)
+    rows += _rows(2026, 3, 50, 5, 20, 30, 0)
+    return pd.DataFrame(rows)
+
+
+def test_column_layout(full_data):
+    report = build_monthly_performance(full_data, years=[2024, 2025, 2026])
+    
+    expected = ['Ay', 'Ay Adı']
+    for name in ['Ciro', 'Ciro %', 'Adet', 'Adet %', 'Kar', 'Kar %', 'BM %', 'Stok Hft']:
+        expected += [f'{year} {name}' for year in (2024, 2025, 2026)]
+    expected += ['26/25 Ciro Büyüme %', '26/25 Adet Büyüme %', '26/25 Kar Büyüme %']
+    
+    assert list(report.columns) == expected
+    assert report['Ay'].tolist() == list(range(1, 13))
+    assert report['Ay Adı'].iloc[0] == 'Ocak'
+
+
+def test_hand_computed_values(full_data):
+    report = build_monthly_performance(full_data, years=[2024, 2025, 2026]).set_index('Ay')
+    first = report.loc[1:3]
+    
+    def column(name):
+        return first[name].to_numpy(dtype=float)
+    
+    # Toplamlar: 2025 Ciro 400 / Adet 40 / Kar 100, 2026 Ciro 500 / Adet 35 / Kar 100
+    np.testing.assert_allclose(column('2025 Ciro'), [100, 300, 0])
+    np.testing.assert_allclose(column('2025 Ciro %'), [25, 75, 0])
+    np.testing.assert_allclose(column('2026 Ciro %'), [30, 60, 10])
+    np.testing.assert_allclose(column('2026 Adet %'), [10 / 35 * 100, 20 / 35 * 100, 5 / 35 * 100])
+    np.testing.assert_allclose(column('2026 Kar %'), [-10, 90, 20])
+    
+    # BM %: satışı olmayan ay 0
+    np.testing.assert_allclose(column('2025 BM %'), [40, 20, 0])
+    np.testing.assert_allclose(column('2026 BM %'), [-10 / 150 * 100, 30, 40])
+    
+    # Stok Hft: stok toplamı / SMM × (ay günü / 7), SMM olmayan ay 0
+    np.testing.assert_allclose(column('2025 Stok Hft'), [120 / 60 * 31 / 7, 0, 0])
+    np.testing.assert_allclose(column('2026 Stok Hft'), [320 / 160 * 31 / 7, 0, 0])
+
+
+def test_zero_denominators(full_data):
+    report = build_monthly_performance(full_data, years=[2024, 2025, 2026]).set_index('Ay')
+    
+    # Yıllık kar toplamı negatif → Kar % 0
+    assert report.loc[1, '2024 Kar'] == pytest.approx(-5)
+    assert report.loc[1, '2024 Kar %'] == 0
+    assert report.loc[1, '2024 Ciro %'] == pytest.approx(100)
+    
+    # Verisi olmayan aylar tüm metriklerde 0
+    assert (report.loc[4:12].drop(columns='Ay Adı').to_numpy(dtype=float) == 0).all()
+
+
+def test_growth_uses_last_two_years(full_data):
+    report = build_monthly_performance(full_data, years=[2024, 2025, 2026]).set_index('Ay')
+    first = report.loc[1:3]
+    
+    # (2026 - 2025) / 2025; 2025 değeri 0 olan ay → 0
+    np.testing.assert_allclose(first['26/25 Ciro Büyüme %'], [50, 0, 0])
+    np.testing.assert_allclose(first['26/25 Adet Büyüme %'], [0, -100 / 3, 0])
+    np.testing.assert_allclose(first['26/25 Kar Büyüme %'], [-125, 50, 0])
+    
+    # Tek yıllık raporda büyüme kolonu yok
+    single = build_monthly_performance(full_data, years=[2025])
+    assert not [col for col in single.columns if 'Büyüme' in col]
+    
+    # Varsayılan: verideki tüm yıllar
+    assert '26/25 Ciro Büyüme %' in build_monthly_performance(full_data).columns
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks import synthetic_actuals
+from budget_forecast import HISTORY_METRICS, BudgetForecaster
+from parallel_forecast import FORECAST_BACKENDS, ForecastExecutor, partition_series
+
+
+@pytest.fixture(scope='module')
+def hierarchy_forecaster():
+    # Ana Grup × Alt Grup yaprakları - bölümler Ana Grup sınırında kesilmeli
+    return BudgetForecaster.from_frame(synthetic_actuals(24, years=2, num_subgroups=3, seed=2)).freeze()
+
+
+@pytest.fixture
+def param_sets(hierarchy_forecaster):
+    groups = sorted(hierarchy_forecaster.groups)
+    return [
+        {'name': 'a', 'margin_improvement': 0.02, 'monthly_growth_targets': {3: 0.25}},
+        {'name': 'b', 'stock_change_pct': -0.1, 'maingroup_growth_targets': {groups[1]: -0.2},
+         'price_change_matrix': {(groups[0], 6): 0.4}},
+    ]
+
+
+def test_partitions_follow_group_boundaries():
+    group_starts = np.array([0, 3, 4, 9, 10])
+    for num_partitions in range(1, 8):
+        partitions = partition_series(group_starts, 12, num_partitions)
+        
+        assert partitions[0].start == 0 and partitions[-1].stop == 12
+        assert all(left.stop == right.start for left, right in zip(partitions, partitions[1:]))
+        assert all(part.start in group_starts for part in partitions)
+        assert len(partitions) <= num_partitions
+
+
+@pytest.mark.parametrize('backend', FORECAST_BACKENDS)
+def test_backends_match_serial(hierarchy_forecaster, param_sets, backend):
+    zero_mask = np.zeros((len(hierarchy_forecaster.groups), 12), dtype=bool)
+    zero_mask[0, 1] = True
+    # 27 ay: ikinci ve üçüncü blokta kaynak seçimi önceki tahmine bağlı
+    expected = hierarchy_forecaster.forecast_scenarios(param_sets, num_months=27, zero_mask=zero_mask)
+    
+    with ForecastExecutor(backend, workers=2, partitions=3) as executor:
+        result = hierarchy_forecaster.forecast_scenarios(param_sets, num_months=27, zero_mask=zero_mask,
+                                                         executor=executor)
+        for key in HISTORY_METRICS + ['present']:
+            assert np.array_equal(result[key], expected[key]), key
+        
+        sweep = hierarchy_forecaster.sweep_parameters({'margin_improvement': [0.0, 0.03]}, executor=executor)
+        pd.testing.assert_frame_equal(sweep, hierarchy_forecaster.sweep_parameters({'margin_improvement': [0.0, 0.03]}))
+        
+        simulation = hierarchy_forecaster.simulate_forecast(n_draws=50, seed=4, executor=executor)
+        pd.testing.assert_frame_equal(simulation['by_group'],
+                                      hierarchy_forecaster.simulate_forecast(n_draws=50, seed=4)['by_group'])
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        ForecastExecutor('gpu')
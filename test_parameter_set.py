@@ -0,0 +1,95 @@
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from budget_forecast import PARAMETER_SHEETS, ParameterSet, read_parameter_file
+
+ARRAYS = ['monthly_targets', 'monthly_reset', 'group_targets', 'group_reset', 'lessons', 'lessons_reset',
+          'price_changes']
+
+
+def _assert_same(left, right):
+    assert left.groups.tolist() == right.groups.tolist()
+    for name in ARRAYS:
+        np.testing.assert_array_equal(getattr(left, name), getattr(right, name), err_msg=name)
+    assert left.content_hash() == right.content_hash()
+
+
+@pytest.fixture
+def tables():
+    return {
+        'monthly_targets': pd.DataFrame({'Ay': [1, 2, 5, 13], 'Hedef (%)': ['12.5', '*', 'abc', '4']}),
+        'maingroup_targets': pd.DataFrame({'Ana Grup': ['A', 'B'], 'Hedef (%)': ['0.1', '*']}),
+        'lessons_learned': pd.DataFrame({'Ana Grup': ['B'], **{str(month): ['-3'] for month in range(1, 12)},
+                                         '12': ['*']}),
+        'price_changes': pd.DataFrame({'Ana Grup': ['C', 'A'], **{str(month): ['7.25', ''] for month in range(1, 13)}}),
+    }
+
+
+def test_parsing_and_invalid_cells(tables):
+    parameters = ParameterSet.from_tables(**tables, inflation_rate=0.3)
+    
+    assert parameters.groups.tolist() == ['A', 'B', 'C']
+    assert parameters.monthly_targets[0] == 12.5
+    assert parameters.monthly_reset[1] and np.isnan(parameters.monthly_targets[1])
+    # Okunamayan hedef varsayılan %20, okunamayan fiyat enflasyon
+    assert parameters.monthly_targets[4] == 20.0
+    assert np.isnan(parameters.monthly_targets[11])
+    assert parameters.group_reset.tolist() == [False, True, False]
+    assert parameters.lessons_reset[1].tolist() == [False] * 11 + [True]
+    np.testing.assert_array_equal(parameters.price_changes[2], np.full(12, 7.25))
+    np.testing.assert_array_equal(parameters.price_changes[0], np.full(12, 30.0))
+    
+    invalid = parameters.invalid
+    assert set(zip(invalid['table'], invalid['column'])) >= {('monthly_targets', 'Ay'), ('monthly_targets', 'Hedef (%)')}
+    assert (invalid['table'] == 'price_changes').sum() == 12
+
+
+def test_round_trips(tables, tmp_path):
+    parameters = ParameterSet.from_tables(**tables)
+    
+    _assert_same(ParameterSet.from_tables(**parameters.to_tables()), parameters)
+    
+    path = tmp_path / 'saved_parameters.json'
+    parameters.to_json(path, inflation_future=30.0, budget_version='🟢 İyimser')
+    _assert_same(ParameterSet.from_json(path), parameters)
+    settings = read_parameter_file(path)
+    assert settings['inflation_future'] == 30.0 and settings['budget_version'] == '🟢 İyimser'
+    _assert_same(settings['parameters'], parameters)
+    
+    output = BytesIO()
+    parameters.to_excel(output)
+    _assert_same(ParameterSet.from_excel(BytesIO(output.getvalue())), parameters)
+
+
+def test_excel_missing_sheets_use_base(tables):
+    parameters = ParameterSet.from_tables(**tables)
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        pd.DataFrame({'Ay': [3], 'Hedef (%)': ['40']}).to_excel(writer, sheet_name=PARAMETER_SHEETS['monthly_targets'],
+                                                               index=False)
+    
+    loaded = ParameterSet.from_excel(BytesIO(output.getvalue()), base=parameters)
+    assert loaded.monthly_targets[2] == 40.0 and np.isnan(loaded.monthly_targets[0])
+    np.testing.assert_array_equal(loaded.group_targets, parameters.group_targets)
+    np.testing.assert_array_equal(loaded.price_changes, parameters.price_changes)
+
+
+def test_compile_aligns_and_applies_effects(tables):
+    parameters = ParameterSet.from_tables(**tables)
+    compiled = parameters.compile(['C', 'D', 'A'], growth_param=0.05, monthly_effect=0.5, maingroup_effect=2.0,
+                                  inflation_rate=0.2)
+    
+    assert compiled.groups.tolist() == ['C', 'D', 'A']
+    assert compiled.monthly_targets[0] == pytest.approx(0.125 * 0.5)
+    # Girilmeyen / * hedefler genel büyüme
+    assert compiled.monthly_targets[1] == 0.05 and compiled.monthly_targets[11] == 0.05
+    assert compiled.group_targets.tolist() == pytest.approx([0.05, 0.05, 0.001 * 2.0])
+    # Tablodaki fiyat, tabloda olmayan grup enflasyon
+    np.testing.assert_allclose(compiled.price_changes[0], 0.0725)
+    np.testing.assert_allclose(compiled.price_changes[1], 0.2)
+    
+    mask = parameters.zero_mask(['C', 'B'])
+    assert mask[:, 1].all() and mask[1].all() and mask.sum() == 13
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+NO_NOISE = dict(growth_sigma=0.0, price_sigma=0.0, seasonality_sigma=0.0, organic_sigma=0.0)
+
+
+def test_zero_noise_collapses_to_forecast(forecaster):
+    params = {'margin_improvement': 0.01, 'monthly_growth_targets': {4: 0.3}}
+    simulation = forecaster.simulate_forecast(n_draws=20, batch_size=7, seed=0, **NO_NOISE, **params)
+    forecast = forecaster.forecast_future_months(**params)
+    
+    expected = forecast.groupby(['Year', 'Month'])['Sales'].sum().to_numpy()
+    by_month = simulation['by_month']
+    for band in ('Sales_P10', 'Sales_P50', 'Sales_P90'):
+        np.testing.assert_allclose(by_month[band], expected, rtol=1e-9)
+    
+    expected = forecast.groupby(['Year', 'MainGroup'])['GrossProfit'].sum()
+    by_group = simulation['by_group'].groupby(['Year', 'MainGroup'])['GrossProfit_P50'].sum()
+    np.testing.assert_allclose(by_group.reindex(expected.index), expected, rtol=1e-9)
+
+
+def test_bands_are_ordered_and_seeded(forecaster):
+    first = forecaster.simulate_forecast(n_draws=300, batch_size=100, seed=3)
+    second = forecaster.simulate_forecast(n_draws=300, batch_size=100, seed=3)
+    
+    for key in ('by_group', 'by_month', 'by_year'):
+        pd.testing.assert_frame_equal(first[key], second[key])
+    
+    for name in ('Sales', 'GrossProfit'):
+        bands = first['by_month'][[f'{name}_P10', f'{name}_P50', f'{name}_P90']].to_numpy()
+        assert (np.diff(bands, axis=1) >= 0).all()
+        assert (bands[:, 2] > bands[:, 0]).all()
+    
+    assert list(first['by_year']['Year']) == sorted(first['by_month']['Year'].unique())
@@ -0,0 +1,47 @@
+import pytest
+
+
+def _year_sales(forecaster, year, **params):
+    full_data = forecaster.get_full_data_with_forecast(**params)
+    return full_data[full_data['Year'] == year].groupby('MainGroup')['Sales'].sum()
+
+
+def test_uniform_target_converges(forecaster):
+    year = forecaster.last_actual_year + 1
+    target = 1.15 * _year_sales(forecaster, year, margin_improvement=0.01).sum()
+    
+    result = forecaster.solve_growth_target(target, margin_improvement=0.01)
+    
+    assert result['converged']
+    assert result['achieved'] == pytest.approx(target, rel=1e-6)
+    # Bulunan hedef tüm aylara girildiğinde tam tahmin de hedefi tutturur
+    monthly_targets = {month: result['growth_target'] for month in range(1, 13)}
+    achieved = _year_sales(forecaster, year, margin_improvement=0.01, monthly_growth_targets=monthly_targets).sum()
+    assert achieved == pytest.approx(target, rel=1e-5)
+
+
+def test_group_targets_converge(forecaster):
+    year = forecaster.last_actual_year + 1
+    groups = sorted(forecaster.groups)[:2]
+    current = _year_sales(forecaster, year)
+    target = {groups[0]: 0.9 * current[groups[0]], groups[1]: 1.3 * current[groups[1]]}
+    
+    result = forecaster.solve_growth_target(target)
+    
+    assert result['converged']
+    achieved = _year_sales(forecaster, year, maingroup_growth_targets=result['growth_targets'])
+    for group, value in target.items():
+        assert achieved[group] == pytest.approx(value, rel=1e-5)
+    # Diğer gruplar değişmez
+    others = [group for group in current.index if group not in target]
+    assert achieved[others].tolist() == pytest.approx(current[others].tolist(), rel=1e-12)
+
+
+def test_unreachable_target(forecaster):
+    result = forecaster.solve_growth_target(1e15, bounds=(-0.5, 0.5))
+    
+    assert not result['converged']
+    assert result['growth_target'] == 0.5
+    
+    with pytest.raises(ValueError):
+        forecaster.solve_growth_target({'YOK': 1.0})
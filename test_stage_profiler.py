@@ -0,0 +1,49 @@
+import threading
+import tracemalloc
+
+import numpy as np
+
+from budget_forecast import StageProfiler, profile_stage
+
+
+def test_nested_stages_and_memory():
+    profiler = StageProfiler()
+    with profiler:
+        with profile_stage('outer'):
+            with profile_stage('inner'):
+                values = np.ones(10 ** 6)
+    
+    assert [record['stage'] for record in profiler.records] == ['outer', 'outer/inner']
+    # 8 MB dizi hem iç hem dış aşamanın tepesinde
+    assert all(record['peak_mb'] > 7 for record in profiler.records)
+    assert not tracemalloc.is_tracing()
+    del values
+
+
+def test_memory_profiling_is_one_session_at_a_time():
+    first, second = StageProfiler(), StageProfiler()
+    
+    def other_session():
+        with second:
+            with profile_stage('stage'):
+                pass
+    
+    with first:
+        with profile_stage('stage'):
+            worker = threading.Thread(target=other_session)
+            worker.start()
+            worker.join()
+            values = np.ones(10 ** 6)
+    
+    # İkinci oturum yalnızca süre ölçer, ilk oturumun tepe değeri bozulmaz
+    assert second.records[0]['seconds'] is not None
+    assert second.records[0]['peak_mb'] is None
+    assert first.records[0]['peak_mb'] > 7
+    assert not tracemalloc.is_tracing()
+    del values
+    
+    # Kilit serbest: ikinci oturum artık bellek ölçer
+    with second:
+        with profile_stage('stage'):
+            pass
+    assert second.records[-1]['peak_mb'] is not None
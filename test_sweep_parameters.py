@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+METRICS = ['Total_Sales', 'Total_GrossProfit', 'Avg_GrossMargin%', 'Avg_Stock_COGS_Weekly']
+
+
+def test_coupled_inflation_matches_full_forecast(forecaster, parameter_set):
+    zero_mask = forecaster.zero_reset_mask(parameter_set)
+    inflation_past = 0.35
+    grid = {
+        'margin_improvement': [0.0, 0.02],
+        # Enflasyon hem organik düzeltmeyi hem boş fiyat hücrelerini belirler
+        ('inflation_adjustment', 'inflation_rate'): [(rate / inflation_past, rate) for rate in (0.2, 0.4)]
+    }
+    result = forecaster.sweep_parameters(
+        grid, zero_mask=zero_mask, monthly_effect=0.8, maingroup_effect=1.2,
+        parameters=parameter_set, stock_change_pct=0.1, organic_multiplier=0.5
+    )
+    
+    # Bağlı eksen Kartezyen çarpıma girmez: 2 × 2 nokta
+    assert len(result) == 4
+    np.testing.assert_allclose(result['inflation_adjustment'] * inflation_past, result['inflation_rate'])
+    
+    year = forecaster.last_actual_year + 1
+    for _, row in result.iterrows():
+        full_data = forecaster.get_full_data_with_forecast(
+            margin_improvement=row['margin_improvement'],
+            stock_change_pct=0.1,
+            inflation_adjustment=row['inflation_adjustment'],
+            organic_multiplier=0.5,
+            parameters=parameter_set.compile(
+                forecaster.groups, monthly_effect=0.8, maingroup_effect=1.2,
+                inflation_rate=row['inflation_rate']
+            ),
+            zero_mask=zero_mask
+        )
+        expected = forecaster.get_summary_stats(full_data)[year]
+        for metric in METRICS:
+            assert row[metric] == pytest.approx(expected[metric], rel=1e-9)
+    
+    # Fiyatı girilmeyen gruplar enflasyona bağlı - en yüksek enflasyon en yüksek satış
+    sales = result.groupby('inflation_rate')['Total_Sales'].sum()
+    assert sales.loc[0.4] > sales.loc[0.2]
+
+
+def test_compiled_parameters_reject_inflation_axis(forecaster, parameter_set):
+    with pytest.raises(ValueError):
+        forecaster.sweep_parameters(
+            {'inflation_rate': [0.2, 0.3]},
+            parameters=parameter_set.compile(forecaster.groups)
+        )
+    
+    with pytest.raises(ValueError):
+        forecaster.sweep_parameters({'margin_improvement': [0.0], ('margin_improvement', 'growth_param'): [(0.0, 0.1)]})
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from budget_forecast import ZERO_RESET_COLUMNS
+
+
+def test_reset_applies_to_every_forecast_year(forecaster):
+    groups = list(forecaster.groups)
+    zero_mask = np.zeros((len(groups), 12), dtype=bool)
+    zero_mask[2, [0, 10]] = True
+    
+    # 27 ay: son gerçekleşen yılın kalanı + sonraki üç yıl (sonuncusunda sadece Ocak)
+    plain = forecaster.forecast_future_months(num_months=27).set_index(['Year', 'Month', 'MainGroup'])
+    reset = forecaster.forecast_future_months(num_months=27, zero_mask=zero_mask).set_index(['Year', 'Month', 'MainGroup'])
+    
+    last_year = forecaster.last_actual_year
+    hit = (reset.index.get_level_values('MainGroup') == groups[2]) & reset.index.get_level_values('Month').isin([1, 11])
+    after = reset.index.get_level_values('Year') > last_year
+    assert sorted(set(reset.index[hit & after].get_level_values('Year'))) == [last_year + 1, last_year + 2, last_year + 3]
+    
+    assert (reset.loc[hit & after, ZERO_RESET_COLUMNS] == 0).all().all()
+    # Fiyat ve marj korunur
+    for col in ('UnitPrice', 'GrossMargin%'):
+        np.testing.assert_allclose(reset.loc[hit & after, col], plain.loc[hit & after, col])
+    # Son gerçekleşen yılın tahmin ayları (ör. Kasım) ve diğer hücreler sıfırlanmaz
+    np.testing.assert_allclose(reset.loc[~(hit & after), 'Sales'], plain.loc[~(hit & after), 'Sales'])
+    assert (plain.loc[hit & ~after, 'Sales'] > 0).all()
+
+
+def test_parameter_set_resets(forecaster, parameter_set):
+    zero_mask = forecaster.zero_reset_mask(parameter_set)
+    groups = list(forecaster.groups)
+    
+    assert zero_mask.shape == (len(groups), 12)
+    # Ay hedefi * (Mart) tüm gruplarda, Ana Grup hedefi * tüm aylarda
+    assert zero_mask[:, 2].all()
+    assert zero_mask[groups.index(parameter_set.groups[2])].all()
+    assert zero_mask.sum() == len(groups) + 11
+
+
+def test_summary_excludes_reset_cells(forecaster):
+    groups = list(forecaster.groups)
+    year = forecaster.last_actual_year + 1
+    zero_mask = np.zeros((len(groups), 12), dtype=bool)
+    zero_mask[0] = True
+    
+    plain = forecaster.get_full_data_with_forecast()
+    reset = forecaster.get_full_data_with_forecast(zero_mask=zero_mask)
+    group_sales = plain[(plain['Year'] == year) & (plain['MainGroup'] == groups[0])]['Sales'].sum()
+    
+    summary = forecaster.get_summary_stats(reset)[year]
+    assert summary['Total_Sales'] == pytest.approx(forecaster.get_summary_stats(plain)[year]['Total_Sales'] - group_sales)